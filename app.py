@@ -1,199 +1,470 @@
-from flask import Flask, request, jsonify
+import time
+_module_started = time.perf_counter()
+
+from flask import Flask, Request, request, jsonify, g
 from flask_cors import CORS
-import PyPDF2
-import docx
+import click
+import importlib
 import re
 import os
-from werkzeug.utils import secure_filename
+import io
 from collections import Counter
-import json
+from functools import cached_property, lru_cache, wraps
+import hmac
+import sys
+import threading
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
+from result_cache import ResultCache, content_hash
+from text_store import ExtractedTextStore
+from extraction_pool import ExtractionPool, ExtractionTimeout
+from jobs import JobQueue, JobWorkers
+from job_profiles import JobProfileStore
+from candidates import CandidateStore, QueryError
+from corpus_stats import CorpusStats
+from profiling import AnalysisProfiler
+from taxonomy import KeywordMatcher, TaxonomyError, TaxonomySource
+from word_features import WordFeatureCache, WordFeatures
+
+# Seconds spent in each phase of loading this module, reported at startup and in /health
+startup_timings = {}
+_startup_mark = _module_started
+
+def startup_phase(name):
+    """Charge the time since the previous phase to ``name``"""
+    global _startup_mark
+    now = time.perf_counter()
+    startup_timings[name] = round(startup_timings.get(name, 0) + now - _startup_mark, 4)
+    _startup_mark = now
+
+startup_phase('imports')
+
+# numpy (scoring, ranking, feature export) and the CLI-only modules are imported where they
+# are used; prometheus_client is needed by every request, so its import is reported on its own
+from metrics import AnalysisMetrics  # noqa: E402
+startup_phase('metrics import')
+
+class CVRequest(Request):
+    @property
+    def max_content_length(self):
+        # Batch uploads carry many files, each still capped at MAX_CONTENT_LENGTH
+        if self.endpoint in ('analyze_batch', 'rank_cvs'):
+            return app.config['BATCH_MAX_CONTENT_LENGTH']
+        return super().max_content_length
 
 app = Flask(__name__)
+app.request_class = CVRequest
 CORS(app)
 
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
-UPLOAD_FOLDER = 'temp_uploads'
+app.config['BATCH_MAX_CONTENT_LENGTH'] = int(os.environ.get('BATCH_MAX_CONTENT_LENGTH', 256 * 1024 * 1024))
+app.config['BATCH_WORKERS'] = int(os.environ.get('BATCH_WORKERS', os.cpu_count() or 1))
+# Seconds a batch waits per file and batch worker before reporting its remaining files as timed out
+app.config['BATCH_FILE_TIMEOUT'] = float(os.environ.get('BATCH_FILE_TIMEOUT', 60))
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'docx'}
 
-# Create upload folder if it doesn't exist
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+# Analysis results of identical uploads are served from memory
+app.config['RESULT_CACHE_MAX_BYTES'] = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+app.config['RESULT_CACHE_TTL'] = int(os.environ.get('RESULT_CACHE_TTL', 3600))
+
+# Distinct words whose readability and content quality features are memoized per process
+app.config['WORD_FEATURE_CACHE_SIZE'] = int(os.environ.get('WORD_FEATURE_CACHE_SIZE', 50000))
+
+# Local state shared by all workers (extracted text store, ...)
+DATA_FOLDER = os.environ.get('DATA_FOLDER', 'data')
+app.config['TEXT_STORE_PATH'] = os.environ.get('TEXT_STORE_PATH', os.path.join(DATA_FOLDER, 'extracted_text.db'))
+app.config['TEXT_STORE_MAX_BYTES'] = int(os.environ.get('TEXT_STORE_MAX_BYTES', 256 * 1024 * 1024))
+
+# PDF/DOCX parsing runs in isolated worker processes (0 workers parses in-process)
+app.config['EXTRACTION_WORKERS'] = int(os.environ.get('EXTRACTION_WORKERS', 2))
+app.config['EXTRACTION_TIMEOUT'] = float(os.environ.get('EXTRACTION_TIMEOUT', 30))
+app.config['EXTRACTION_MAX_TASKS'] = int(os.environ.get('EXTRACTION_MAX_TASKS', 100))
+
+# Extraction stops after this many PDF pages / characters of text (0 for no limit)
+app.config['EXTRACTION_MAX_PAGES'] = int(os.environ.get('EXTRACTION_MAX_PAGES', 30)) or None
+app.config['EXTRACTION_MAX_CHARS'] = int(os.environ.get('EXTRACTION_MAX_CHARS', 500000)) or None
 
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+# Uploads sent to /jobs are queued on disk and analyzed by background threads
+app.config['JOBS_PATH'] = os.environ.get('JOBS_PATH', os.path.join(DATA_FOLDER, 'jobs.db'))
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 2))
+app.config['JOB_LEASE'] = int(os.environ.get('JOB_LEASE', 60))
+app.config['JOB_RETENTION'] = int(os.environ.get('JOB_RETENTION', 24 * 3600))
+
+# Job descriptions registered through /job_profiles
+app.config['JOB_PROFILES_PATH'] = os.environ.get('JOB_PROFILES_PATH', os.path.join(DATA_FOLDER, 'job_profiles.db'))
+
+# Opt-in store of analyzed candidates, searchable through /search
+app.config['CANDIDATE_STORE'] = os.environ.get('CANDIDATE_STORE', '').lower() in ('1', 'true', 'yes')
+app.config['CANDIDATE_STORE_PATH'] = os.environ.get('CANDIDATE_STORE_PATH', os.path.join(DATA_FOLDER, 'candidates.db'))
+
+# Document frequencies of analyzed CVs, used for BM25 job matching
+app.config['CORPUS_STATS_PATH'] = os.environ.get('CORPUS_STATS_PATH', os.path.join(DATA_FOLDER, 'corpus_stats.db'))
+
+# Token for admin-only features such as ?profile=1 (unset disables them)
+app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN', '')
+
+# Import the PDF and DOCX parsers, and numpy for scoring, at startup instead of on first use
+app.config['PREWARM_EXTRACTORS'] = os.environ.get('PREWARM_EXTRACTORS', '').lower() in ('1', 'true', 'yes')
+
+# Skill taxonomy file, and how often (seconds) to check it for changes
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'taxonomy.json')
+app.config['TAXONOMY_PATH'] = os.environ.get('TAXONOMY_PATH', DEFAULT_TAXONOMY_PATH)
+app.config['TAXONOMY_CHECK_INTERVAL'] = float(os.environ.get('TAXONOMY_CHECK_INTERVAL', 5))
+
+# Bump whenever a change to the analyzer alters its results
+ANALYZER_VERSION = '2.1.0'
+
+# Education levels from lowest to highest; feature vectors hold the position
+EDUCATION_RANKS = ['not_specified', 'high_school', 'diploma', 'associates', 'bachelors', 'masters', 'phd']
+
+# Bump whenever a change to PDF/DOCX extraction alters the extracted text
+EXTRACTOR_VERSION = '2'
 
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-class EnhancedCVAnalyzer:
-    def __init__(self):
-        # Multi-industry skill keywords
-        self.skill_keywords = {
-            # Technology & IT
-            'programming': ['python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'typescript', 'scala', 'r', 'matlab', 'perl'],
-            'web_development': ['html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'bootstrap', 'jquery', 'sass', 'webpack', 'next.js', 'gatsby'],
-            'data_science': ['machine learning', 'deep learning', 'tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn', 'data analysis', 'statistics', 'ml', 'ai', 'tableau', 'power bi'],
-            'databases': ['sql', 'mysql', 'mongodb', 'postgresql', 'redis', 'elasticsearch', 'oracle', 'sqlite', 'nosql', 'cassandra', 'dynamodb'],
-            'cloud': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'jenkins', 'ci/cd', 'devops', 'serverless', 'microservices'],
-            'mobile': ['android', 'ios', 'react native', 'flutter', 'swift', 'kotlin', 'xamarin', 'cordova', 'ionic'],
-            'cybersecurity': ['penetration testing', 'ethical hacking', 'cissp', 'cism', 'firewall', 'encryption', 'vulnerability assessment', 'incident response'],
-            
-            # Healthcare & Medical
-            'medical_skills': ['patient care', 'medical diagnosis', 'surgery', 'emergency medicine', 'radiology', 'anesthesia', 'cardiology', 'neurology', 'oncology', 'pediatrics'],
-            'healthcare_tech': ['emr', 'ehr', 'epic', 'cerner', 'meditech', 'medical imaging', 'telemedicine', 'healthcare analytics'],
-            'nursing': ['critical care', 'patient assessment', 'medication administration', 'wound care', 'iv therapy', 'patient education', 'bls', 'acls', 'pals'],
-            'pharmacy': ['pharmaceutical care', 'drug interactions', 'compounding', 'clinical pharmacy', 'pharmacokinetics', 'medication therapy management'],
-            
-            # Finance & Accounting
-            'finance': ['financial analysis', 'investment banking', 'portfolio management', 'risk management', 'derivatives', 'equity research', 'forex', 'financial modeling'],
-            'accounting': ['gaap', 'ifrs', 'tax preparation', 'auditing', 'bookkeeping', 'financial reporting', 'cost accounting', 'forensic accounting'],
-            'fintech': ['blockchain', 'cryptocurrency', 'robo-advisor', 'algorithmic trading', 'payment processing', 'regulatory compliance'],
-            
-            # Marketing & Sales
-            'digital_marketing': ['seo', 'sem', 'social media marketing', 'content marketing', 'email marketing', 'ppc', 'google analytics', 'facebook ads', 'conversion optimization'],
-            'traditional_marketing': ['brand management', 'market research', 'advertising', 'public relations', 'event marketing', 'print media', 'trade shows'],
-            'sales': ['lead generation', 'crm', 'salesforce', 'hubspot', 'b2b sales', 'b2c sales', 'account management', 'sales forecasting', 'negotiation'],
-            
-            # Education & Training
-            'teaching': ['curriculum development', 'lesson planning', 'classroom management', 'educational technology', 'assessment', 'differentiated instruction'],
-            'educational_tech': ['lms', 'moodle', 'blackboard', 'canvas', 'e-learning', 'instructional design', 'educational apps'],
-            
-            # Engineering & Manufacturing
-            'mechanical_engineering': ['cad', 'solidworks', 'autocad', 'finite element analysis', 'thermodynamics', 'fluid mechanics', 'manufacturing processes'],
-            'electrical_engineering': ['circuit design', 'power systems', 'control systems', 'plc programming', 'embedded systems', 'signal processing'],
-            'civil_engineering': ['structural design', 'construction management', 'surveying', 'geotechnical engineering', 'transportation engineering'],
-            'manufacturing': ['lean manufacturing', 'six sigma', 'quality control', 'supply chain management', 'production planning', 'process improvement'],
-            
-            # Creative & Design
-            'graphic_design': ['photoshop', 'illustrator', 'indesign', 'figma', 'sketch', 'after effects', 'premiere pro', 'typography', 'branding'],
-            'web_design': ['ui design', 'ux design', 'wireframing', 'prototyping', 'user research', 'responsive design', 'accessibility'],
-            'multimedia': ['video editing', 'motion graphics', 'animation', '3d modeling', 'blender', 'maya', 'cinema 4d'],
-            
-            # Legal & Compliance
-            'legal': ['contract law', 'litigation', 'legal research', 'compliance', 'intellectual property', 'corporate law', 'family law', 'criminal law'],
-            'regulatory': ['gdpr', 'hipaa', 'sox', 'regulatory compliance', 'risk assessment', 'policy development'],
-            
-            # Human Resources
-            'hr': ['recruitment', 'talent acquisition', 'performance management', 'employee relations', 'compensation', 'benefits administration', 'hris'],
-            'hr_tech': ['workday', 'successfactors', 'bamboohr', 'adp', 'applicant tracking system', 'payroll systems'],
-            
-            # Operations & Supply Chain
-            'operations': ['operations management', 'process optimization', 'logistics', 'inventory management', 'vendor management', 'procurement'],
-            'supply_chain': ['supply chain optimization', 'demand planning', 'erp', 'sap', 'oracle', 'warehouse management'],
-            
-            # Language & Communication
-            'languages': ['english', 'spanish', 'french', 'german', 'chinese', 'japanese', 'arabic', 'hindi', 'portuguese', 'russian'],
-            'communication': ['technical writing', 'copywriting', 'presentation skills', 'public speaking', 'stakeholder management', 'cross-cultural communication'],
-            
-            # Soft Skills (Enhanced)
-            'leadership': ['team leadership', 'strategic planning', 'change management', 'coaching', 'mentoring', 'conflict resolution', 'decision making'],
-            'project_management': ['agile', 'scrum', 'kanban', 'pmp', 'prince2', 'waterfall', 'risk management', 'stakeholder management'],
-            'analytical': ['problem solving', 'critical thinking', 'data analysis', 'research', 'troubleshooting', 'root cause analysis'],
-            'interpersonal': ['teamwork', 'collaboration', 'customer service', 'relationship building', 'emotional intelligence', 'active listening']
+def file_format(filename):
+    """Lowercased extension of an upload; it picks the parser, so cached results depend on it"""
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+
+def read_source(source):
+    """Return the raw bytes of a file path, bytes object or binary file object"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, 'read'):
+        data = source.read()
+        source.seek(0)
+        return data
+    with open(source, 'rb') as file:
+        return file.read()
+
+class TextBudget:
+    """Collects extracted text up to an optional character limit"""
+    
+    def __init__(self, max_chars=None):
+        self.max_chars = max_chars
+        self.parts = []
+        self.length = 0
+    
+    def add(self, piece):
+        """Append a piece of text; returns False if the limit cut some of it off"""
+        if self.max_chars is not None and self.length + len(piece) > self.max_chars:
+            piece = piece[:self.max_chars - self.length]
+            self.parts.append(piece)
+            self.length += len(piece)
+            return False
+        self.parts.append(piece)
+        self.length += len(piece)
+        return True
+    
+    def text(self):
+        return ''.join(self.parts)
+
+def binary_source(source):
+    """Adapt a source for the PDF/DOCX readers, which take a path or a seekable file"""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return source
+
+# Parser library behind each binary format, imported the first time that format is seen
+EXTRACTOR_BACKENDS = {'pdf': 'PyPDF2', 'docx': 'docx'}
+_extractor_modules = {}
+extractor_import_timings = {}
+
+def extractor_backend(file_format):
+    """The parser module for ``file_format``, importing it on first use"""
+    module = _extractor_modules.get(file_format)
+    if module is None:
+        started = time.perf_counter()
+        module = importlib.import_module(EXTRACTOR_BACKENDS[file_format])
+        _extractor_modules[file_format] = module
+        extractor_import_timings.setdefault(file_format, round(time.perf_counter() - started, 4))
+    return module
+
+def prewarm_extractors():
+    """Import every extractor backend now, e.g. before the server forks its workers"""
+    for file_format in EXTRACTOR_BACKENDS:
+        extractor_backend(file_format)
+
+class AnalysisDocument:
+    """One CV's text plus the normalized views the analysis stages share.
+
+    Each view is computed on first access and cached on the instance, so a
+    request lowercases, splits and tokenizes the text once however many
+    stages read it. Build one per request with ``EnhancedCVAnalyzer.as_document``.
+    """
+
+    def __init__(self, text, term_matcher, field_scanner, feature_cache):
+        self.text = text
+        self.term_matcher = term_matcher
+        self.field_scanner = field_scanner
+        self.feature_cache = feature_cache
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def words(self):
+        """Whitespace-separated words of the original text"""
+        return self.text.split()
+
+    @cached_property
+    def tokens(self):
+        """Lowercase alphabetic tokens of three or more letters"""
+        return re.findall(r'\b[a-zA-Z]{3,}\b', self.lower)
+
+    @cached_property
+    def token_counts(self):
+        return Counter(self.tokens)
+
+    @cached_property
+    def token_set(self):
+        return set(self.token_counts)
+
+    @cached_property
+    def lines(self):
+        return self.text.split('\n')
+
+    @cached_property
+    def sentences(self):
+        return [s.strip() for s in re.split(r'[.!?]+', self.text) if s.strip()]
+
+    @cached_property
+    def word_counts(self):
+        """Occurrences of each distinct lowercased word"""
+        return Counter(self.lower.split())
+    
+    @cached_property
+    def word_features(self):
+        """WordFeatures of every distinct lowercased word, from the shared cache"""
+        return self.feature_cache.lookup(self.word_counts)
+    
+    @cached_property
+    def term_counts(self):
+        """Occurrences of every taxonomy term, from a single matcher pass"""
+        return self.term_matcher.count(self.lower)
+
+    @cached_property
+    def ats_signals(self):
+        """Header, special character and action keyword counts read by the ATS score"""
+        standard_headers = ['experience', 'education', 'skills', 'summary', 'contact']
+        return {
+            'headers_found': sum(1 for header in standard_headers if header in self.lower),
+            'special_characters': len(re.findall(r'[^\w\s\-\.\,\(\)\@\:\/\%\&\#]', self.text)),
+            'has_at': '@' in self.text,
+            'keyword_count': len(re.findall(r'\b(?:experience|skill|manage|develop|lead|project)\b', self.lower))
         }
-        
-        # Industry-specific keywords for automatic CV type detection
-        self.industry_keywords = {
-            'technology': ['software', 'developer', 'engineer', 'programming', 'coding', 'algorithm', 'database', 'system', 'technical', 'it'],
-            'healthcare': ['medical', 'nurse', 'doctor', 'physician', 'patient', 'clinical', 'hospital', 'healthcare', 'medical'],
-            'finance': ['financial', 'accounting', 'investment', 'banking', 'finance', 'audit', 'tax', 'budget', 'revenue'],
-            'marketing': ['marketing', 'sales', 'advertising', 'brand', 'campaign', 'customer', 'market', 'promotion'],
-            'education': ['teaching', 'education', 'teacher', 'instructor', 'curriculum', 'student', 'academic', 'school'],
-            'engineering': ['engineering', 'design', 'manufacturing', 'construction', 'technical', 'mechanical', 'electrical'],
-            'legal': ['legal', 'law', 'attorney', 'lawyer', 'court', 'litigation', 'compliance', 'contract'],
-            'creative': ['design', 'creative', 'art', 'graphic', 'visual', 'multimedia', 'photography', 'creative'],
-            'hr': ['human resources', 'hr', 'recruitment', 'talent', 'employee', 'personnel', 'training'],
-            'operations': ['operations', 'logistics', 'supply chain', 'procurement', 'vendor', 'process']
+
+    @cached_property
+    def field_hits(self):
+        """Contact, certification and experience pattern hits, from one scan"""
+        return self.field_scanner.scan(self)
+
+class CVTextScanner:
+    """Precompiled patterns for the contact, certification and experience fields.
+
+    Built once per analyzer. ``scan`` runs every field pattern over a document
+    and returns the raw hits keyed by field name, shaped exactly as
+    ``re.findall`` returned them when each stage ran its own regexes.
+    Patterns whose matches can never overlap are fused into a single
+    alternation; the rest stay separate because a fused scan would drop the
+    overlapping hits (an email is also a twitter handle and a website).
+
+    The free-text certification phrases and the website pattern used to
+    backtrack quadratically over long runs of words without punctuation;
+    they are rewritten here to match the same spans in linear time.
+    """
+
+    def __init__(self):
+        # Run on the original text
+        self.email = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+        self.phones = [re.compile(pattern) for pattern in (
+            r'(\+\d{1,4}[-.\s]?)?\(?\d{3,4}\)?[-.\s]?\d{3,4}[-.\s]?\d{4}',
+            r'\+\d{1,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}',
+            r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',
+            r'\(\d{3}\)\s*\d{3}[-.\s]?\d{4}'
+        )]
+        self.locations = [re.compile(pattern) for pattern in (
+            r'([A-Z][a-z]+,\s*[A-Z]{2})',  # City, State
+            r'([A-Z][a-z]+,\s*[A-Z][a-z]+)',  # City, Country
+        )]
+        
+        # Run on the original text, case-insensitively
+        self.cert_acronyms = re.compile(
+            r'\b(?:(?:aws|azure|gcp|google cloud)\s*certified'  # Technology
+            r'|(?:cissp|cism|ceh|comptia)'
+            r'|(?:pmp|prince2|scrum master|csm)'
+            r'|(?:bls|acls|pals|cpr)\s*certified'  # Healthcare
+            r'|(?:rn|lpn|cna|np)'
+            r'|(?:cpa|cfa|frm|cfp))\b',  # Finance
+            re.IGNORECASE
+        )
+        # Same spans as r'\bcertified\s+[\w\s]+\b' without the backtracking
+        self.certified_phrase = re.compile(r'\bcertified\s+\w(?:[\w\s]*\w)?', re.IGNORECASE)
+        # r'\b[\w\s]+\s+certification\b' only matches inside a run of word and
+        # space characters that contains this, and then only once per run
+        self.certification_phrase = re.compile(r'\b[\w\s]+\s+certification\b', re.IGNORECASE)
+        self.certification_tail = re.compile(r'\w\s+certification\b', re.IGNORECASE)
+        self.word_runs = re.compile(r'[\w\s]+')
+        
+        # Run on the lowercased text
+        self.linkedin = re.compile(r'(?:linkedin\.com/in/|linkedin\.com/profile/view\?id=)[\w-]+')
+        self.github = re.compile(r'(?:github\.com/|git\.io/)[\w-]+')
+        self.twitter = re.compile(r'(?:twitter\.com/|@)[\w-]+')
+        # Only start at the beginning of a [\w-] run (or at an embedded URL
+        # scheme): a mid-run start can only succeed where the run start does
+        self.website = re.compile(
+            r'(?:(?<![\w-])|(?=https?://))(?:https?://)?(?:www\.)?[\w-]+\.[\w.-]+(?:/[\w.-]*)*'
+        )
+        self.experience_years = [re.compile(pattern) for pattern in (
+            r'(\d+)\+?\s*years?\s*(?:(?:of\s*)?experience|in)',
+            r'(?:over|more\s*than)\s*(\d+)\s*years?'
+        )]
+        self.year_ranges = re.compile(r'(\d{4})\s*[-–]\s*(\d{4})')
+        self.open_year_ranges = re.compile(r'(\d{4})\s*[-–]\s*(?:present|current)')
+
+    def scan(self, document):
+        text, text_lower = document.text, document.lower
+        hits = {
+            'emails': self.email.findall(text) if '@' in text else [],
+            'phones': [phone for pattern in self.phones for phone in pattern.findall(text)],
+            'locations': [location for pattern in self.locations for location in pattern.findall(text)],
+            'linkedin': self.linkedin.findall(text_lower),
+            'github': self.github.findall(text_lower),
+            'twitter': self.twitter.findall(text_lower),
+            'websites': self.website.findall(text_lower),
+            'certifications': self.cert_acronyms.findall(text) + self.certified_phrase.findall(text),
+            'experience_years': [years for pattern in self.experience_years
+                                 for years in pattern.findall(text_lower)],
+            'year_ranges': self.year_ranges.findall(text_lower) + self.open_year_ranges.findall(text_lower)
         }
         
-        # Enhanced section keywords
-        self.section_keywords = {
-            'contact': ['contact', 'personal information', 'personal details', 'reach me', 'get in touch'],
-            'summary': ['summary', 'objective', 'profile', 'about', 'overview', 'professional summary', 'career objective'],
-            'education': ['education', 'academic', 'qualification', 'university', 'college', 'degree', 'certification', 'training'],
-            'experience': ['experience', 'work history', 'employment', 'professional experience', 'career', 'work experience', 'professional background'],
-            'skills': ['skills', 'technical skills', 'competencies', 'technologies', 'expertise', 'proficiencies', 'core competencies'],
-            'projects': ['projects', 'portfolio', 'personal projects', 'key projects', 'notable projects'],
-            'achievements': ['achievements', 'awards', 'honors', 'accomplishments', 'recognitions', 'accolades'],
-            'certifications': ['certifications', 'certificates', 'licenses', 'professional certifications', 'credentials'],
-            'languages': ['languages', 'linguistic skills', 'multilingual', 'language proficiency'],
-            'interests': ['interests', 'hobbies', 'activities', 'personal interests', 'extracurricular'],
-            'references': ['references', 'recommendations', 'referees', 'professional references']
-        }
+        if self.certification_tail.search(text):
+            for run in self.word_runs.finditer(text):
+                if self.certification_tail.search(run.group()):
+                    hits['certifications'].append(self.certification_phrase.search(run.group()).group())
         
-        # Industry-specific requirements
-        self.industry_requirements = {
-            'technology': {
-                'essential_sections': ['skills', 'experience', 'projects'],
-                'important_skills': ['programming', 'web_development', 'databases'],
-                'preferred_length': (500, 900),
-                'ats_weight': 0.4
-            },
-            'healthcare': {
-                'essential_sections': ['education', 'experience', 'certifications'],
-                'important_skills': ['medical_skills', 'healthcare_tech'],
-                'preferred_length': (600, 1000),
-                'ats_weight': 0.2
-            },
-            'finance': {
-                'essential_sections': ['education', 'experience', 'certifications'],
-                'important_skills': ['finance', 'accounting'],
-                'preferred_length': (500, 800),
-                'ats_weight': 0.35
-            },
-            'creative': {
-                'essential_sections': ['projects', 'experience', 'skills'],
-                'important_skills': ['graphic_design', 'web_design', 'multimedia'],
-                'preferred_length': (400, 700),
-                'ats_weight': 0.1
-            },
-            'marketing': {
-                'essential_sections': ['experience', 'skills', 'achievements'],
-                'important_skills': ['digital_marketing', 'traditional_marketing', 'sales'],
-                'preferred_length': (500, 800),
-                'ats_weight': 0.3
-            },
-            'education': {
-                'essential_sections': ['education', 'experience', 'certifications'],
-                'important_skills': ['teaching', 'educational_tech'],
-                'preferred_length': (600, 900),
-                'ats_weight': 0.25
-            },
-            'engineering': {
-                'essential_sections': ['education', 'experience', 'skills'],
-                'important_skills': ['mechanical_engineering', 'electrical_engineering', 'civil_engineering'],
-                'preferred_length': (600, 1000),
-                'ats_weight': 0.35
-            },
-            'legal': {
-                'essential_sections': ['education', 'experience', 'certifications'],
-                'important_skills': ['legal', 'regulatory'],
-                'preferred_length': (700, 1200),
-                'ats_weight': 0.2
-            },
-            'hr': {
-                'essential_sections': ['education', 'experience', 'skills'],
-                'important_skills': ['hr', 'hr_tech'],
-                'preferred_length': (500, 800),
-                'ats_weight': 0.3
-            },
-            'operations': {
-                'essential_sections': ['experience', 'skills', 'education'],
-                'important_skills': ['operations', 'supply_chain'],
-                'preferred_length': (500, 800),
-                'ats_weight': 0.35
-            }
-        }
+        return hits
+
+# (analyzer, Taxonomy) the running analysis is pinned to, see EnhancedCVAnalyzer.pinned_taxonomy
+_pinned_taxonomy = ContextVar('pinned_taxonomy', default=None)
+
+def pins_taxonomy(method):
+    """Run an analyzer method against one taxonomy snapshot, even if it is swapped meanwhile"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.pinned_taxonomy():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+@lru_cache(maxsize=64)
+def vocabulary_matcher(vocabulary):
+    """KeywordMatcher over a job's vocabulary (a tuple of terms), shared by rankings against that job"""
+    return KeywordMatcher(vocabulary)
+
+class EnhancedCVAnalyzer:
+    # BM25 term frequency saturation and length normalization
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    
+    # Content quality keywords, matched anywhere in the lowercased text
+    ACTION_VERBS = (
+        'achieved', 'developed', 'implemented', 'led', 'managed', 'created', 
+        'improved', 'increased', 'reduced', 'designed', 'built', 'optimized',
+        'delivered', 'coordinated', 'supervised', 'analyzed', 'established',
+        'streamlined', 'automated', 'enhanced', 'collaborated', 'initiated',
+        'executed', 'facilitated', 'mentored', 'negotiated', 'resolved'
+    )
+    IMPACT_KEYWORDS = (
+        'results', 'success', 'efficiency', 'performance', 'growth', 
+        'savings', 'revenue', 'productivity', 'quality', 'innovation',
+        'transformation', 'optimization', 'achievement', 'improvement',
+        'solution', 'impact', 'breakthrough', 'milestone'
+    )
+    PROFESSIONAL_WORDS = (
+        'strategic', 'analytical', 'comprehensive', 'systematic', 'innovative',
+        'collaborative', 'proactive', 'efficient', 'effective', 'dynamic'
+    )
+    
+    def __init__(self, text_store=None, extraction_pool=None, max_pages=None, max_chars=None,
+                 corpus_stats=None, metrics=None, taxonomy_source=None, word_feature_cache_size=50000):
+        # Optional ExtractedTextStore that remembers PDF/DOCX extraction results
+        self.text_store = text_store
+        # Optional ExtractionPool that parses PDF/DOCX files out of process
+        self.extraction_pool = extraction_pool
+        # Extraction budgets: PDF pages parsed, characters kept (None for no limit)
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        # Optional CorpusStats updated with every analyzed CV, used for BM25 matching
+        self.corpus_stats = corpus_stats
+        # Optional AnalysisMetrics receiving extraction and per-stage timings
+        self.metrics = metrics
+        
+        # Skill taxonomy, loaded from taxonomy.json and swapped when the file changes
+        self.taxonomy_source = taxonomy_source or TaxonomySource(DEFAULT_TAXONOMY_PATH)
+        
+        # Contact, certification and experience patterns, compiled once
+        self.field_scanner = CVTextScanner()
+        
+        # Syllable counts and content quality keywords of each word, memoized across CVs
+        self.word_feature_cache = WordFeatureCache(self.compute_word_features, word_feature_cache_size)
+        
+        # Vectorized score_* rubric and the feature schema naming its columns, rebuilt for each taxonomy version
+        self._scoring_engine = None
+        self._feature_schema = None
+    
+    @property
+    def taxonomy(self):
+        """The Taxonomy pinned for the current analysis, else the one in service"""
+        pinned = _pinned_taxonomy.get()
+        if pinned is not None and pinned[0] is self:
+            return pinned[1]
+        return self.taxonomy_source.current()
+    
+    def pin_taxonomy(self):
+        """Keep this context on the current taxonomy until unpin_taxonomy(token)"""
+        return _pinned_taxonomy.set((self, self.taxonomy))
+    
+    def unpin_taxonomy(self, token):
+        _pinned_taxonomy.reset(token)
+    
+    @contextmanager
+    def pinned_taxonomy(self):
+        token = self.pin_taxonomy()
+        try:
+            yield self.taxonomy
+        finally:
+            self.unpin_taxonomy(token)
+    
+    # Taxonomy tables, read through the pinned snapshot
+    skill_keywords = property(lambda self: self.taxonomy.skill_keywords)
+    skill_variations = property(lambda self: self.taxonomy.skill_variations)
+    industry_keywords = property(lambda self: self.taxonomy.industry_keywords)
+    section_keywords = property(lambda self: self.taxonomy.section_keywords)
+    industry_requirements = property(lambda self: self.taxonomy.industry_requirements)
+    term_matcher = property(lambda self: self.taxonomy.term_matcher)
+    # Identifies the taxonomy in cache keys and job profiles
+    taxonomy_version = property(lambda self: self.taxonomy.version)
+
+    def as_document(self, text):
+        """Wrap raw text in an AnalysisDocument; documents are passed through"""
+        if isinstance(text, AnalysisDocument):
+            return text
+        return AnalysisDocument(text, self.term_matcher, self.field_scanner, self.word_feature_cache)
 
     def detect_cv_type(self, text):
         """Automatically detect CV type based on content"""
-        text_lower = text.lower()
+        found_terms = self.as_document(text).term_counts
         industry_scores = {}
         
         for industry, keywords in self.industry_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
+            score = sum(1 for keyword in keywords if keyword.lower() in found_terms)
             industry_scores[industry] = score
         
         if not industry_scores or max(industry_scores.values()) == 0:
@@ -210,34 +481,17 @@ class EnhancedCVAnalyzer:
         
     def extract_experience_duration(self, text):
         """Extract years of experience from CV"""
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\+?\s*years?\s*in',
-            r'over\s*(\d+)\s*years?',
-            r'more\s*than\s*(\d+)\s*years?'
-        ]
-        
-        years = []
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text.lower())
-            years.extend([int(match) for match in matches])
+        hits = self.as_document(text).field_hits
+        years = [int(match) for match in hits['experience_years']]
         
         # Also try to extract from date ranges
-        date_patterns = [
-            r'(\d{4})\s*[-–]\s*(\d{4})',
-            r'(\d{4})\s*[-–]\s*present',
-            r'(\d{4})\s*[-–]\s*current'
-        ]
-        
         current_year = datetime.now().year
         total_experience = 0
         
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text.lower())
-            for match in matches:
-                start_year = int(match[0])
-                end_year = current_year if match[1] in ['present', 'current'] else int(match[1])
-                total_experience += max(0, end_year - start_year)
+        for match in hits['year_ranges']:
+            start_year = int(match[0])
+            end_year = current_year if match[1] in ['present', 'current'] else int(match[1])
+            total_experience += max(0, end_year - start_year)
         
         if years:
             explicit_years = max(years)
@@ -261,7 +515,7 @@ class EnhancedCVAnalyzer:
             'high_school': ['high school', 'secondary', 'matriculation']
         }
         
-        text_lower = text.lower()
+        text_lower = self.as_document(text).lower
         found_levels = []
         
         for level, keywords in education_levels.items():
@@ -278,45 +532,27 @@ class EnhancedCVAnalyzer:
         
     def extract_certifications(self, text):
         """Extract professional certifications"""
-        cert_patterns = [
-            # Technology
-            r'\b(?:aws|azure|gcp|google cloud)\s*certified\b',
-            r'\b(?:cissp|cism|ceh|comptia)\b',
-            r'\b(?:pmp|prince2|scrum master|csm)\b',
-            # Healthcare
-            r'\b(?:bls|acls|pals|cpr)\s*certified\b',
-            r'\b(?:rn|lpn|cna|np)\b',
-            # Finance
-            r'\b(?:cpa|cfa|frm|cfp)\b',
-            # General
-            r'\bcertified\s+[\w\s]+\b',
-            r'\b[\w\s]+\s+certification\b'
-        ]
-        
-        certifications = []
-        for pattern in cert_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            certifications.extend(matches)
-        
+        certifications = self.as_document(text).field_hits['certifications']
         return list(set(certifications))
         
     def analyze_keyword_density(self, text, job_description=None):
         """Analyze keyword density and relevance"""
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-        word_count = Counter(words)
-        total_words = len(words)
+        document = self.as_document(text)
+        word_count = document.token_counts
+        total_words = len(document.tokens)
+        found_terms = document.term_counts
         
         # Calculate keyword density for skills
         skill_density = {}
         for category, skills in self.skill_keywords.items():
             category_count = 0
             for skill in skills:
-                skill_words = skill.lower().split()
-                if len(skill_words) == 1:
-                    category_count += word_count.get(skill_words[0], 0)
+                skill_lower = skill.lower()
+                if len(skill_lower.split()) == 1:
+                    category_count += found_terms.get(skill_lower, 0)
                 else:
                     # Multi-word skills
-                    if skill.lower() in text.lower():
+                    if skill_lower in found_terms:
                         category_count += 1
             
             if total_words > 0:
@@ -333,19 +569,21 @@ class EnhancedCVAnalyzer:
         
     def check_grammar_and_readability(self, text):
         """Basic grammar and readability analysis"""
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        document = self.as_document(text)
+        text = document.text
+        sentences = document.sentences
         
         # Calculate simple readability scores
-        words = text.split()
+        words = document.words
         total_words = len(words)
         total_sentences = len(sentences)
         
         # Simple flesch reading ease approximation
         if total_sentences > 0 and total_words > 0:
             avg_sentence_length = total_words / total_sentences
-            # Count syllables (simple approximation)
-            syllables = sum(self.count_syllables(word) for word in words)
+            # Count syllables (simple approximation), once per distinct word
+            features = document.word_features
+            syllables = sum(features[word].syllables * count for word, count in document.word_counts.items())
             avg_syllables_per_word = syllables / total_words if total_words > 0 else 0
             
             # Simplified Flesch formula
@@ -393,6 +631,15 @@ class EnhancedCVAnalyzer:
             syllable_count -= 1
         
         return max(1, syllable_count)  # Every word has at least 1 syllable
+    
+    def compute_word_features(self, word):
+        """WordFeatures of one lowercased word; memoized by the word feature cache"""
+        return WordFeatures(
+            self.count_syllables(word),
+            frozenset(verb for verb in self.ACTION_VERBS if verb in word),
+            frozenset(keyword for keyword in self.IMPACT_KEYWORDS if keyword in word),
+            frozenset(term for term in self.PROFESSIONAL_WORDS if term in word)
+        )
         
     def get_readability_level(self, flesch_score):
         """Convert Flesch score to readability level"""
@@ -483,53 +730,102 @@ class EnhancedCVAnalyzer:
         return feedback
         
     # Enhanced extraction methods
-    def extract_text_from_pdf(self, file_path):
-        """Extract text from PDF file with better error handling"""
+    def iter_pdf_pages(self, pdf_reader, max_pages=None):
+        """Yield (page number, text) for each page of a PDF as it is parsed"""
+        for page_num, page in enumerate(pdf_reader.pages):
+            if max_pages and page_num >= max_pages:
+                break
+            try:
+                yield page_num, page.extract_text() or ""
+            except Exception as e:
+                print(f"Error reading page {page_num}: {str(e)}")
+                continue
+    
+    def extract_pdf_with_info(self, source):
+        """Extract PDF text page by page, stopping at the page and character budgets
+        
+        Returns the text and a dict describing how much of the document was read.
+        """
+        PyPDF2 = extractor_backend('pdf')
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page_num, page in enumerate(pdf_reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                    except Exception as e:
-                        print(f"Error reading page {page_num}: {str(e)}")
-                        continue
-                return text
+            pdf_reader = PyPDF2.PdfReader(binary_source(source))
+            total_pages = len(pdf_reader.pages)
+            budget = TextBudget(self.max_chars)
+            pages_read = 0
+            truncation_reason = None
+            
+            for page_num, page_text in self.iter_pdf_pages(pdf_reader, self.max_pages):
+                pages_read = page_num + 1
+                if page_text and not budget.add(page_text + "\n"):
+                    truncation_reason = 'character_budget'
+                    break
+            else:
+                if self.max_pages and total_pages > self.max_pages:
+                    truncation_reason = 'page_budget'
+            
+            return budget.text(), {
+                'format': 'pdf',
+                'total_pages': total_pages,
+                'pages_read': pages_read,
+                'characters': budget.length,
+                'truncated': truncation_reason is not None,
+                'truncation_reason': truncation_reason
+            }
         except Exception as e:
-            return f"Error reading PDF: {str(e)}"
+            return f"Error reading PDF: {str(e)}", {'format': 'pdf'}
+    
+    def extract_text_from_pdf(self, source):
+        """Extract text from a PDF path, bytes or binary file object"""
+        return self.extract_pdf_with_info(source)[0]
     
-    def extract_text_from_docx(self, file_path):
-        """Extract text from DOCX file with table support"""
+    def extract_docx_with_info(self, source):
+        """Extract DOCX text, tables included, stopping at the character budget
+        
+        Returns the text and a dict describing how much of the document was read.
+        """
+        docx = extractor_backend('docx')
         try:
-            doc = docx.Document(file_path)
-            text = ""
+            doc = docx.Document(binary_source(source))
+            budget = TextBudget(self.max_chars)
             
-            # Extract from paragraphs
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
+            # Extract from paragraphs, then from tables
+            within_budget = all(budget.add(paragraph.text + "\n") for paragraph in doc.paragraphs)
+            if within_budget:
+                for table in doc.tables:
+                    for row in table.rows:
+                        within_budget = (all(budget.add(cell.text + " ") for cell in row.cells)
+                                         and budget.add("\n"))
+                        if not within_budget:
+                            break
+                    if not within_budget:
+                        break
             
-            # Extract from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + " "
-                    text += "\n"
-            
-            return text
+            return budget.text(), {
+                'format': 'docx',
+                'characters': budget.length,
+                'truncated': not within_budget,
+                'truncation_reason': None if within_budget else 'character_budget'
+            }
         except Exception as e:
-            return f"Error reading DOCX: {str(e)}"
+            return f"Error reading DOCX: {str(e)}", {'format': 'docx'}
+    
+    def extract_text_from_docx(self, source):
+        """Extract text from a DOCX path, bytes or binary file object, tables included"""
+        return self.extract_docx_with_info(source)[0]
     
-    def extract_text_from_txt(self, file_path):
-        """Extract text from TXT file with encoding detection"""
+    def extract_text_from_txt(self, source):
+        """Extract text from a TXT path, bytes or binary file object with encoding detection"""
+        try:
+            data = read_source(source)
+        except Exception as e:
+            return f"Error reading TXT: {str(e)}"
+        
         encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
         
         for encoding in encodings:
             try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    return file.read()
+                # Same newline handling as reading the file in text mode
+                return data.decode(encoding).replace('\r\n', '\n').replace('\r', '\n')
             except UnicodeDecodeError:
                 continue
             except Exception as e:
@@ -537,71 +833,80 @@ class EnhancedCVAnalyzer:
         
         return "Error: Could not decode text file"
     
-    def extract_text(self, file_path):
-        """Extract text based on file extension"""
-        if file_path.lower().endswith('.pdf'):
-            return self.extract_text_from_pdf(file_path)
-        elif file_path.lower().endswith('.docx'):
-            return self.extract_text_from_docx(file_path)
-        elif file_path.lower().endswith('.txt'):
-            return self.extract_text_from_txt(file_path)
+    def extract_text(self, source, filename=None):
+        """Extract text based on file extension
+        
+        ``source`` is a file path, or the uploaded bytes / binary file object
+        together with the ``filename`` it was uploaded as.
+        """
+        return self.extract_text_with_info(source, filename)[0]
+    
+    def extract_text_with_info(self, source, filename=None, in_process=False):
+        """Like extract_text, also returning a dict describing the extraction
+        
+        ``in_process`` bypasses the text store and extraction pool.
+        """
+        if filename is None:
+            filename = source if isinstance(source, (str, os.PathLike)) else ''
+        filename = os.fspath(filename).lower()
+        
+        if filename.endswith('.pdf'):
+            return self.extract_stored_text(source, 'pdf', self.extract_pdf_with_info, in_process)
+        elif filename.endswith('.docx'):
+            return self.extract_stored_text(source, 'docx', self.extract_docx_with_info, in_process)
+        elif filename.endswith('.txt'):
+            return self.extract_text_from_txt(source), {'format': 'txt', 'truncated': False}
         else:
-            return "Unsupported file format. Please use PDF, DOCX, or TXT files."
+            return "Unsupported file format. Please use PDF, DOCX, or TXT files.", {}
+    
+    def extract_stored_text(self, source, file_format, extractor, in_process=False):
+        """Run a PDF/DOCX extractor, reusing text stored for identical files
+        
+        With an extraction pool the extractor runs in a worker process and
+        raises ExtractionTimeout if it overruns the pool's timeout.
+        """
+        if in_process or (self.text_store is None and self.extraction_pool is None):
+            return extractor(source)
+        
+        data = read_source(source)
+        if self.text_store is not None:
+            file_hash = content_hash(data)
+            # Budgets change the text, so they are part of the version
+            version = f'{file_format}-{EXTRACTOR_VERSION}-{self.max_pages}p-{self.max_chars}c'
+            stored = self.text_store.get(file_hash, version)
+            if stored is not None:
+                return stored
+        
+        if self.extraction_pool is not None:
+            text, info = self.extraction_pool.run(file_format, data)
+        else:
+            text, info = extractor(data)
+        
+        if self.text_store is not None and not text.startswith('Error reading'):
+            self.text_store.put(file_hash, version, text, info)
+        return text, info
     
     def extract_contact_info(self, text):
         """Enhanced contact information extraction"""
+        hits = self.as_document(text).field_hits
         contact_info = {}
         
-        # Email extraction (improved)
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        contact_info['emails'] = list(set(emails))
-        
-        # Phone extraction (enhanced patterns)
-        phone_patterns = [
-            r'(\+\d{1,4}[-.\s]?)?\(?\d{3,4}\)?[-.\s]?\d{3,4}[-.\s]?\d{4}',
-            r'\+\d{1,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}',
-            r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\(\d{3}\)\s*\d{3}[-.\s]?\d{4}'
-        ]
-        phones = []
-        for pattern in phone_patterns:
-            phones.extend(re.findall(pattern, text))
-        contact_info['phones'] = list(set(phones))
+        contact_info['emails'] = list(set(hits['emails']))
+        contact_info['phones'] = list(set(hits['phones']))
         
         # Social media and professional profiles
-        linkedin_pattern = r'(?:linkedin\.com/in/|linkedin\.com/profile/view\?id=)[\w-]+'
-        linkedin = re.findall(linkedin_pattern, text.lower())
-        contact_info['linkedin'] = linkedin
-        
-        github_pattern = r'(?:github\.com/|git\.io/)[\w-]+'
-        github = re.findall(github_pattern, text.lower())
-        contact_info['github'] = github
-        
-        twitter_pattern = r'(?:twitter\.com/|@)[\w-]+'
-        twitter = re.findall(twitter_pattern, text.lower())
-        contact_info['twitter'] = twitter
-        
-        # Location extraction
-        location_patterns = [
-            r'([A-Z][a-z]+,\s*[A-Z]{2})',  # City, State
-            r'([A-Z][a-z]+,\s*[A-Z][a-z]+)',  # City, Country
-        ]
-        locations = []
-        for pattern in location_patterns:
-            locations.extend(re.findall(pattern, text))
-        contact_info['locations'] = locations
+        contact_info['linkedin'] = hits['linkedin']
+        contact_info['github'] = hits['github']
+        contact_info['twitter'] = hits['twitter']
         
-        # Website extraction (improved)
-        website_pattern = r'(?:https?://)?(?:www\.)?[\w-]+\.[\w.-]+(?:/[\w.-]*)*'
-        websites = re.findall(website_pattern, text.lower())
-        contact_info['websites'] = [w for w in websites if not any(social in w for social in ['linkedin', 'github', 'twitter'])]
+        contact_info['locations'] = hits['locations']
+        contact_info['websites'] = [w for w in hits['websites'] if not any(social in w for social in ['linkedin', 'github', 'twitter'])]
         
         return contact_info
     
     def extract_skills(self, text):
         """Enhanced skills extraction with industry context"""
-        text_lower = text.lower()
+        found_terms = self.as_document(text).term_counts
         found_skills = {}
         
         for category, skills in self.skill_keywords.items():
@@ -609,27 +914,19 @@ class EnhancedCVAnalyzer:
             for skill in skills:
                 # Check for exact matches and variations
                 skill_lower = skill.lower()
-                if skill_lower in text_lower:
+                if skill_lower in found_terms:
                     found_skills[category].append(skill)
                 # Check for skill variations (e.g., "JavaScript" vs "JS")
                 elif category == 'programming':
-                    variations = {
-                        'javascript': ['js', 'node'],
-                        'python': ['py'],
-                        'typescript': ['ts']
-                    }
-                    if skill_lower in variations:
-                        for var in variations[skill_lower]:
-                            if var in text_lower:
-                                found_skills[category].append(skill)
-                                break
+                    if any(var in found_terms for var in self.skill_variations.get(skill_lower, [])):
+                        found_skills[category].append(skill)
         
         return found_skills
     
     def identify_sections(self, text):
         """Enhanced section identification"""
         sections = {}
-        lines = text.split('\n')
+        lines = self.as_document(text).lines
         
         current_section = 'general'
         sections[current_section] = []
@@ -659,10 +956,12 @@ class EnhancedCVAnalyzer:
     
     def analyze_length_and_structure(self, text):
         """Enhanced structure analysis"""
-        words = text.split()
+        document = self.as_document(text)
+        text = document.text
+        words = document.words
         word_count = len(words)
         char_count = len(text)
-        lines = text.split('\n')
+        lines = document.lines
         non_empty_lines = [line for line in lines if line.strip()]
         line_count = len(non_empty_lines)
         
@@ -937,33 +1236,15 @@ class EnhancedCVAnalyzer:
         """Enhanced content quality analysis"""
         # Quantifiable achievements
         numbers_pattern = r'\b\d+(?:\.\d+)?(?:%|k|K|million|M|billion|B|x|X|\+)?\b'
-        numbers_found = len(re.findall(numbers_pattern, text))
-        
-        # Action verbs (expanded list)
-        action_verbs = [
-            'achieved', 'developed', 'implemented', 'led', 'managed', 'created', 
-            'improved', 'increased', 'reduced', 'designed', 'built', 'optimized',
-            'delivered', 'coordinated', 'supervised', 'analyzed', 'established',
-            'streamlined', 'automated', 'enhanced', 'collaborated', 'initiated',
-            'executed', 'facilitated', 'mentored', 'negotiated', 'resolved'
-        ]
-        action_verb_count = sum(1 for verb in action_verbs if verb.lower() in text.lower())
-        
-        # Impact keywords
-        impact_keywords = [
-            'results', 'success', 'efficiency', 'performance', 'growth', 
-            'savings', 'revenue', 'productivity', 'quality', 'innovation',
-            'transformation', 'optimization', 'achievement', 'improvement',
-            'solution', 'impact', 'breakthrough', 'milestone'
-        ]
-        impact_count = sum(1 for keyword in impact_keywords if keyword.lower() in text.lower())
+        document = self.as_document(text)
+        text_lower = document.lower
+        numbers_found = len(re.findall(numbers_pattern, document.text))
         
-        # Professional language
-        professional_words = [
-            'strategic', 'analytical', 'comprehensive', 'systematic', 'innovative',
-            'collaborative', 'proactive', 'efficient', 'effective', 'dynamic'
-        ]
-        professional_count = sum(1 for word in professional_words if word.lower() in text.lower())
+        # Keywords found inside any word, counted once each
+        features = document.word_features.values()
+        action_verb_count = len(set().union(*(feature.action_verbs for feature in features)))
+        impact_count = len(set().union(*(feature.impact_keywords for feature in features)))
+        professional_count = len(set().union(*(feature.professional_words for feature in features)))
         
         quality_analysis = {
             'quantifiable_achievements': numbers_found,
@@ -992,9 +1273,10 @@ class EnhancedCVAnalyzer:
         else:
             ats_weight = 0.3
         
+        signals = self.ats_signals(text)
+        
         # Standard headers
-        standard_headers = ['experience', 'education', 'skills', 'summary', 'contact']
-        headers_found = sum(1 for header in standard_headers if header in text.lower())
+        headers_found = signals['headers_found']
         
         if headers_found >= 4:
             ats_score += 25
@@ -1006,7 +1288,7 @@ class EnhancedCVAnalyzer:
             ats_feedback.append("⚠ Use more standard section headers")
         
         # Clean formatting
-        special_chars = len(re.findall(r'[^\w\s\-\.\,\(\)\@\:\/\%\&\#]', text))
+        special_chars = signals['special_characters']
         if special_chars < 30:
             ats_score += 20
             ats_feedback.append("✓ Clean formatting for ATS parsing")
@@ -1017,7 +1299,7 @@ class EnhancedCVAnalyzer:
             ats_feedback.append("⚠ Reduce special characters for better ATS compatibility")
         
         # Contact information
-        if '@' in text:
+        if signals['has_at']:
             ats_score += 15
             ats_feedback.append("✓ Email format is ATS-friendly")
         
@@ -1029,7 +1311,7 @@ class EnhancedCVAnalyzer:
         total_words = structure_info['word_count']
         if total_words > 0:
             # Simple keyword density check
-            important_word_count = len(re.findall(r'\b(?:experience|skill|manage|develop|lead|project)\b', text.lower()))
+            important_word_count = signals['keyword_count']
             keyword_density = (important_word_count / total_words) * 100
             
             if keyword_density >= 2:
@@ -1052,6 +1334,10 @@ class EnhancedCVAnalyzer:
         
         return min(int(weighted_score), 100), ats_feedback
     
+    def ats_signals(self, text):
+        """Counts taken from the text by analyze_ats_compatibility, computed once per document"""
+        return self.as_document(text).ats_signals
+    
     def calculate_overall_score(self, contact_score, skills_score, structure_score, sections_score, cv_type):
         """Industry-aware overall scoring"""
         # Base weights
@@ -1084,6 +1370,54 @@ class EnhancedCVAnalyzer:
         
         return round(overall_score, 1)
     
+    @property
+    def scoring_engine(self):
+        """ScoringEngine for the current taxonomy"""
+        from scoring import ScoringEngine
+        taxonomy = self.taxonomy
+        engine = self._scoring_engine
+        if engine is None or engine.taxonomy_version != taxonomy.version:
+            engine = self._scoring_engine = ScoringEngine(taxonomy)
+        return engine
+    
+    @pins_taxonomy
+    def scoring_features(self, text, values=None):
+        """Feature row of a CV for ScoringEngine.score
+        
+        Stage outputs already in ``values`` (as built by run_analysis) are
+        reused, the others are computed. Rows only fit the engine of the
+        taxonomy they were encoded with, so encode and score a batch inside
+        one ``pinned_taxonomy()`` block.
+        """
+        document = self.as_document(text)
+        values = dict(values or {})
+        for name, _, stage in self.ANALYSIS_STAGES:
+            if name in ('cv_type', 'contact_info', 'skills', 'sections', 'structure_info') and name not in values:
+                values[name] = stage(self, document, values)
+        return self.scoring_engine.encode(values['cv_type'], values['contact_info'], values['skills'],
+                                          values['sections'], values['structure_info'], self.ats_signals(document))
+    
+    @property
+    def feature_schema(self):
+        """Names of the feature vector's values under the current taxonomy, and their id"""
+        engine = self.scoring_engine
+        schema = self._feature_schema
+        if schema is None or schema[0] != engine.taxonomy_version:
+            names = [name for name, _, _ in self.FEATURE_FIELDS] + engine.columns
+            schema = self._feature_schema = (engine.taxonomy_version,
+                                             {'id': content_hash('\n'.join(names))[:16], 'names': names})
+        return schema[1]
+    
+    def feature_vector(self, document, values):
+        """Numeric features of an analysis, named by feature_schema, from its stage outputs"""
+        vector = [float(build(values[stage])) for _, stage, build in self.FEATURE_FIELDS]
+        vector += self.scoring_features(document, values).tolist()
+        return {
+            'schema': self.feature_schema['id'],
+            # Whole numbers as ints keep the response compact
+            'values': [int(value) if value.is_integer() else value for value in vector]
+        }
+    
     def generate_improvement_suggestions(self, contact_score, skills_score, structure_score, 
                                        sections_score, content_quality, cv_type, completeness):
         """Enhanced improvement suggestions"""
@@ -1181,33 +1515,118 @@ class EnhancedCVAnalyzer:
         
         return suggestions
     
-    def analyze_job_match(self, cv_text, job_description):
-        """Analyze how well CV matches job description"""
-        cv_words = set(re.findall(r'\b[a-zA-Z]{3,}\b', cv_text.lower()))
-        job_words = set(re.findall(r'\b[a-zA-Z]{3,}\b', job_description.lower()))
-        
-        # Calculate overlap
-        common_words = cv_words.intersection(job_words)
-        match_percentage = (len(common_words) / len(job_words)) * 100 if job_words else 0
+    @pins_taxonomy
+    def compile_job_profile(self, job_description):
+        """Precompute the job description state used by analyze_job_match"""
+        job_document = self.as_document(job_description)
         
         # Extract requirements from job description
+        job_terms = job_document.term_counts
         job_skills = []
         for category, skills in self.skill_keywords.items():
             for skill in skills:
-                if skill.lower() in job_description.lower():
+                if skill.lower() in job_terms:
                     job_skills.append(skill)
         
+        return {
+            'job_tokens': job_document.token_set,
+            'job_skills': job_skills,
+            'taxonomy_version': self.taxonomy_version
+        }
+    
+    @pins_taxonomy
+    def analyze_job_match(self, cv_text, job_description=None, profile=None, cv_skills=None,
+                          weighting=None):
+        """Analyze how well CV matches job description
+        
+        Pass a ``profile`` from compile_job_profile instead of the job
+        description, and the CV's extract_skills result as ``cv_skills``,
+        to skip recomputing them. ``weighting='bm25'`` adds a
+        ``weighted_match`` block scored with corpus IDF statistics.
+        """
+        if profile is None:
+            profile = self.compile_job_profile(job_description)
+        cv_document = self.as_document(cv_text)
+        cv_words = cv_document.token_set
+        job_words = profile['job_tokens']
+        job_skills = profile['job_skills']
+        
+        # Calculate overlap
+        common_words = cv_words.intersection(job_words)
+        match_percentage = (len(common_words) / len(job_words)) * 100 if job_words else 0
+        
         # Check CV coverage of job skills
-        cv_skills = self.extract_skills(cv_text)
-        cv_skill_list = []
+        if cv_skills is None:
+            cv_skills = self.extract_skills(cv_document)
+        cv_skill_list = set()
         for skills_list in cv_skills.values():
-            cv_skill_list.extend([skill.lower() for skill in skills_list])
+            cv_skill_list.update(skill.lower() for skill in skills_list)
         
         matching_skills = [skill for skill in job_skills if skill.lower() in cv_skill_list]
         missing_skills = [skill for skill in job_skills if skill.lower() not in cv_skill_list]
         
         skill_match_percentage = (len(matching_skills) / len(job_skills)) * 100 if job_skills else 0
         
+        match = self.build_job_match(match_percentage, skill_match_percentage, job_skills,
+                                     matching_skills, missing_skills)
+        if weighting == 'bm25':
+            match['weighted_match'] = self.bm25_job_matches([cv_document], job_words)[0]
+        return match
+    
+    def bm25_job_matches(self, cv_documents, job_words, top_terms=10):
+        """Score CVs against job tokens with BM25, using corpus IDF statistics
+        
+        Returns, per CV, the raw BM25 score, the IDF-weighted share of job
+        tokens the CV contains and the job tokens contributing most.
+        """
+        terms = sorted(job_words)
+        if self.corpus_stats is not None:
+            documents, average_length, doc_freq = self.corpus_stats.snapshot(terms)
+        else:
+            documents, average_length, doc_freq = 0, 0.0, {}
+        
+        import numpy as np
+        df = np.array([doc_freq.get(term, 0) for term in terms], dtype=np.float64)
+        idf = np.log1p((documents - df + 0.5) / (df + 0.5))
+        columns = {term: column for column, term in enumerate(terms)}
+        
+        tf = np.zeros((len(cv_documents), len(terms)), dtype=np.float64)
+        lengths = np.zeros(len(cv_documents), dtype=np.float64)
+        for row, document in enumerate(cv_documents):
+            counts = document.token_counts
+            for term in document.token_set & columns.keys():
+                tf[row, columns[term]] = counts[term]
+            lengths[row] = len(document.tokens)
+        
+        if not average_length:
+            average_length = lengths.mean() if len(lengths) and lengths.mean() else 1.0
+        norm = self.BM25_K1 * (1 - self.BM25_B + self.BM25_B * lengths / average_length)
+        contributions = idf * tf * (self.BM25_K1 + 1) / (tf + norm[:, None])
+        scores = contributions.sum(axis=1)
+        idf_total = idf.sum()
+        coverage = ((tf > 0) @ idf) / idf_total * 100 if idf_total else np.zeros(len(cv_documents))
+        
+        matches = []
+        for row in range(len(cv_documents)):
+            top = [column for column in np.argsort(-contributions[row], kind='stable')[:top_terms]
+                   if contributions[row, column] > 0]
+            matches.append({
+                'weighting': 'bm25',
+                'bm25_score': round(float(scores[row]), 3),
+                'weighted_match_percentage': round(float(coverage[row]), 1),
+                'top_terms': [{
+                    'term': terms[column],
+                    'frequency': int(tf[row, column]),
+                    'idf': round(float(idf[column]), 3),
+                    'contribution': round(float(contributions[row, column]), 3)
+                } for column in top],
+                'corpus_documents': documents
+            })
+        return matches
+    
+    def build_job_match(self, match_percentage, skill_match_percentage, job_skills,
+                        matching_skills, missing_skills):
+        """Assemble a job match result with recommendations and grade"""
         # Generate recommendations
         recommendations = []
         if skill_match_percentage < 70:
@@ -1236,92 +1655,309 @@ class EnhancedCVAnalyzer:
                          'Fair' if match_percentage >= 40 else 'Poor'
         }
     
-    def analyze_cv(self, file_path):
-        """Main enhanced CV analysis method"""
+    @pins_taxonomy
+    def rank_job_matches(self, cv_texts, job_description=None, profile=None, weighting=None):
+        """Match many CVs against one job in a single vectorized pass
+        
+        Returns one analyze_job_match result per CV, in input order. The job's
+        tokens and the terms that reveal its skills form a shared vocabulary;
+        one scan of each CV for that vocabulary alone gives a sparse (CSR)
+        CV-by-term incidence matrix, and a single product with the
+        term-by-(job token, job skill) matrix yields every overlap.
+        """
+        if profile is None:
+            profile = self.compile_job_profile(job_description)
+        job_skills = profile['job_skills']
+        job_tokens = profile['job_tokens']
+        
+        # A CV has a job skill when extract_skills would find it: by name, or for
+        # programming skills by one of its (lowercase, matchable) variations
+        programming = {skill.lower() for skill in self.skill_keywords.get('programming', [])}
+        skill_terms = []
+        for skill in job_skills:
+            terms = {skill.lower()}
+            if skill.lower() in programming:
+                terms.update(variation for variation in self.skill_variations.get(skill.lower(), [])
+                             if variation == variation.lower())
+            skill_terms.append(terms)
+        vocabulary = tuple(sorted(set(job_tokens).union(*skill_terms)))
+        positions = {term: position for position, term in enumerate(vocabulary)}
+        
+        # Term-by-(job token, job skill) matrix: column 0 marks the job's tokens
+        import numpy as np
+        job_matrix = np.zeros((len(vocabulary), 1 + len(job_skills)))
+        job_matrix[[positions[term] for term in job_tokens], 0] = 1
+        for column, terms in enumerate(skill_terms, start=1):
+            job_matrix[[positions[term] for term in terms], column] = 1
+        
+        # CV-by-term incidence in CSR form; tokens and taxonomy terms share the
+        # KeywordMatcher's word boundaries, so presence matches token_set and term_counts
+        cv_count = len(cv_texts)
+        indptr = np.zeros(cv_count + 1, dtype=np.intp)
+        indices = []
+        if vocabulary:
+            matcher = vocabulary_matcher(vocabulary)
+            for row, cv_text in enumerate(cv_texts):
+                found = matcher.count(self.as_document(cv_text).lower)
+                indices.extend(positions[term] for term in found)
+                indptr[row + 1] = len(indices)
+        indices = np.asarray(indices, dtype=np.intp)
+        
+        # Sparse product: per-row sums of the job matrix rows the CV contains
+        totals = np.zeros((len(indices) + 1, job_matrix.shape[1]))
+        np.cumsum(job_matrix[indices], axis=0, out=totals[1:])
+        overlaps = totals[indptr[1:]] - totals[indptr[:-1]]
+        term_overlap = overlaps[:, 0]
+        skill_matrix = overlaps[:, 1:] > 0
+        skill_overlap = skill_matrix.sum(axis=1)
+        
+        job_token_count = len(job_tokens)
+        match_percentages = (term_overlap / job_token_count) * 100 if job_token_count else None
+        skill_match_percentages = (skill_overlap / len(job_skills)) * 100 if job_skills else None
+        
+        matches = []
+        for row in range(cv_count):
+            matched = skill_matrix[row]
+            matches.append(self.build_job_match(
+                float(match_percentages[row]) if match_percentages is not None else 0,
+                float(skill_match_percentages[row]) if skill_match_percentages is not None else 0,
+                job_skills,
+                [skill for skill, hit in zip(job_skills, matched) if hit],
+                [skill for skill, hit in zip(job_skills, matched) if not hit]
+            ))
+        
+        if weighting == 'bm25' and cv_texts:
+            cv_documents = [self.as_document(cv_text) for cv_text in cv_texts]
+            for match, weighted in zip(matches, self.bm25_job_matches(cv_documents, job_tokens)):
+                match['weighted_match'] = weighted
+        return matches
+    
+    # (stage, stages it reads, function(analyzer, document, stage values)), in dependency order
+    ANALYSIS_STAGES = [
+        ('cv_type', (), lambda self, document, values: self.detect_cv_type(document)),
+        ('contact_info', (), lambda self, document, values: self.extract_contact_info(document)),
+        ('skills', (), lambda self, document, values: self.extract_skills(document)),
+        ('sections', (), lambda self, document, values: self.identify_sections(document)),
+        ('structure_info', (), lambda self, document, values: self.analyze_length_and_structure(document)),
+        ('content_quality', ('sections',),
+         lambda self, document, values: self.analyze_content_quality(document, values['sections'])),
+        ('experience_info', (), lambda self, document, values: self.extract_experience_duration(document)),
+        ('education_level', (), lambda self, document, values: self.extract_education_level(document)),
+        ('certifications', (), lambda self, document, values: self.extract_certifications(document)),
+        ('keyword_analysis', (), lambda self, document, values: self.analyze_keyword_density(document)),
+        ('readability', (), lambda self, document, values: self.check_grammar_and_readability(document)),
+        ('completeness', ('sections', 'cv_type'),
+         lambda self, document, values: self.analyze_cv_completeness(values['sections'], values['cv_type'])),
+        ('contact_score', ('contact_info',),
+         lambda self, document, values: self.score_contact_section(values['contact_info'])),
+        ('skills_score', ('skills', 'cv_type'),
+         lambda self, document, values: self.score_skills_section(values['skills'], values['cv_type'])),
+        ('structure_score', ('structure_info', 'cv_type'),
+         lambda self, document, values: self.score_structure_and_length(values['structure_info'], values['cv_type'])),
+        ('sections_score', ('sections', 'cv_type'),
+         lambda self, document, values: self.score_sections(values['sections'], values['cv_type'])),
+        ('ats_score', ('structure_info', 'cv_type'),
+         lambda self, document, values: self.analyze_ats_compatibility(
+             document, values['structure_info'], values['cv_type'])),
+        ('overall_score', ('contact_score', 'skills_score', 'structure_score', 'sections_score', 'cv_type'),
+         lambda self, document, values: self.calculate_overall_score(
+             values['contact_score'][0], values['skills_score'][0], values['structure_score'][0],
+             values['sections_score'][0], values['cv_type'])),
+        ('grade', ('overall_score',), lambda self, document, values: self.get_grade(values['overall_score'])),
+        ('suggestions', ('contact_score', 'skills_score', 'structure_score', 'sections_score',
+                         'content_quality', 'cv_type', 'completeness'),
+         lambda self, document, values: self.generate_improvement_suggestions(
+             values['contact_score'][0], values['skills_score'][0], values['structure_score'][0],
+             values['sections_score'][0], values['content_quality'], values['cv_type'], values['completeness'])),
+        ('industry_feedback', ('cv_type', 'skills', 'sections', 'structure_info'),
+         lambda self, document, values: self.generate_industry_specific_feedback(
+             values['cv_type'], values['skills'], values['sections'], values['structure_info'])),
+        ('features', ('overall_score', 'contact_score', 'skills_score', 'structure_score', 'sections_score',
+                      'ats_score', 'completeness', 'cv_type', 'experience_info', 'education_level',
+                      'certifications', 'readability', 'content_quality', 'keyword_analysis',
+                      'contact_info', 'skills', 'sections', 'structure_info'),
+         lambda self, document, values: self.feature_vector(document, values)),
+    ]
+    
+    # (result field, stage it comes from, value builder), in response order
+    OUTPUT_FIELDS = [
+        ('overall_score', 'overall_score', lambda value: value),
+        ('cv_type', 'cv_type', lambda value: value),
+        ('scores.contact', 'contact_score', lambda value: round(value[0], 1)),
+        ('scores.skills', 'skills_score', lambda value: round(value[0], 1)),
+        ('scores.structure', 'structure_score', lambda value: round(value[0], 1)),
+        ('scores.sections', 'sections_score', lambda value: round(value[0], 1)),
+        ('scores.ats_compatibility', 'ats_score', lambda value: round(value[0], 1)),
+        ('scores.completeness', 'completeness', lambda value: round(value['completeness_score'], 1)),
+        ('scores.overall', 'overall_score', lambda value: value),
+        ('feedback.contact', 'contact_score', lambda value: value[1]),
+        ('feedback.skills', 'skills_score', lambda value: value[1]),
+        ('feedback.structure', 'structure_score', lambda value: value[1]),
+        ('feedback.sections', 'sections_score', lambda value: value[1]),
+        ('feedback.ats_compatibility', 'ats_score', lambda value: value[1]),
+        ('feedback.industry_specific', 'industry_feedback', lambda value: value),
+        ('detailed_analysis.content_quality', 'content_quality', lambda value: value),
+        ('detailed_analysis.skills_breakdown', 'skills', lambda value: value),
+        ('detailed_analysis.sections_content', 'sections', lambda value: list(value.keys())),
+        ('detailed_analysis.structure_metrics', 'structure_info', lambda value: value),
+        ('detailed_analysis.experience_analysis', 'experience_info', lambda value: value),
+        ('detailed_analysis.education_level', 'education_level', lambda value: value),
+        ('detailed_analysis.certifications_found', 'certifications', lambda value: value),
+        ('detailed_analysis.keyword_analysis', 'keyword_analysis', lambda value: value),
+        ('detailed_analysis.readability', 'readability', lambda value: value),
+        ('detailed_analysis.completeness_analysis', 'completeness', lambda value: value),
+        ('suggestions', 'suggestions', lambda value: value),
+        ('grade', 'grade', lambda value: value),
+        ('contact_info_extracted', 'contact_info', lambda value: value),
+        ('extraction', 'extraction', lambda value: value),
+        ('features', 'features', lambda value: value),
+    ]
+    
+    # (feature name, stage it comes from, number builder), in feature vector order;
+    # the ScoringEngine columns, skill counts per category among them, follow
+    FEATURE_FIELDS = [
+        ('overall_score', 'overall_score', lambda value: value),
+        ('score.contact', 'contact_score', lambda value: value[0]),
+        ('score.skills', 'skills_score', lambda value: value[0]),
+        ('score.structure', 'structure_score', lambda value: value[0]),
+        ('score.sections', 'sections_score', lambda value: value[0]),
+        ('score.ats_compatibility', 'ats_score', lambda value: value[0]),
+        ('score.completeness', 'completeness', lambda value: value['completeness_score']),
+        ('completeness.missing_sections', 'completeness', lambda value: len(value['missing_sections'])),
+        ('industry_confidence', 'cv_type', lambda value: value['confidence'] if isinstance(value, dict) else 0),
+        ('experience.explicit_years', 'experience_info', lambda value: value['explicit_years']),
+        ('experience.calculated_years', 'experience_info', lambda value: value['calculated_years']),
+        ('experience.estimated_years', 'experience_info', lambda value: value['estimated_years']),
+        ('education_level', 'education_level', lambda value: EDUCATION_RANKS.index(value)),
+        ('certifications', 'certifications', lambda value: len(value)),
+        ('readability.flesch_reading_ease', 'readability', lambda value: value['flesch_reading_ease']),
+        ('readability.avg_sentence_length', 'readability', lambda value: value['avg_sentence_length']),
+        ('readability.total_sentences', 'readability', lambda value: value['total_sentences']),
+        ('readability.grammar_suggestions', 'readability', lambda value: len(value['grammar_suggestions'])),
+        ('content.quantifiable_achievements', 'content_quality', lambda value: value['quantifiable_achievements']),
+        ('content.action_verbs_used', 'content_quality', lambda value: value['action_verbs_used']),
+        ('content.impact_keywords', 'content_quality', lambda value: value['impact_keywords']),
+        ('content.professional_language', 'content_quality', lambda value: value['professional_language']),
+        ('content.has_summary', 'content_quality', lambda value: value['has_summary']),
+        ('content.has_achievements', 'content_quality', lambda value: value['has_achievements']),
+        ('content.depth_score', 'content_quality', lambda value: value['content_depth_score']),
+        ('keywords.total_words', 'keyword_analysis', lambda value: value['total_words']),
+        ('keywords.total_unique_words', 'keyword_analysis', lambda value: value['total_unique_words']),
+        ('structure.avg_chars_per_word', 'structure_info', lambda value: value['avg_chars_per_word']),
+        ('structure.bold_text', 'structure_info', lambda value: value['formatting_elements']['bold_text']),
+        ('structure.italic_text', 'structure_info', lambda value: value['formatting_elements']['italic_text']),
+        ('structure.caps_words', 'structure_info', lambda value: value['formatting_elements']['caps_words']),
+    ]
+    
+    def resolve_analysis(self, include=None, exclude=None):
+        """Resolve include/exclude field lists to (result fields, stages to run)
+        
+        A name selects a result field and everything below it, e.g.
+        ``scores`` or ``scores.skills``. Raises ValueError for unknown names.
+        """
+        paths = [path for path, _, _ in self.OUTPUT_FIELDS]
+        
+        def expand(names):
+            selected = set()
+            for name in names:
+                matched = {path for path in paths if path == name or path.startswith(name + '.')}
+                if not matched:
+                    raise ValueError(f"Unknown result field '{name}'")
+                selected |= matched
+            return selected
+        
+        fields = expand(include) if include is not None else set(paths)
+        if exclude is not None:
+            fields -= expand(exclude)
+        
+        dependencies = {name: requires for name, requires, _ in self.ANALYSIS_STAGES}
+        stages = set()
+        pending = [stage for path, stage, _ in self.OUTPUT_FIELDS if path in fields]
+        while pending:
+            stage = pending.pop()
+            if stage in dependencies and stage not in stages:
+                stages.add(stage)
+                pending.extend(dependencies[stage])
+        return fields, stages
+    
+    def analyze_cv(self, source, filename=None, include=None, exclude=None, profiler=None):
+        """Main enhanced CV analysis method
+        
+        ``source`` is a file path, or the uploaded bytes / binary file object
+        together with its ``filename``. ``include``/``exclude`` are lists of
+        result fields (see resolve_analysis); only the stages those fields
+        need are run, and the response lists the stages that were skipped.
+        With an AnalysisProfiler, extraction runs in-process so it can be
+        profiled, and the response gains a ``_profile`` block.
+        """
+        fields, stages = self.resolve_analysis(include, exclude)
+        if profiler is None:
+            return self.run_analysis(source, filename, fields, stages, include is not None or exclude is not None)
+        
+        profiler.start()
+        try:
+            results = self.run_analysis(source, filename, fields, stages,
+                                        include is not None or exclude is not None, profiler)
+        finally:
+            profile = profiler.finish()
+        return {**results, '_profile': profile}
+    
+    @pins_taxonomy
+    def run_analysis(self, source, filename, fields, stages, selective, profiler=None):
+        """Extract and analyze a CV, producing the given result fields"""
         try:
             # Extract text
-            text = self.extract_text(file_path)
+            try:
+                started = time.perf_counter()
+                with profiler.stage('extraction') if profiler is not None else nullcontext():
+                    text, extraction_info = self.extract_text_with_info(
+                        source, filename, in_process=profiler is not None
+                    )
+                if self.metrics is not None:
+                    self.metrics.observe_extraction(extraction_info.get('format', 'unknown'),
+                                                    time.perf_counter() - started)
+            except ExtractionTimeout as e:
+                return {"error": f"{str(e)}. The file may be malformed or too large to analyze."}
             if not text or "Error reading" in text or "Unsupported file format" in text:
                 return {"error": "Could not extract text from file. Please ensure it's a valid PDF, DOCX, or TXT file."}
             
             if len(text.strip()) < 50:
                 return {"error": "File appears to be empty or contains too little text to analyze."}
             
-            # Detect CV type/industry
-            cv_type = self.detect_cv_type(text)
-            
-            # Extract comprehensive information
-            contact_info = self.extract_contact_info(text)
-            skills = self.extract_skills(text)
-            sections = self.identify_sections(text)
-            structure_info = self.analyze_length_and_structure(text)
-            content_quality = self.analyze_content_quality(text, sections)
-            experience_info = self.extract_experience_duration(text)
-            education_level = self.extract_education_level(text)
-            certifications = self.extract_certifications(text)
-            keyword_analysis = self.analyze_keyword_density(text)
-            readability = self.check_grammar_and_readability(text)
-            completeness = self.analyze_cv_completeness(sections, cv_type)
-            
-            # Calculate scores
-            contact_score, contact_feedback = self.score_contact_section(contact_info)
-            skills_score, skills_feedback = self.score_skills_section(skills, cv_type)
-            structure_score, structure_feedback = self.score_structure_and_length(structure_info, cv_type)
-            sections_score, sections_feedback = self.score_sections(sections, cv_type)
-            ats_score, ats_feedback = self.analyze_ats_compatibility(text, structure_info, cv_type)
-            
-            overall_score = self.calculate_overall_score(
-                contact_score, skills_score, structure_score, sections_score, cv_type
-            )
-            
-            # Generate suggestions
-            suggestions = self.generate_improvement_suggestions(
-                contact_score, skills_score, structure_score, sections_score, 
-                content_quality, cv_type, completeness
-            )
+            # Normalize once; every stage reads the shared document
+            document = self.as_document(text)
+            # Corpus statistics are best-effort; profiled runs time the analysis alone
+            if self.corpus_stats is not None and profiler is None:
+                try:
+                    self.corpus_stats.add_document(content_hash(text), document.token_set, len(document.tokens))
+                except Exception as e:
+                    print(f"Could not update corpus statistics: {type(e).__name__}: {str(e)}")
             
-            # Generate industry-specific feedback
-            industry_feedback = self.generate_industry_specific_feedback(
-                cv_type, skills, sections, structure_info
-            )
+            # Run only the stages the selected fields need, in dependency order
+            values = {'extraction': extraction_info}
+            for name, dependencies, stage in self.ANALYSIS_STAGES:
+                if name in stages:
+                    started = time.perf_counter()
+                    with profiler.stage(name) if profiler is not None else nullcontext():
+                        values[name] = stage(self, document, values)
+                    if self.metrics is not None:
+                        self.metrics.observe_stage(name, time.perf_counter() - started)
             
             # Compile comprehensive results
-            results = {
-                'overall_score': overall_score,
-                'cv_type': cv_type,
-                'scores': {
-                    'contact': round(contact_score, 1),
-                    'skills': round(skills_score, 1),
-                    'structure': round(structure_score, 1),
-                    'sections': round(sections_score, 1),
-                    'ats_compatibility': round(ats_score, 1),
-                    'completeness': round(completeness['completeness_score'], 1),
-                    'overall': overall_score
-                },
-                'feedback': {
-                    'contact': contact_feedback,
-                    'skills': skills_feedback,
-                    'structure': structure_feedback,
-                    'sections': sections_feedback,
-                    'ats_compatibility': ats_feedback,
-                    'industry_specific': industry_feedback
-                },
-                'detailed_analysis': {
-                    'content_quality': content_quality,
-                    'skills_breakdown': skills,
-                    'sections_content': list(sections.keys()),
-                    'structure_metrics': structure_info,
-                    'experience_analysis': experience_info,
-                    'education_level': education_level,
-                    'certifications_found': certifications,
-                    'keyword_analysis': keyword_analysis,
-                    'readability': readability,
-                    'completeness_analysis': completeness
-                },
-                'suggestions': suggestions,
-                'grade': self.get_grade(overall_score),
-                'contact_info_extracted': contact_info
-            }
+            results = {}
+            for path, stage_name, output in self.OUTPUT_FIELDS:
+                if path in fields:
+                    *parents, key = path.split('.')
+                    target = results
+                    for parent in parents:
+                        target = target.setdefault(parent, {})
+                    target[key] = output(values[stage_name])
+            
+            if selective:
+                results['analysis_stages'] = {
+                    'run': [name for name, _, _ in self.ANALYSIS_STAGES if name in stages],
+                    'skipped': [name for name, _, _ in self.ANALYSIS_STAGES if name not in stages]
+                }
             
             return results
             
@@ -1367,8 +2003,190 @@ class EnhancedCVAnalyzer:
                 "level": "D"
             }
 
+def extract_document(file_format, file_data):
+    """Entry point of the extraction worker processes"""
+    if file_format == 'pdf':
+        return analyzer.extract_pdf_with_info(file_data)
+    return analyzer.extract_docx_with_info(file_data)
+
 # Initialize the enhanced analyzer
-analyzer = EnhancedCVAnalyzer()
+startup_phase('definitions')
+metrics = AnalysisMetrics()
+taxonomy_source = TaxonomySource(
+    app.config['TAXONOMY_PATH'],
+    check_interval=app.config['TAXONOMY_CHECK_INTERVAL']
+)
+startup_phase('taxonomy')
+text_store = ExtractedTextStore(app.config['TEXT_STORE_PATH'], app.config['TEXT_STORE_MAX_BYTES'])
+corpus_stats = CorpusStats(app.config['CORPUS_STATS_PATH'])
+startup_phase('stores')
+extraction_pool = None
+if app.config['EXTRACTION_WORKERS'] > 0:
+    extraction_pool = ExtractionPool(
+        extract_document,
+        workers=app.config['EXTRACTION_WORKERS'],
+        timeout=app.config['EXTRACTION_TIMEOUT'],
+        max_tasks=app.config['EXTRACTION_MAX_TASKS']
+    )
+analyzer = EnhancedCVAnalyzer(
+    text_store=text_store,
+    extraction_pool=extraction_pool,
+    max_pages=app.config['EXTRACTION_MAX_PAGES'],
+    max_chars=app.config['EXTRACTION_MAX_CHARS'],
+    corpus_stats=corpus_stats,
+    metrics=metrics,
+    taxonomy_source=taxonomy_source,
+    word_feature_cache_size=app.config['WORD_FEATURE_CACHE_SIZE']
+)
+startup_phase('analyzer')
+result_cache = ResultCache(app.config['RESULT_CACHE_MAX_BYTES'], app.config['RESULT_CACHE_TTL'])
+
+def result_cache_key(kind, *parts):
+    """Cache key tied to the analyzer and taxonomy that produced the result"""
+    return ':'.join((kind, ANALYZER_VERSION, analyzer.taxonomy_version) + parts)
+
+# Batch analysis runs in a process pool, each process with its own analyzer
+batch_pool = None
+batch_pool_lock = threading.Lock()
+batch_analyzer = None
+
+def init_batch_worker(text_store_path, text_store_max_bytes, max_pages, max_chars, corpus_stats_path,
+                      taxonomy_path, taxonomy_check_interval, word_feature_cache_size,
+                      extraction_timeout, extraction_max_tasks):
+    global batch_analyzer
+    # One extraction process per batch worker, so a hanging parser is killed after the
+    # extraction timeout and fails only its own file
+    worker_extraction_pool = None
+    if extraction_timeout is not None:
+        worker_extraction_pool = ExtractionPool(extract_document, workers=1, timeout=extraction_timeout,
+                                                max_tasks=extraction_max_tasks)
+    batch_analyzer = EnhancedCVAnalyzer(
+        text_store=ExtractedTextStore(text_store_path, text_store_max_bytes),
+        extraction_pool=worker_extraction_pool,
+        max_pages=max_pages,
+        max_chars=max_chars,
+        corpus_stats=CorpusStats(corpus_stats_path),
+        metrics=metrics,
+        taxonomy_source=TaxonomySource(taxonomy_path, taxonomy_check_interval),
+        word_feature_cache_size=word_feature_cache_size
+    )
+
+def analyze_batch_file(file_data, filename):
+    return batch_analyzer.analyze_cv(file_data, filename)
+
+def get_batch_pool():
+    """Process pool for /analyze_batch, created lazily so it starts after fork"""
+    global batch_pool
+    with batch_pool_lock:
+        if batch_pool is None:
+            batch_pool = ProcessPoolExecutor(
+                max_workers=app.config['BATCH_WORKERS'],
+                initializer=init_batch_worker,
+                initargs=(app.config['TEXT_STORE_PATH'], app.config['TEXT_STORE_MAX_BYTES'],
+                          app.config['EXTRACTION_MAX_PAGES'], app.config['EXTRACTION_MAX_CHARS'],
+                          app.config['CORPUS_STATS_PATH'], app.config['TAXONOMY_PATH'],
+                          app.config['TAXONOMY_CHECK_INTERVAL'],
+                          app.config['WORD_FEATURE_CACHE_SIZE'],
+                          app.config['EXTRACTION_TIMEOUT'] if app.config['EXTRACTION_WORKERS'] > 0 else None,
+                          app.config['EXTRACTION_MAX_TASKS'])
+            )
+        return batch_pool
+
+def discard_batch_pool(pool=None):
+    """Shut down the batch pool (only if it is still ``pool``, when given); the next batch starts a fresh one"""
+    global batch_pool
+    with batch_pool_lock:
+        if batch_pool is not None and (pool is None or batch_pool is pool):
+            batch_pool.shutdown(wait=False, cancel_futures=True)
+            batch_pool = None
+
+def close_worker_pools():
+    """Stop this process's extraction and batch workers; called when a server worker exits"""
+    if extraction_pool is not None:
+        extraction_pool.close()
+    discard_batch_pool()
+
+candidate_store = CandidateStore(app.config['CANDIDATE_STORE_PATH']) if app.config['CANDIDATE_STORE'] else None
+
+def remember_candidate(file_hash, filename, results):
+    """Index a fresh analysis result in the candidate store, if enabled; never fails the analysis"""
+    if candidate_store is not None and 'error' not in results:
+        try:
+            # Features computed under another taxonomy have other names; those are not stored
+            schema = analyzer.feature_schema
+            feature_names = schema['names'] if results.get('features', {}).get('schema') == schema['id'] else None
+            candidate_store.add(file_hash, filename, results, feature_names)
+        except Exception as e:
+            print(f"Could not index candidate {filename}: {type(e).__name__}: {str(e)}")
+
+def run_analysis_job(file_data, filename):
+    """Analyze a queued upload, sharing the result cache with /analyze"""
+    file_hash = content_hash(file_data)
+    with analyzer.pinned_taxonomy():
+        cache_key = result_cache_key('analyze', file_hash, file_format(filename))
+        results = result_cache.get(cache_key)
+        if results is None:
+            results = analyzer.analyze_cv(file_data, filename)
+            if 'error' not in results:
+                result_cache.set(cache_key, results)
+                remember_candidate(file_hash, filename, results)
+    return results
+
+job_queue = JobQueue(
+    app.config['JOBS_PATH'],
+    lease=app.config['JOB_LEASE'],
+    retention=app.config['JOB_RETENTION']
+)
+job_workers = JobWorkers(job_queue, run_analysis_job, app.config['JOB_WORKERS'])
+
+job_profiles = JobProfileStore(app.config['JOB_PROFILES_PATH'])
+startup_phase('stores')
+
+def load_job_profile(profile_id):
+    """Fetch a stored job profile, recompiling it if the taxonomy has changed"""
+    profile = job_profiles.get(profile_id)
+    if profile is not None and profile['taxonomy_version'] != analyzer.taxonomy_version:
+        profile.update(analyzer.compile_job_profile(profile['job_description']))
+        job_profiles.update(profile_id, profile)
+    return profile
+
+def job_profile_summary(profile):
+    return {
+        'id': profile['id'],
+        'title': profile['title'],
+        'created_at': profile['created_at'],
+        'job_skills': profile['job_skills'],
+        'total_job_skills': len(profile['job_skills']),
+        'total_job_tokens': len(profile['job_tokens'])
+    }
+
+@app.before_request
+def start_job_workers():
+    # Started per process on its first request so queued jobs resume after a restart
+    job_workers.start()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.before_request
+def pin_request_taxonomy():
+    # Cache keys and analysis in one request use the same taxonomy, even across a swap
+    g.taxonomy_token = analyzer.pin_taxonomy()
+
+@app.teardown_request
+def unpin_request_taxonomy(exc):
+    token = g.pop('taxonomy_token', None)
+    if token is not None:
+        analyzer.unpin_taxonomy(token)
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        metrics.observe_request(request.endpoint or 'unmatched', request.method, response.status_code,
+                                time.perf_counter() - started, request.content_length)
+    return response
 
 # Enhanced API Routes
 @app.route('/')
@@ -1400,14 +2218,64 @@ def index():
                 'method': 'POST',
                 'url': '/analyze',
                 'description': 'Upload CV file for comprehensive multi-industry analysis',
-                'parameters': 'file (form-data)',
+                'parameters': 'file (form-data); optional include= / exclude= comma-separated result '
+                              'fields (e.g. include=overall_score,grade,suggestions); profile=1 and '
+                              'profile_top=N with an X-Admin-Token header',
                 'supported_formats': ['PDF', 'DOCX', 'TXT']
             },
             'analyze_with_job': {
                 'method': 'POST',
                 'url': '/analyze_with_job',
                 'description': 'Analyze CV against specific job description',
-                'parameters': 'file (form-data), job_description (text)'
+                'parameters': 'file (form-data), job_description (text) or job_profile_id, '
+                              'weighting (bm25, optional)'
+            },
+            'job_profiles': {
+                'method': 'GET, POST',
+                'url': '/job_profiles',
+                'description': 'List job profiles, or register a job description compiled once for matching',
+                'parameters': 'job_description (text), title (optional)'
+            },
+            'job_profile': {
+                'method': 'GET, DELETE',
+                'url': '/job_profiles/<profile_id>',
+                'description': 'Get or delete a registered job profile'
+            },
+            'analyze_batch': {
+                'method': 'POST',
+                'url': '/analyze_batch',
+                'description': 'Analyze many CVs in one request, results keyed by filename',
+                'parameters': 'files (form-data, repeated)'
+            },
+            'rank': {
+                'method': 'POST',
+                'url': '/rank',
+                'description': 'Rank many CVs against one job description, best match first',
+                'parameters': 'files (form-data, repeated), job_description (text) or job_profile_id, '
+                              'sort_by (overall, skills or bm25, optional), weighting (bm25, optional)'
+            },
+            'search': {
+                'method': 'GET',
+                'url': '/search',
+                'description': 'Search stored candidates (requires CANDIDATE_STORE=1)',
+                'parameters': 'q (e.g. python AND (aws OR azure) NOT industry:finance), '
+                              'min_years, max_years, min_score, limit, offset'
+            },
+            'jobs': {
+                'method': 'POST',
+                'url': '/jobs',
+                'description': 'Queue a CV for analysis and return a job id immediately',
+                'parameters': 'file (form-data)'
+            },
+            'job_status': {
+                'method': 'GET',
+                'url': '/jobs/<job_id>',
+                'description': 'Get the status of a queued analysis and its result once completed'
+            },
+            'metrics': {
+                'method': 'GET',
+                'url': '/metrics',
+                'description': 'Prometheus metrics: request counts, upload sizes, extraction and stage latency'
             },
             'health': {
                 'method': 'GET', 
@@ -1418,10 +2286,44 @@ def index():
                 'method': 'GET',
                 'url': '/industries',
                 'description': 'Get supported industries and their requirements'
+            },
+            'taxonomy': {
+                'method': 'GET',
+                'url': '/taxonomy',
+                'description': 'Skill taxonomy in service and its version'
+            },
+            'replace_taxonomy': {
+                'method': 'PUT',
+                'url': '/taxonomy',
+                'parameters': 'taxonomy JSON body (same shape as GET /taxonomy), X-Admin-Token header',
+                'description': 'Validate, save and hot-swap the skill taxonomy (admin only)'
+            },
+            'reload_taxonomy': {
+                'method': 'POST',
+                'url': '/taxonomy/reload',
+                'parameters': 'X-Admin-Token header',
+                'description': 'Reload the taxonomy file now instead of on its next change check (admin only)'
+            },
+            'feature_schema': {
+                'method': 'GET',
+                'url': '/features/schema',
+                'description': 'Names of the values in the features vector of analysis results'
             }
         }
     })
 
+def is_admin_request():
+    """Whether the request carries the configured ADMIN_TOKEN"""
+    token = app.config['ADMIN_TOKEN']
+    supplied = request.headers.get('X-Admin-Token', '')
+    return bool(token) and hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+def field_list(value):
+    """Split a comma-separated query parameter; None when it was not given"""
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
 @app.route('/analyze', methods=['POST'])
 def analyze_cv():
     if 'file' not in request.files:
@@ -1431,24 +2333,51 @@ def analyze_cv():
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
+    # Optional comma-separated result fields to compute (include) or leave out (exclude)
+    include = field_list(request.args.get('include'))
+    exclude = field_list(request.args.get('exclude'))
+    selective = include is not None or exclude is not None
+    try:
+        fields, _ = analyzer.resolve_analysis(include, exclude)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # ?profile=1 (admin only) adds a per-stage _profile block, cProfile top-N with profile_top=N
+    profiler = None
+    if request.args.get('profile') in ('1', 'true'):
+        if not is_admin_request():
+            return jsonify({'error': 'Profiling requires a valid X-Admin-Token header'}), 403
+        profiler = AnalysisProfiler(top_functions=max(0, min(request.args.get('profile_top', 0, type=int), 100)))
+    
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        # The upload is analyzed in memory and never written to disk
+        file_data = file.read()
+        file_hash = content_hash(file_data)
+        if selective:
+            cache_key = result_cache_key('analyze-fields', file_hash, file_format(file.filename),
+                                         content_hash(','.join(sorted(fields))), str(include is not None))
+        else:
+            cache_key = result_cache_key('analyze', file_hash, file_format(file.filename))
+        
+        # Profiled requests always run the analysis
+        cached = result_cache.get(cache_key) if profiler is None else None
+        if cached is not None:
+            return jsonify(cached)
         
         try:
             # Analyze the CV
-            results = analyzer.analyze_cv(file_path)
+            results = analyzer.analyze_cv(file_data, file.filename, include=include, exclude=exclude,
+                                          profiler=profiler)
             
-            # Clean up the uploaded file
-            os.remove(file_path)
+            if 'error' not in results:
+                if profiler is None:
+                    result_cache.set(cache_key, results)
+                if not selective:
+                    remember_candidate(file_hash, file.filename, results)
             
             return jsonify(results)
             
         except Exception as e:
-            # Clean up the uploaded file in case of error
-            if os.path.exists(file_path):
-                os.remove(file_path)
             return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
     
     return jsonify({'error': 'Invalid file type. Please upload PDF, DOCX, or TXT files.'}), 400
@@ -1461,41 +2390,343 @@ def analyze_cv_with_job():
     
     file = request.files['file']
     job_description = request.form.get('job_description', '')
+    job_profile_id = request.form.get('job_profile_id', '')
+    weighting = request.form.get('weighting') or None
     
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
-    if not job_description.strip():
-        return jsonify({'error': 'Job description is required'}), 400
+    if weighting not in (None, 'bm25'):
+        return jsonify({'error': "weighting must be 'bm25' or omitted"}), 400
+    
+    profile = None
+    if job_profile_id:
+        profile = load_job_profile(job_profile_id)
+        if profile is None:
+            return jsonify({'error': 'Job profile not found'}), 404
+        job_description = profile['job_description']
+    elif not job_description.strip():
+        return jsonify({'error': 'Job description or job_profile_id is required'}), 400
     
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        # The upload is analyzed in memory and never written to disk
+        file_data = file.read()
+        cv_hash = content_hash(file_data)
+        analysis_key = result_cache_key('analyze', cv_hash, file_format(file.filename))
+        # Weighted matches drift slightly as corpus statistics grow; the cache TTL bounds that
+        job_match_kind = f'job_match-{weighting}' if weighting else 'job_match'
+        job_match_key = result_cache_key(job_match_kind, cv_hash, file_format(file.filename),
+                                         content_hash(job_description))
+        
+        results = result_cache.get(analysis_key)
+        job_match_analysis = result_cache.get(job_match_key)
+        if results is not None and job_match_analysis is not None:
+            return jsonify({**results, 'job_match_analysis': job_match_analysis})
         
         try:
             # Get basic CV analysis
-            results = analyzer.analyze_cv(file_path)
+            if results is None:
+                results = analyzer.analyze_cv(file_data, file.filename)
+                if 'error' not in results:
+                    result_cache.set(analysis_key, results)
+                    remember_candidate(cv_hash, file.filename, results)
             
             if 'error' not in results:
                 # Add job matching analysis
-                cv_text = analyzer.extract_text(file_path)
-                job_match_analysis = analyzer.analyze_job_match(cv_text, job_description)
-                results['job_match_analysis'] = job_match_analysis
-            
-            # Clean up the uploaded file
-            os.remove(file_path)
+                if job_match_analysis is None:
+                    cv_text = analyzer.extract_text(file_data, file.filename)
+                    job_match_analysis = analyzer.analyze_job_match(
+                        cv_text, job_description, profile=profile,
+                        cv_skills=results['detailed_analysis']['skills_breakdown'],
+                        weighting=weighting
+                    )
+                    result_cache.set(job_match_key, job_match_analysis)
+                results = {**results, 'job_match_analysis': job_match_analysis}
             
             return jsonify(results)
             
         except Exception as e:
-            # Clean up the uploaded file in case of error
-            if os.path.exists(file_path):
-                os.remove(file_path)
             return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
     
     return jsonify({'error': 'Invalid file type. Please upload PDF, DOCX, or TXT files.'}), 400
 
+@app.route('/analyze_batch', methods=['POST'])
+def analyze_batch():
+    """Analyze many CVs in parallel; a failing file does not fail the batch"""
+    files = [file for file in request.files.getlist('files') if file.filename]
+    if not files:
+        return jsonify({'error': 'No files provided'}), 400
+    
+    results = {}
+    pending = {}
+    cache_keys = {}
+    uploads = {}
+    for file in files:
+        # Keep every file even if several share a name
+        name = file.filename
+        suffix = 2
+        while name in results or name in pending:
+            name = f'{file.filename} ({suffix})'
+            suffix += 1
+        
+        if not allowed_file(file.filename):
+            results[name] = {'error': 'Invalid file type. Please upload PDF, DOCX, or TXT files.'}
+            continue
+        
+        file_data = file.read()
+        if len(file_data) > app.config['MAX_CONTENT_LENGTH']:
+            results[name] = {'error': 'File exceeds the maximum upload size'}
+            continue
+        
+        uploads[name] = (content_hash(file_data), file.filename)
+        cache_keys[name] = result_cache_key('analyze', uploads[name][0], file_format(file.filename))
+        cached = result_cache.get(cache_keys[name])
+        if cached is not None:
+            results[name] = cached
+            continue
+        
+        pool = get_batch_pool()
+        try:
+            pending[name] = pool.submit(analyze_batch_file, file_data, file.filename)
+        except BrokenProcessPool:
+            discard_batch_pool(pool)
+            pool = get_batch_pool()
+            pending[name] = pool.submit(analyze_batch_file, file_data, file.filename)
+    
+    # Extraction in the batch workers has its own timeout; this bounds the whole wait
+    rounds = -(-len(pending) // app.config['BATCH_WORKERS'])
+    deadline = time.monotonic() + app.config['BATCH_FILE_TIMEOUT'] * rounds
+    for name, future in pending.items():
+        try:
+            result = future.result(timeout=max(0, deadline - time.monotonic()))
+        except FuturesTimeoutError:
+            future.cancel()
+            result = {'error': 'Analysis timed out. The file may be malformed or too large to analyze.'}
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next batch
+            discard_batch_pool(pool)
+            result = {'error': 'Analysis failed: worker process terminated unexpectedly'}
+        except Exception as e:
+            result = {'error': f'Analysis failed: {str(e)}'}
+        
+        if 'error' not in result:
+            result_cache.set(cache_keys[name], result)
+            remember_candidate(*uploads[name], result)
+        results[name] = result
+    
+    failed = sum(1 for result in results.values() if 'error' in result)
+    return jsonify({
+        'results': results,
+        'total_files': len(results),
+        'successful': len(results) - failed,
+        'failed': failed
+    })
+
+def extract_cv_text(file_data, filename):
+    """Extract the text of an uploaded CV for matching; returns (text, error)"""
+    try:
+        text = analyzer.extract_text(file_data, filename)
+    except ExtractionTimeout as e:
+        return None, f"{str(e)}. The file may be malformed or too large to analyze."
+    except Exception as e:
+        return None, f'Analysis failed: {str(e)}'
+    if not text or "Error reading" in text or "Unsupported file format" in text:
+        return None, "Could not extract text from file. Please ensure it's a valid PDF, DOCX, or TXT file."
+    if len(text.strip()) < 50:
+        return None, "File appears to be empty or contains too little text to analyze."
+    return text, None
+
+@app.route('/rank', methods=['POST'])
+def rank_cvs():
+    """Rank many CVs against one job description in a single matching pass"""
+    job_description = request.form.get('job_description', '')
+    job_profile_id = request.form.get('job_profile_id', '')
+    sort_by = request.form.get('sort_by', 'overall')
+    weighting = request.form.get('weighting') or None
+    
+    profile = None
+    if job_profile_id:
+        profile = load_job_profile(job_profile_id)
+        if profile is None:
+            return jsonify({'error': 'Job profile not found'}), 404
+    elif not job_description.strip():
+        return jsonify({'error': 'Job description or job_profile_id is required'}), 400
+    
+    if weighting not in (None, 'bm25'):
+        return jsonify({'error': "weighting must be 'bm25' or omitted"}), 400
+    
+    if sort_by == 'bm25':
+        weighting = 'bm25'
+    elif sort_by not in ('overall', 'skills'):
+        return jsonify({'error': "sort_by must be 'overall', 'skills' or 'bm25'"}), 400
+    
+    files = [file for file in request.files.getlist('files') if file.filename]
+    if not files:
+        return jsonify({'error': 'No files provided'}), 400
+    
+    errors = {}
+    uploads = {}
+    for file in files:
+        # Keep every file even if several share a name
+        name = file.filename
+        suffix = 2
+        while name in errors or name in uploads:
+            name = f'{file.filename} ({suffix})'
+            suffix += 1
+        
+        if not allowed_file(file.filename):
+            errors[name] = 'Invalid file type. Please upload PDF, DOCX, or TXT files.'
+            continue
+        
+        file_data = file.read()
+        if len(file_data) > app.config['MAX_CONTENT_LENGTH']:
+            errors[name] = 'File exceeds the maximum upload size'
+            continue
+        uploads[name] = (file_data, file.filename)
+    
+    # Threads keep every extraction worker process busy
+    with ThreadPoolExecutor(max_workers=max(app.config['EXTRACTION_WORKERS'], 1)) as executor:
+        extracted = dict(zip(uploads, executor.map(lambda upload: extract_cv_text(*upload), uploads.values())))
+    
+    cv_texts = {}
+    for name, (text, error) in extracted.items():
+        if error is None:
+            cv_texts[name] = text
+        else:
+            errors[name] = error
+    
+    try:
+        matches = analyzer.rank_job_matches(list(cv_texts.values()), job_description, profile=profile,
+                                            weighting=weighting)
+    except Exception as e:
+        return jsonify({'error': f'Ranking failed: {str(e)}'}), 500
+    
+    # Best match first, ties broken by the other percentage
+    if sort_by == 'bm25':
+        sort_key = lambda entry: (entry['weighted_match']['bm25_score'], entry['skill_match_percentage'])
+    elif sort_by == 'skills':
+        sort_key = lambda entry: (entry['skill_match_percentage'], entry['overall_match_percentage'])
+    else:
+        sort_key = lambda entry: (entry['overall_match_percentage'], entry['skill_match_percentage'])
+    rankings = sorted(
+        ({'filename': name, **match} for name, match in zip(cv_texts, matches)),
+        key=sort_key,
+        reverse=True
+    )
+    for rank, entry in enumerate(rankings, 1):
+        entry['rank'] = rank
+    
+    return jsonify({
+        'rankings': rankings,
+        'errors': errors,
+        'total_files': len(rankings) + len(errors),
+        'ranked': len(rankings),
+        'failed': len(errors)
+    })
+
+@app.route('/search', methods=['GET'])
+def search_candidates():
+    """Boolean and filtered search over stored candidates"""
+    if candidate_store is None:
+        return jsonify({'error': 'Candidate store is disabled. Set CANDIDATE_STORE=1 to enable it.'}), 404
+    
+    try:
+        min_years = request.args.get('min_years', type=float)
+        max_years = request.args.get('max_years', type=float)
+        min_score = request.args.get('min_score', type=float)
+        limit = max(1, min(request.args.get('limit', 50, type=int), 1000))
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        total, candidates = candidate_store.search(
+            request.args.get('q', ''), min_years=min_years, max_years=max_years,
+            min_score=min_score, limit=limit, offset=offset
+        )
+    except QueryError as e:
+        return jsonify({'error': f'Invalid query: {str(e)}'}), 400
+    
+    return jsonify({
+        'query': request.args.get('q', ''),
+        'total': total,
+        'candidates': candidates,
+        'limit': limit,
+        'offset': offset
+    })
+
+@app.route('/candidates/<int:candidate_id>', methods=['GET'])
+def get_candidate(candidate_id):
+    """Get a stored candidate"""
+    candidate = candidate_store.get(candidate_id) if candidate_store is not None else None
+    if candidate is None:
+        return jsonify({'error': 'Candidate not found'}), 404
+    return jsonify(candidate)
+
+@app.route('/candidates/<int:candidate_id>', methods=['DELETE'])
+def delete_candidate(candidate_id):
+    """Remove a candidate from the store"""
+    if candidate_store is None or not candidate_store.delete(candidate_id):
+        return jsonify({'error': 'Candidate not found'}), 404
+    return jsonify({'deleted': candidate_id})
+
+@app.route('/job_profiles', methods=['POST'])
+def create_job_profile():
+    """Compile a job description once and store it for repeated matching"""
+    data = request.get_json(silent=True) or request.form
+    job_description = data.get('job_description', '')
+    if not job_description.strip():
+        return jsonify({'error': 'Job description is required'}), 400
+    
+    title = data.get('title', '').strip() or job_description.strip().split('\n')[0][:100]
+    profile_id = job_profiles.create(title, job_description, analyzer.compile_job_profile(job_description))
+    return jsonify(job_profile_summary(job_profiles.get(profile_id))), 201
+
+@app.route('/job_profiles', methods=['GET'])
+def list_job_profiles():
+    """List registered job profiles"""
+    return jsonify({'job_profiles': job_profiles.list()})
+
+@app.route('/job_profiles/<profile_id>', methods=['GET'])
+def get_job_profile(profile_id):
+    """Get a registered job profile"""
+    profile = load_job_profile(profile_id)
+    if profile is None:
+        return jsonify({'error': 'Job profile not found'}), 404
+    return jsonify({**job_profile_summary(profile), 'job_description': profile['job_description']})
+
+@app.route('/job_profiles/<profile_id>', methods=['DELETE'])
+def delete_job_profile(profile_id):
+    """Delete a registered job profile"""
+    if not job_profiles.delete(profile_id):
+        return jsonify({'error': 'Job profile not found'}), 404
+    return jsonify({'deleted': profile_id})
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a CV for background analysis"""
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file provided'}), 400
+    
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+    
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file type. Please upload PDF, DOCX, or TXT files.'}), 400
+    
+    job_id = job_queue.submit(file.filename, file.read())
+    job_workers.notify()
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f'/jobs/{job_id}'
+    }), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status of a queued analysis, with its result once completed"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
 @app.route('/industries', methods=['GET'])
 def get_industries():
     """Get supported industries and their requirements"""
@@ -1505,6 +2736,46 @@ def get_industries():
         'skill_categories': list(analyzer.skill_keywords.keys())
     })
 
+@app.route('/taxonomy', methods=['GET'])
+def get_taxonomy():
+    """Get the skill taxonomy in service"""
+    taxonomy = analyzer.taxonomy
+    return jsonify({'taxonomy_version': taxonomy.version, 'taxonomy': taxonomy.to_dict()})
+
+@app.route('/taxonomy', methods=['PUT'])
+def replace_taxonomy():
+    """Save a new taxonomy file and swap it in; other workers pick it up on their next change check"""
+    if not is_admin_request():
+        return jsonify({'error': 'Replacing the taxonomy requires a valid X-Admin-Token header'}), 403
+    
+    previous_version = taxonomy_source.taxonomy.version
+    try:
+        taxonomy = taxonomy_source.replace(request.get_json(silent=True))
+    except TaxonomyError as e:
+        return jsonify({'error': str(e)}), 400
+    except OSError as e:
+        return jsonify({'error': f'Could not save taxonomy: {str(e)}'}), 500
+    return jsonify({'taxonomy_version': taxonomy.version, 'previous_version': previous_version})
+
+@app.route('/taxonomy/reload', methods=['POST'])
+def reload_taxonomy():
+    """Re-read the taxonomy file now"""
+    if not is_admin_request():
+        return jsonify({'error': 'Reloading the taxonomy requires a valid X-Admin-Token header'}), 403
+    
+    previous_version = taxonomy_source.taxonomy.version
+    try:
+        taxonomy = taxonomy_source.reload()
+    except TaxonomyError as e:
+        return jsonify({'error': str(e), 'taxonomy_version': previous_version}), 400
+    return jsonify({'taxonomy_version': taxonomy.version, 'previous_version': previous_version})
+
+@app.route('/features/schema', methods=['GET'])
+def get_feature_schema():
+    """Names of the values in the ``features`` vector of analysis results"""
+    schema = analyzer.feature_schema
+    return jsonify({'schema': schema['id'], 'names': schema['names'], 'taxonomy_version': analyzer.taxonomy_version})
+
 @app.route('/health')
 def health_check():
     return jsonify({
@@ -1516,9 +2787,115 @@ def health_check():
             'Automatic CV type detection',
             'Advanced content analysis',
             'Industry-specific feedback'
-        ]
+        ],
+        'result_cache': result_cache.stats(),
+        'word_feature_cache': analyzer.word_feature_cache.stats(),
+        'extraction_pool': extraction_pool.stats() if extraction_pool else None,
+        'jobs': job_queue.stats(),
+        'candidate_store': candidate_store.stats() if candidate_store else None,
+        'corpus_stats': corpus_stats.stats(),
+        'taxonomy': taxonomy_source.stats(),
+        'startup': startup_report()
     })
 
+@app.route('/metrics')
+def prometheus_metrics():
+    body, content_type = metrics.render()
+    return app.response_class(body, content_type=content_type)
+
+@app.cli.command('purge-text-store')
+def purge_text_store():
+    """Delete all stored extracted text"""
+    removed = text_store.purge()
+    print(f"Removed {removed} stored extraction(s) from {app.config['TEXT_STORE_PATH']}")
+
+@app.cli.command('export-features')
+@click.argument('output')
+@click.option('--schema', default=None, help='Feature schema id to export; by default that of the current taxonomy.')
+@click.option('--compress', is_flag=True, help='Deflate the columns of an .npz file.')
+@click.option('--batch-size', default=5000, help='Candidates read and written at a time.')
+def export_features(output, schema, compress, batch_size):
+    """Write the feature vectors of stored candidates to OUTPUT (.csv, or columnar .npz)"""
+    import numpy as np
+    from dataset_export import write_csv, write_npz
+    if not output.endswith(('.csv', '.npz')):
+        print('OUTPUT must be a .csv or .npz file')
+        sys.exit(1)
+    store = candidate_store
+    if store is None:
+        if not os.path.exists(app.config['CANDIDATE_STORE_PATH']):
+            print(f"No candidate store at {app.config['CANDIDATE_STORE_PATH']}")
+            sys.exit(1)
+        store = CandidateStore(app.config['CANDIDATE_STORE_PATH'])
+    
+    schemas = store.feature_schemas()
+    schema = schema or analyzer.feature_schema['id']
+    if schema not in schemas:
+        stored = ', '.join(f"{stored_id} ({info['candidates']} candidates)" for stored_id, info in schemas.items())
+        print(f"No stored candidates have feature schema {schema}; stored schemas: {stored or 'none'}")
+        sys.exit(1)
+    names = schemas[schema]['names']
+    
+    def batches():
+        for rows in store.iter_features(schema, batch_size):
+            values = np.frombuffer(b''.join(features for _, features in rows), dtype=np.float64)
+            values = values.reshape(len(rows), len(names))
+            batch = {'candidate_id': np.array([candidate_id for candidate_id, _ in rows], dtype=np.int64)}
+            batch.update((name, values[:, position]) for position, name in enumerate(names))
+            yield batch
+    
+    columns = ['candidate_id'] + names
+    if output.endswith('.npz'):
+        exported = write_npz(output, columns, batches(), compress=compress)
+    else:
+        exported = write_csv(output, columns, batches())
+    print(f"Exported {exported} candidate(s) x {len(columns)} columns with feature schema {schema} to {output}")
+    others = store.stats()['candidates'] - schemas[schema]['candidates']
+    if others:
+        print(f"{others} other candidate(s) have no features in this schema; re-analyze them to include them")
+
+def startup_report():
+    """How long loading this module took, by phase, and which extractor backends are imported"""
+    return {
+        'phases_seconds': startup_timings,
+        'total_seconds': startup_total,
+        'extractor_backends_loaded': sorted(_extractor_modules),
+        'extractor_import_seconds': extractor_import_timings
+    }
+
+@app.cli.command('startup-report')
+@click.option('--runs', default=5, help='Fresh interpreters to load the app in; the median is reported.')
+@click.option('--budget-ms', type=float, default=None, help='Exit with status 1 if the median load time is higher.')
+def print_startup_report(runs, budget_ms):
+    """Time loading app.py and building the analyzer in fresh interpreters"""
+    import json
+    import statistics
+    import subprocess
+    # The CLI has already imported Flask and this module, so measure in new processes
+    code = 'import json, app; print(json.dumps(app.startup_report()))'
+    reports = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        reports.append(json.loads(output.strip().splitlines()[-1]))
+    
+    for phase in reports[0]['phases_seconds']:
+        seconds = statistics.median(report['phases_seconds'].get(phase, 0) for report in reports)
+        print(f"{phase:<14}{seconds * 1000:>9.1f} ms")
+    total = statistics.median(report['total_seconds'] for report in reports)
+    print(f"{'total':<14}{total * 1000:>9.1f} ms  (median of {runs} run(s))")
+    print(f"extractor backends loaded at startup: {', '.join(reports[0]['extractor_backends_loaded']) or 'none'}")
+    if budget_ms is not None and total * 1000 > budget_ms:
+        print(f"Startup takes longer than the {budget_ms:g} ms budget")
+        sys.exit(1)
+
+startup_phase('routes')
+if app.config['PREWARM_EXTRACTORS']:
+    prewarm_extractors()
+    analyzer.scoring_engine
+    startup_phase('prewarm')
+startup_total = round(time.perf_counter() - _module_started, 4)
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,221 @@
+"""Generate a reproducible corpus of synthetic CVs in TXT, DOCX and PDF.
+
+Every CV belongs to one of the industries in ``industry_keywords`` and is
+built from contact details, a summary, dated experience entries, education,
+skills drawn from that industry's skill categories, certifications and
+languages. Documents grow by adding experience entries until they reach the
+requested size, from one page up to 16 MB. The same seed always produces
+the same files.
+
+Usage: python benchmarks/corpus.py [--out DIR] [--seed N] [--sizes 1p,3p,1mb] [--formats txt,docx,pdf]
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep the app's local stores out of the working directory
+os.environ.setdefault('DATA_FOLDER', os.path.join(tempfile.gettempdir(), 'cv-benchmarks'))
+
+import docx  # noqa: E402
+from docx.oxml import OxmlElement  # noqa: E402
+from docx.oxml.ns import qn  # noqa: E402
+
+from app import EnhancedCVAnalyzer  # noqa: E402
+
+BYTES_PER_PAGE = 3000
+SIZES = {
+    '1p': BYTES_PER_PAGE,
+    '3p': 3 * BYTES_PER_PAGE,
+    '10p': 10 * BYTES_PER_PAGE,
+    '1mb': 1024 * 1024,
+    '16mb': 16 * 1024 * 1024,
+}
+DEFAULT_SIZES = ['1p', '3p', '10p', '1mb', '16mb']
+FORMATS = ['txt', 'docx', 'pdf']
+
+FIRST_NAMES = ['Alex', 'Maria', 'Samuel', 'Priya', 'Jordan', 'Chen', 'Fatima', 'Lucas', 'Amara', 'Noah']
+LAST_NAMES = ['Johnson', 'Garcia', 'Okafor', 'Patel', 'Schmidt', 'Nguyen', 'Rossi', 'Kowalski', 'Haddad', 'Silva']
+CITIES = ['Boston, MA', 'Austin, TX', 'Seattle, WA', 'Chicago, IL', 'Denver, CO', 'London, UK']
+COMPANIES = ['Northwind', 'Contoso', 'Globex', 'Initech', 'Umbrella Group', 'Stark Industries', 'Wayne Enterprises']
+UNIVERSITIES = ['State University', 'Institute of Technology', 'City College', 'National University']
+DEGREES = ['Bachelor of Science', 'Master of Science', 'MBA', 'PhD', 'Bachelor of Arts', 'Associate Degree']
+ACTION_VERBS = ['Led', 'Managed', 'Developed', 'Implemented', 'Designed', 'Improved', 'Delivered',
+                'Coordinated', 'Reduced', 'Increased', 'Launched', 'Streamlined']
+OUTCOMES = ['reducing costs by {n}%', 'increasing revenue by {n}%', 'serving {n}00 clients',
+            'cutting turnaround time by {n}%', 'across {n} teams', 'improving satisfaction scores by {n}%']
+CERTIFICATIONS = ['PMP', 'CPA', 'CFA', 'AWS Certified Solutions Architect', 'Certified Nurse Educator',
+                  'SHRM-CP', 'Six Sigma Green Belt', 'Google Analytics certification', 'CISSP']
+
+# Skill categories drawn on for each industry, besides general soft skills
+INDUSTRY_SKILLS = {
+    'technology': ['programming', 'web_development', 'data_science', 'databases', 'cloud', 'mobile', 'cybersecurity'],
+    'healthcare': ['medical_skills', 'healthcare_tech', 'nursing', 'pharmacy'],
+    'finance': ['finance', 'accounting', 'fintech'],
+    'marketing': ['digital_marketing', 'traditional_marketing', 'sales'],
+    'education': ['teaching', 'educational_tech'],
+    'engineering': ['mechanical_engineering', 'electrical_engineering', 'civil_engineering', 'manufacturing'],
+    'legal': ['legal', 'regulatory'],
+    'creative': ['graphic_design', 'web_design', 'multimedia'],
+    'hr': ['hr', 'hr_tech'],
+    'operations': ['operations', 'supply_chain'],
+}
+GENERAL_SKILLS = ['communication', 'leadership', 'project_management', 'analytical', 'interpersonal']
+
+
+def experience_entry(rng, industry_terms, skills, year):
+    company = rng.choice(COMPANIES)
+    title = f'{rng.choice(["Senior", "Lead", "Principal", "Junior", ""])} {rng.choice(industry_terms).title()} Specialist'.strip()
+    lines = [f'{title}, {company} ({year} - {year + rng.randint(1, 4)})']
+    for _ in range(rng.randint(3, 6)):
+        outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 60))
+        lines.append(f'- {rng.choice(ACTION_VERBS)} {rng.choice(industry_terms)} initiatives using '
+                     f'{rng.choice(skills)} and {rng.choice(skills)}, {outcome}.')
+    return '\n'.join(lines)
+
+
+def generate_cv(analyzer, industry, target_bytes, rng):
+    """Text of a synthetic CV for ``industry``, about ``target_bytes`` long"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    industry_terms = sorted(set(analyzer.industry_keywords[industry]))
+    skills = [skill for category in INDUSTRY_SKILLS[industry] for skill in analyzer.skill_keywords[category]]
+    soft_skills = [skill for category in GENERAL_SKILLS for skill in analyzer.skill_keywords[category]]
+
+    header = '\n'.join([
+        f'{first} {last}',
+        f'{first.lower()}.{last.lower()}@example.com | +1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}',
+        f'{rng.choice(CITIES)} | linkedin.com/in/{first.lower()}{last.lower()}',
+        '',
+        'PROFESSIONAL SUMMARY',
+        f'{industry.title()} professional with {rng.randint(2, 20)}+ years of experience in '
+        f'{", ".join(rng.sample(industry_terms, min(3, len(industry_terms))))}. '
+        f'Skilled in {", ".join(rng.sample(skills, min(4, len(skills))))}.',
+        '',
+        'PROFESSIONAL EXPERIENCE',
+    ])
+    footer = '\n'.join([
+        '',
+        'EDUCATION',
+        f'{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)} ({rng.randint(1995, 2018)})',
+        '',
+        'SKILLS',
+        ', '.join(rng.sample(skills, min(12, len(skills))) + rng.sample(soft_skills, 4)),
+        '',
+        'CERTIFICATIONS',
+        '\n'.join(rng.sample(CERTIFICATIONS, 2)),
+        '',
+        'LANGUAGES',
+        'English, Spanish',
+    ])
+
+    entries = []
+    size = len(header) + len(footer)
+    year = 2023
+    while size < target_bytes or not entries:
+        entry = experience_entry(rng, industry_terms, skills, year)
+        entries.append(entry)
+        size += len(entry) + 2
+        year = year - 1 if year > 1980 else 2023
+    return '\n'.join([header, '\n\n'.join(entries), footer])
+
+
+def to_docx(text):
+    document = docx.Document()
+    # Paragraphs are appended directly: add_paragraph searches the body on every call
+    section_properties = document.element.body[-1]
+    for line in text.split('\n'):
+        paragraph, run, run_text = OxmlElement('w:p'), OxmlElement('w:r'), OxmlElement('w:t')
+        run_text.text = line
+        run_text.set(qn('xml:space'), 'preserve')
+        run.append(run_text)
+        paragraph.append(run)
+        section_properties.addprevious(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def to_pdf(text, lines_per_page=50):
+    """A minimal text-only PDF using the built-in Helvetica font"""
+    def escape(line):
+        line = line.encode('latin-1', 'replace').decode('latin-1')
+        return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    lines = text.split('\n')
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+    kids = ' '.join(f'{4 + 2 * index} 0 R' for index in range(len(pages)))
+    objects = [
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        f'<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>',
+        '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    for index, page in enumerate(pages):
+        content = 'BT /F1 9 Tf 40 800 Td 14 TL\n' + ''.join(f'({escape(line)}) Tj T*\n' for line in page) + 'ET'
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * index} 0 R >>')
+        objects.append(f'<< /Length {len(content.encode("latin-1"))} >>\nstream\n{content}\nendstream')
+
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1'))
+    xref = out.tell()
+    out.write(f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1'))
+    out.write(''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode('latin-1'))
+    out.write(f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1'))
+    return out.getvalue()
+
+
+def encode(text, file_format):
+    if file_format == 'txt':
+        return text.encode('utf-8')
+    if file_format == 'docx':
+        return to_docx(text)
+    return to_pdf(text)
+
+
+def iter_corpus(analyzer, seed=42, sizes=DEFAULT_SIZES, formats=FORMATS, industries=None):
+    """Yield (name, industry, size label, format, file bytes) for every CV in the corpus
+
+    Every (industry, size) pair gets its own seeded generator, so a subset of
+    the corpus is identical to the same documents in the full corpus.
+    """
+    for industry in industries or analyzer.industry_keywords:
+        for size in sizes:
+            rng = random.Random(f'{seed}-{industry}-{size}')
+            text = generate_cv(analyzer, industry, SIZES[size], rng)
+            for file_format in formats:
+                yield f'{industry}-{size}.{file_format}', industry, size, file_format, encode(text, file_format)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus'))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help=f'any of {", ".join(SIZES)}')
+    parser.add_argument('--formats', default=','.join(FORMATS))
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    manifest = []
+    analyzer = EnhancedCVAnalyzer()
+    for name, industry, size, file_format, data in iter_corpus(
+            analyzer, args.seed, args.sizes.split(','), args.formats.split(',')):
+        with open(os.path.join(args.out, name), 'wb') as file:
+            file.write(data)
+        manifest.append({'file': name, 'industry': industry, 'size': size, 'format': file_format,
+                         'bytes': len(data)})
+        print(f'{name:<28}{len(data):>12,} bytes')
+
+    with open(os.path.join(args.out, 'manifest.json'), 'w') as file:
+        json.dump({'seed': args.seed, 'files': manifest}, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
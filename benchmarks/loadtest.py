@@ -0,0 +1,297 @@
+"""Load test the API under gunicorn and report throughput and tail latency.
+
+Starts the app under gunicorn on a local port (or targets ``--url``), then
+replays a weighted mix of /analyze, /analyze_with_job and /industries
+requests built from the synthetic corpus in benchmarks/corpus.py. Each
+concurrency level runs for a fixed duration with that many closed-loop
+clients, each sending its next request as soon as the previous one answers.
+Throughput, error counts and p50/p95/p99 latency are reported per level and
+per endpoint. A level is flagged as saturated when throughput grows by less
+than 10% over the previous level while p95 latency keeps rising.
+
+The result cache and text store are disabled in the started server, so every
+request is analyzed from scratch; ``--warm-cache`` keeps them.
+
+Usage: python benchmarks/loadtest.py [--workers N] [--worker-class sync|gthread|gevent] [--threads N]
+                                     [--concurrency 1,2,4,8,16] [--duration SECONDS]
+                                     [--mix analyze=6,analyze_with_job=3,industries=1]
+                                     [--sizes 1p,3p] [--formats txt,docx,pdf] [--url URL] [--output FILE]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import FORMATS, iter_corpus  # noqa: E402
+
+from app import EnhancedCVAnalyzer  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MIX = 'analyze=6,analyze_with_job=3,industries=1'
+JOB_DESCRIPTIONS = [
+    'Senior software engineer: Python, AWS, Docker, Kubernetes, SQL, React. Agile teams, mentoring.',
+    'Registered nurse for a busy hospital ward. Patient care, EMR, medication administration, BLS.',
+    'Financial analyst with Excel, financial modeling, forecasting, budgeting and CPA or CFA.',
+    'Digital marketing manager: SEO, SEM, Google Analytics, content strategy, social media campaigns.',
+    'Paralegal supporting litigation: legal research, contract review, compliance and case management.',
+]
+CONTENT_TYPES = {
+    'txt': 'text/plain',
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+
+def multipart(fields, files):
+    """Encode form fields and (field, filename, bytes) files as multipart/form-data"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, filename, data in files:
+        content_type = CONTENT_TYPES.get(filename.rsplit('.', 1)[-1], 'application/octet-stream')
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: {content_type}\r\n\r\n'.encode() + data + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def build_requests(files):
+    """Prepared (endpoint, method, path, body, headers) requests for each endpoint of the mix"""
+    requests = {'analyze': [], 'analyze_with_job': [], 'industries': []}
+    for index, (name, _, _, _, data) in enumerate(files):
+        body, content_type = multipart({}, [('file', name, data)])
+        requests['analyze'].append(('analyze', 'POST', '/analyze', body, {'Content-Type': content_type}))
+        job_description = JOB_DESCRIPTIONS[index % len(JOB_DESCRIPTIONS)]
+        body, content_type = multipart({'job_description': job_description}, [('file', name, data)])
+        requests['analyze_with_job'].append(
+            ('analyze_with_job', 'POST', '/analyze_with_job', body, {'Content-Type': content_type}))
+    requests['industries'].append(('industries', 'GET', '/industries', None, {}))
+    return requests
+
+
+def parse_mix(mix):
+    weights = {}
+    for item in mix.split(','):
+        endpoint, _, weight = item.partition('=')
+        weights[endpoint.strip()] = float(weight or 1)
+    return weights
+
+
+def send(host, port, request, timeout):
+    """Send one request on a fresh connection; return (status or None, seconds)"""
+    _, method, path, body, headers = request
+    started = time.perf_counter()
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return response.status, time.perf_counter() - started
+    except (OSError, http.client.HTTPException):
+        return None, time.perf_counter() - started
+    finally:
+        connection.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, seconds):
+    latencies = sorted(latency for _, status, latency in samples if status is not None and status < 400)
+    errors = sum(1 for _, status, _ in samples if status is None or status >= 400)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'throughput': len(latencies) / seconds if seconds else 0,
+        'mean_ms': statistics.mean(latencies) * 1000 if latencies else None,
+        'p50_ms': percentile(latencies, 0.50) * 1000 if latencies else None,
+        'p95_ms': percentile(latencies, 0.95) * 1000 if latencies else None,
+        'p99_ms': percentile(latencies, 0.99) * 1000 if latencies else None,
+    }
+
+
+def run_level(host, port, requests, weights, concurrency, duration, seed, timeout):
+    """Run ``concurrency`` closed-loop clients for ``duration`` seconds"""
+    endpoints = [endpoint for endpoint in weights if weights[endpoint] > 0]
+    samples = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        rng = random.Random(f'{seed}-{concurrency}-{index}')
+        local = []
+        while time.perf_counter() < deadline:
+            endpoint = rng.choices(endpoints, [weights[name] for name in endpoints])[0]
+            status, latency = send(host, port, rng.choice(requests[endpoint]), timeout)
+            local.append((endpoint, status, latency))
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(index,), daemon=True) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Requests in flight at the deadline finish late, so use the real elapsed time
+    elapsed = time.perf_counter() - started
+
+    level = {'concurrency': concurrency, 'seconds': elapsed, **summarize(samples, elapsed), 'endpoints': {}}
+    for endpoint in endpoints:
+        level['endpoints'][endpoint] = summarize([sample for sample in samples if sample[0] == endpoint], elapsed)
+    return level
+
+
+def mark_saturation(levels):
+    for previous, level in zip(levels, levels[1:]):
+        level['saturated'] = bool(
+            previous['throughput'] and level['p95_ms'] and previous['p95_ms']
+            and level['throughput'] < previous['throughput'] * 1.1
+            and level['p95_ms'] > previous['p95_ms']
+        )
+    if levels:
+        levels[0]['saturated'] = False
+
+
+def wait_until_ready(host, port, server, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with code {server.returncode}')
+        status, _ = send(host, port, ('health', 'GET', '/health', None, {}), timeout=5)
+        if status == 200:
+            return
+        time.sleep(0.25)
+    raise RuntimeError(f'server on {host}:{port} did not become ready within {timeout}s')
+
+
+def start_server(args, data_folder):
+    env = dict(os.environ, DATA_FOLDER=data_folder)
+    if not args.warm_cache:
+        env.update(RESULT_CACHE_MAX_BYTES='0', TEXT_STORE_MAX_BYTES='0')
+    command = [
+        sys.executable, '-m', 'gunicorn', 'app:app',
+        '--bind', f'127.0.0.1:{args.port}',
+        '--workers', str(args.workers),
+        '--worker-class', args.worker_class,
+        '--threads', str(args.threads),
+        '--timeout', str(int(args.timeout)),
+        '--log-level', 'warning',
+    ]
+    return subprocess.Popen(command, cwd=ROOT, env=env)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--worker-class', default='sync', help='gunicorn worker class: sync, gthread, gevent, ...')
+    parser.add_argument('--threads', type=int, default=1, help='threads per worker (gthread)')
+    parser.add_argument('--concurrency', default='1,2,4,8,16')
+    parser.add_argument('--duration', type=float, default=20, help='seconds per concurrency level')
+    parser.add_argument('--mix', default=DEFAULT_MIX)
+    parser.add_argument('--sizes', default='1p,3p')
+    parser.add_argument('--formats', default=','.join(FORMATS))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--port', type=int, default=5077)
+    parser.add_argument('--timeout', type=float, default=60, help='per-request and gunicorn worker timeout')
+    parser.add_argument('--warm-cache', action='store_true', help='keep the result cache and text store enabled')
+    parser.add_argument('--url', default=None, help='test an already running server instead of starting one')
+    parser.add_argument('--output', default=None, help='JSON file (default: benchmarks/results/load-<timestamp>.json)')
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    files = list(iter_corpus(EnhancedCVAnalyzer(), args.seed, args.sizes.split(','), args.formats.split(',')))
+    requests = build_requests(files)
+    unknown = set(weights) - set(requests)
+    if unknown:
+        parser.error(f'unknown endpoints in --mix: {", ".join(sorted(unknown))}')
+
+    server = None
+    data_folder = None
+    if args.url:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        host, port = '127.0.0.1', args.port
+        data_folder = tempfile.mkdtemp(prefix='cv-loadtest-')
+        server = start_server(args, data_folder)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'target': args.url or f'gunicorn {args.worker_class} x{args.workers} ({args.threads} threads)',
+            'workers': args.workers,
+            'worker_class': args.worker_class,
+            'threads': args.threads,
+            'mix': weights,
+            'sizes': args.sizes.split(','),
+            'formats': args.formats.split(','),
+            'documents': len(files),
+            'duration': args.duration,
+            'warm_cache': args.warm_cache,
+            'cpus': os.cpu_count(),
+        },
+        'levels': [],
+    }
+    try:
+        wait_until_ready(host, port, server)
+        # One pass over the mix so imports and lazy initialization are not measured
+        for endpoint_requests in requests.values():
+            send(host, port, endpoint_requests[0], args.timeout)
+
+        print(f"{'clients':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        for concurrency in (int(level) for level in args.concurrency.split(',')):
+            level = run_level(host, port, requests, weights, concurrency, args.duration, args.seed, args.timeout)
+            report['levels'].append(level)
+            print(f"{concurrency:>8}{level['throughput']:>10.1f}{level['p50_ms'] or 0:>10.1f}"
+                  f"{level['p95_ms'] or 0:>10.1f}{level['p99_ms'] or 0:>10.1f}{level['errors']:>8}", flush=True)
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=args.timeout)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+        if data_folder:
+            shutil.rmtree(data_folder, ignore_errors=True)
+
+    mark_saturation(report['levels'])
+    saturated = [level['concurrency'] for level in report['levels'] if level['saturated']]
+    if saturated:
+        print(f'\nThroughput stops scaling at {saturated[0]} concurrent clients')
+
+    print(f"\n{'endpoint':<20}{'clients':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for level in report['levels']:
+        for endpoint, summary in level['endpoints'].items():
+            print(f"{endpoint:<20}{level['concurrency']:>8}{summary['throughput']:>10.1f}"
+                  f"{summary['p50_ms'] or 0:>10.1f}{summary['p95_ms'] or 0:>10.1f}{summary['p99_ms'] or 0:>10.1f}")
+
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results',
+                                         'load-' + datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f'\nResults written to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+"""Benchmark EnhancedCVAnalyzer: per-method microbenchmarks and end-to-end throughput.
+
+Documents come from the seeded generator in benchmarks/corpus.py, one per
+industry and size. Microbenchmarks time every AnalysisDocument view (each
+measured incrementally, after the views it builds on), every analyze_cv
+stage on a document whose views are already computed, the extractors, the
+job matching methods (rank_job_matches also against the per-CV loop it
+replaces) and ScoringEngine on the corpus rows tiled to 100k. End-to-end
+runs time analyze_cv on the uploaded bytes of every format, with the
+production extraction budgets but without the text store or extraction
+worker processes. Results are written as JSON; ``--compare`` prints the
+ratio against an earlier run.
+
+Usage: python benchmarks/run.py [--sizes 1p,3p,10p,1mb] [--formats txt,docx,pdf]
+                                [--repeat N] [--output FILE] [--compare FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+from corpus import FORMATS, iter_corpus  # noqa: E402
+
+from app import ANALYZER_VERSION, EnhancedCVAnalyzer, app  # noqa: E402
+
+DEFAULT_SIZES = ['1p', '3p', '10p', '1mb']
+DOCUMENT_VIEWS = ['lower', 'words', 'tokens', 'token_counts', 'token_set', 'lines', 'sentences',
+                  'term_counts', 'ats_signals', 'field_hits', 'word_counts', 'word_features']
+JOB_DESCRIPTION = ('We are hiring a senior engineer with Python, AWS, Docker, SQL and React experience. '
+                   'Strong communication and leadership skills, agile delivery, healthcare or finance '
+                   'domain knowledge is a plus.')
+SCORING_ROWS = 100000
+
+
+def timed(func, repeat):
+    """Run ``func`` ``repeat`` times and return the per-run durations"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def record(results, name, size, documents, durations):
+    results.append({
+        'name': name,
+        'size': size,
+        'documents': documents,
+        'best_seconds_per_document': min(durations) / documents,
+        'median_seconds_per_document': statistics.median(durations) / documents
+    })
+
+
+def microbenchmarks(analyzer, texts, size, repeat):
+    results = []
+    count = len(texts)
+
+    for view in DOCUMENT_VIEWS:
+        def compute_view():
+            for document in documents:
+                getattr(document, view)
+        durations = []
+        for _ in range(repeat):
+            documents = [analyzer.as_document(text) for text in texts]
+            for earlier in DOCUMENT_VIEWS[:DOCUMENT_VIEWS.index(view)]:
+                for document in documents:
+                    getattr(document, earlier)
+            durations.extend(timed(compute_view, 1))
+        record(results, f'document.{view}', size, count, durations)
+
+    # Every stage runs against warmed documents and the outputs of the stages before it
+    documents = [analyzer.as_document(text) for text in texts]
+    stage_values = []
+    for document in documents:
+        values = {}
+        for name, _, stage in analyzer.ANALYSIS_STAGES:
+            values[name] = stage(analyzer, document, values)
+        stage_values.append(values)
+    for name, _, stage in analyzer.ANALYSIS_STAGES:
+        def run_stage():
+            for document, values in zip(documents, stage_values):
+                stage(analyzer, document, values)
+        record(results, f'stage.{name}', size, count, timed(run_stage, repeat))
+
+    profile = analyzer.compile_job_profile(JOB_DESCRIPTION)
+    record(results, 'compile_job_profile', size, 1,
+           timed(lambda: analyzer.compile_job_profile(JOB_DESCRIPTION), repeat))
+    record(results, 'analyze_job_match', size, count,
+           timed(lambda: [analyzer.analyze_job_match(text, JOB_DESCRIPTION) for text in texts], repeat))
+    record(results, 'analyze_job_match.precompiled', size, count, timed(lambda: [
+        analyzer.analyze_job_match(document, profile=profile, cv_skills=values['skills'])
+        for document, values in zip(documents, stage_values)
+    ], repeat))
+    record(results, 'bm25_job_matches', size, count,
+           timed(lambda: analyzer.bm25_job_matches(documents, profile['job_tokens']), repeat))
+    # Ranking against the per-CV loop it replaces, on the same undigested texts
+    if analyzer.rank_job_matches(texts, profile=profile) != [
+            analyzer.analyze_job_match(text, profile=profile) for text in texts]:
+        raise AssertionError('rank_job_matches disagrees with analyze_job_match')
+    record(results, 'rank_job_matches', size, count,
+           timed(lambda: analyzer.rank_job_matches(texts, profile=profile), repeat))
+    record(results, 'rank_job_matches.loop', size, count,
+           timed(lambda: [analyzer.analyze_job_match(text, profile=profile) for text in texts], repeat))
+
+    engine = analyzer.scoring_engine
+    rows = np.vstack([analyzer.scoring_features(document, values)
+                      for document, values in zip(documents, stage_values)])
+    scores = engine.score(rows, feedback=True)
+    for row, values in enumerate(stage_values):
+        for name, stage in [('contact', 'contact_score'), ('skills', 'skills_score'),
+                            ('structure', 'structure_score'), ('sections', 'sections_score'),
+                            ('ats_compatibility', 'ats_score')]:
+            if (scores[name][row], scores['feedback'][name][row]) != values[stage]:
+                raise AssertionError(f'ScoringEngine disagrees with {stage} on document {row}')
+        if scores['overall'][row] != values['overall_score']:
+            raise AssertionError(f'ScoringEngine disagrees with overall_score on document {row}')
+    batch = np.resize(rows, (SCORING_ROWS, rows.shape[1]))
+    record(results, 'scoring_engine.score', size, SCORING_ROWS, timed(lambda: engine.score(batch), repeat))
+    record(results, 'scoring_engine.score.feedback', size, count,
+           timed(lambda: engine.score(rows, feedback=True), repeat))
+    return results
+
+
+def extraction_benchmarks(analyzer, files, size, repeat):
+    results = []
+    extractors = {
+        'txt': analyzer.extract_text_from_txt,
+        'docx': analyzer.extract_text_from_docx,
+        'pdf': analyzer.extract_text_from_pdf,
+    }
+    for file_format, extractor in extractors.items():
+        uploads = [data for _, _, _, fmt, data in files if fmt == file_format]
+        if uploads:
+            record(results, f'extract.{file_format}', size, len(uploads),
+                   timed(lambda: [extractor(data) for data in uploads], repeat))
+    return results
+
+
+def end_to_end(analyzer, files, size, repeat):
+    results = []
+    for file_format in FORMATS:
+        uploads = [(name, data) for name, _, _, fmt, data in files if fmt == file_format]
+        if not uploads:
+            continue
+        durations = timed(lambda: [analyzer.analyze_cv(data, name) for name, data in uploads], repeat)
+        total_bytes = sum(len(data) for _, data in uploads)
+        best = min(durations)
+        results.append({
+            'format': file_format,
+            'size': size,
+            'documents': len(uploads),
+            'bytes': total_bytes,
+            'best_seconds': best,
+            'median_seconds': statistics.median(durations),
+            'documents_per_second': len(uploads) / best,
+            'megabytes_per_second': total_bytes / best / (1024 * 1024)
+        })
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+
+    base_micro = {(entry['name'], entry['size']): entry for entry in baseline.get('microbenchmarks', [])}
+    print(f"\n{'benchmark':<44}{'size':>6}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for entry in current['microbenchmarks']:
+        base = base_micro.get((entry['name'], entry['size']))
+        if base:
+            before, after = base['best_seconds_per_document'], entry['best_seconds_per_document']
+            print(f"{entry['name']:<44}{entry['size']:>6}{before * 1000:>10.3f}ms{after * 1000:>10.3f}ms"
+                  f"{after / before if before else float('nan'):>7.2f}x")
+
+    base_e2e = {(entry['format'], entry['size']): entry for entry in baseline.get('end_to_end', [])}
+    for entry in current['end_to_end']:
+        base = base_e2e.get((entry['format'], entry['size']))
+        if base:
+            before, after = base['documents_per_second'], entry['documents_per_second']
+            print(f"{'analyze_cv.' + entry['format']:<44}{entry['size']:>6}{before:>9.1f}/s {after:>9.1f}/s "
+                  f"{after / before if before else float('nan'):>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help='any of 1p, 3p, 10p, 1mb, 16mb')
+    parser.add_argument('--formats', default=','.join(FORMATS))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help='JSON file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', default=None, help='earlier results JSON to compare against')
+    args = parser.parse_args()
+
+    analyzer = EnhancedCVAnalyzer(max_pages=app.config['EXTRACTION_MAX_PAGES'],
+                                  max_chars=app.config['EXTRACTION_MAX_CHARS'])
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'git_commit': git_commit(),
+            'analyzer_version': ANALYZER_VERSION,
+            'taxonomy_version': analyzer.taxonomy_version,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'microbenchmarks': [],
+        'end_to_end': [],
+    }
+
+    for size in args.sizes.split(','):
+        files = list(iter_corpus(analyzer, args.seed, [size], args.formats.split(',')))
+        texts = [analyzer.extract_text(data, name) for name, _, _, fmt, data in files if fmt == files[0][3]]
+        print(f'{size}: {len(files)} files', flush=True)
+        micro = microbenchmarks(analyzer, texts, size, args.repeat)
+        ranking = {entry['name']: entry['best_seconds_per_document'] for entry in micro}
+        print(f"  rank_job_matches {ranking['rank_job_matches'] * 1000:.3f} ms/doc, per-CV loop "
+              f"{ranking['rank_job_matches.loop'] * 1000:.3f} ms/doc "
+              f"({ranking['rank_job_matches.loop'] / ranking['rank_job_matches']:.1f}x)", flush=True)
+        report['microbenchmarks'].extend(micro)
+        report['microbenchmarks'].extend(extraction_benchmarks(analyzer, files, size, args.repeat))
+        report['end_to_end'].extend(end_to_end(analyzer, files, size, args.repeat))
+
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results',
+                                         datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    print(f"\n{'end to end':<20}{'size':>6}{'docs/s':>10}{'MB/s':>10}")
+    for entry in report['end_to_end']:
+        print(f"{'analyze_cv.' + entry['format']:<20}{entry['size']:>6}"
+              f"{entry['documents_per_second']:>10.1f}{entry['megabytes_per_second']:>10.2f}")
+    print(f'\nResults written to {output}')
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Compare the compiled taxonomy matcher against per-keyword substring scans.
+
+Runs the keyword stages of a request (industry detection, skill extraction,
+keyword density and job matching) the way they used to work - one ``in``
+scan per taxonomy term - and through ``KeywordMatcher``, on synthetic CVs of
+1-5 pages and on a 16 MB upload.
+
+Usage: python benchmarks/skill_matcher.py [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep the app's local stores out of the working directory
+os.environ.setdefault('DATA_FOLDER', os.path.join(tempfile.gettempdir(), 'cv-benchmarks'))
+
+from app import EnhancedCVAnalyzer  # noqa: E402
+
+WORDS_PER_PAGE = 500
+FILLER = ('managed delivered team results improved across the with for and our '
+          'customers stakeholders quarterly reporting initiatives responsible '
+          'including ensured daily weekly operations support').split()
+JOB_DESCRIPTION = ('We are hiring a Python developer with AWS, Docker, SQL and React '
+                   'experience. Agile scrum. Machine learning is a plus.')
+
+
+def legacy_keyword_stages(analyzer, text, job_description):
+    """Substring scans as performed before the matcher existed"""
+    text_lower = text.lower()
+    for keywords in analyzer.industry_keywords.values():
+        sum(1 for keyword in keywords if keyword in text_lower)
+    for skills in analyzer.skill_keywords.values():
+        for skill in skills:
+            skill.lower() in text_lower
+    for skills in analyzer.skill_keywords.values():
+        for skill in skills:
+            if len(skill.split()) > 1:
+                skill.lower() in text.lower()
+    for skills in analyzer.skill_keywords.values():
+        for skill in skills:
+            skill.lower() in job_description.lower()
+            skill.lower() in text_lower
+
+
+def matcher_keyword_stages(analyzer, text, job_description):
+    """The same lookups, each stage doing one matcher pass as the analyzer does"""
+    matcher = analyzer.term_matcher
+    text_lower = text.lower()
+    for _ in range(3):
+        found_terms = matcher.count(text_lower)
+        for skills in analyzer.skill_keywords.values():
+            for skill in skills:
+                skill in found_terms
+    job_terms = matcher.count(job_description.lower())
+    found_terms = matcher.count(text_lower)
+    for skills in analyzer.skill_keywords.values():
+        for skill in skills:
+            skill in job_terms
+            skill in found_terms
+
+
+def synthetic_cv(analyzer, n_words, skill_ratio, rng):
+    skills = [skill for skills in analyzer.skill_keywords.values() for skill in skills]
+    words = []
+    while len(words) < n_words:
+        if rng.random() < skill_ratio:
+            words.append(rng.choice(skills))
+        else:
+            words.append(rng.choice(FILLER))
+        if rng.random() < 0.08:
+            words.append('\n')
+    return ' '.join(words)
+
+
+def timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    analyzer = EnhancedCVAnalyzer()
+    rng = random.Random(1234)
+    cases = [(f'{pages} page(s)', synthetic_cv(analyzer, pages * WORDS_PER_PAGE, 0.05, rng), args.repeat)
+             for pages in range(1, 6)]
+    large = synthetic_cv(analyzer, 200000, 0.0, rng)
+    large = (large * (16 * 1024 * 1024 // len(large) + 1))[:16 * 1024 * 1024]
+    cases.append(('16 MB, no taxonomy terms', large, 1))
+
+    print(f"{'document':<26}{'legacy':>12}{'matcher':>12}{'speedup':>10}")
+    for label, text, repeat in cases:
+        legacy = timed(lambda: legacy_keyword_stages(analyzer, text, JOB_DESCRIPTION), repeat)
+        compiled = timed(lambda: matcher_keyword_stages(analyzer, text, JOB_DESCRIPTION), repeat)
+        print(f'{label:<26}{legacy * 1000:>10.2f}ms{compiled * 1000:>10.2f}ms{legacy / compiled:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+import json
+import os
+import re
+import sqlite3
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_hash TEXT NOT NULL UNIQUE,
+    filename TEXT NOT NULL,
+    overall_score REAL NOT NULL,
+    industry TEXT NOT NULL,
+    education_level TEXT NOT NULL,
+    experience_years REAL NOT NULL,
+    summary TEXT NOT NULL,
+    indexed_at REAL NOT NULL,
+    feature_schema TEXT,
+    features BLOB
+);
+CREATE INDEX IF NOT EXISTS candidates_score ON candidates (overall_score, experience_years);
+CREATE TABLE IF NOT EXISTS feature_schemas (
+    id TEXT PRIMARY KEY,
+    names TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    candidate_id INTEGER NOT NULL,
+    PRIMARY KEY (field, value, candidate_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_candidate ON postings (candidate_id);
+"""
+
+# Posting fields a query term can name as field:value; bare terms are skills
+FIELDS = {'skill', 'industry', 'education', 'experience', 'certification'}
+
+# (upper bound in years, bucket); the last bucket is open-ended
+EXPERIENCE_BUCKETS = [(1, '0-1'), (3, '1-3'), (5, '3-5'), (10, '5-10'), (None, '10+')]
+
+TOKEN_PATTERN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+
+
+class QueryError(ValueError):
+    """Raised for a search query that cannot be parsed"""
+
+
+def experience_bucket(years):
+    for upper, bucket in EXPERIENCE_BUCKETS:
+        if upper is None or years < upper:
+            return bucket
+
+
+def primary_industry(results):
+    """Industry of an analysis result; CVs without industry keywords have the plain string 'general'"""
+    cv_type = results['cv_type']
+    return cv_type['primary_industry'] if isinstance(cv_type, dict) else 'general'
+
+
+def candidate_postings(results):
+    """The (field, value) pairs an analysis result is indexed under"""
+    detailed = results['detailed_analysis']
+    postings = {('industry', primary_industry(results)),
+                ('education', detailed['education_level']),
+                ('experience', experience_bucket(detailed['experience_analysis']['estimated_years']))}
+    for skills in detailed['skills_breakdown'].values():
+        postings.update(('skill', skill.lower()) for skill in skills)
+    postings.update(('certification', cert.lower()) for cert in detailed['certifications_found'])
+    return postings
+
+
+def tokenize_query(query):
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = TOKEN_PATTERN.match(query, position)
+        if match is None:
+            raise QueryError(f'Unterminated quote in query at position {position}')
+        position = match.end()
+        open_paren, close_paren, quoted, word = match.groups()
+        if open_paren or close_paren:
+            tokens.append(open_paren or close_paren)
+        elif quoted is not None:
+            tokens.append(('term', quoted))
+        elif word in ('AND', 'OR', 'NOT'):
+            tokens.append(word)
+        else:
+            tokens.append(('term', word))
+    return tokens
+
+
+class QueryParser:
+    """Parses boolean skill queries into a SQL condition on candidate ids.
+
+    Grammar: ``expr := and ('OR' and)*``, ``and := unary (['AND'] unary)*``,
+    ``unary := 'NOT' unary | '(' expr ')' | term``. Adjacent terms are ANDed.
+    A term is a skill (``python``, ``"machine learning"``) or ``field:value``
+    for one of FIELDS. Each term becomes an uncorrelated ``IN`` subquery on
+    the postings table, which SQLite evaluates once per query. Queries longer
+    than MAX_TOKENS or nesting NOT and parentheses deeper than MAX_DEPTH are
+    rejected, as they would exhaust the Python or SQLite parser stack.
+    """
+
+    MAX_TOKENS = 200
+    MAX_DEPTH = 20
+
+    def __init__(self, query):
+        self.tokens = tokenize_query(query)
+        self.position = 0
+        self.depth = 0
+        self.params = []
+
+    def parse(self):
+        """Return (sql, params) for a condition on ``candidates.id``"""
+        if not self.tokens:
+            raise QueryError('Empty query')
+        if len(self.tokens) > self.MAX_TOKENS:
+            raise QueryError(f'Query is too long: at most {self.MAX_TOKENS} terms and operators are allowed')
+        sql = self._expr()
+        if self.position != len(self.tokens):
+            raise QueryError(f'Unexpected {self._describe(self.tokens[self.position])} in query')
+        return sql, self.params
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _describe(self, token):
+        return f"'{token[1]}'" if isinstance(token, tuple) else f"'{token}'"
+
+    def _expr(self):
+        # Operands are joined flat, so the SQL nests only as deep as the query
+        operands = [self._and()]
+        while self._peek() == 'OR':
+            self.position += 1
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else f"({' OR '.join(operands)})"
+
+    def _and(self):
+        operands = [self._unary()]
+        while self._peek() not in (None, 'OR', ')'):
+            if self._peek() == 'AND':
+                self.position += 1
+            operands.append(self._unary())
+        return operands[0] if len(operands) == 1 else f"({' AND '.join(operands)})"
+
+    def _unary(self):
+        token = self._peek()
+        if token is None:
+            raise QueryError('Query ends unexpectedly')
+        self.position += 1
+        if token in ('NOT', '('):
+            self.depth += 1
+            if self.depth > self.MAX_DEPTH:
+                raise QueryError(f'Query nests NOT and parentheses more than {self.MAX_DEPTH} levels deep')
+            if token == 'NOT':
+                sql = f'NOT {self._unary()}'
+            else:
+                sql = self._expr()
+                if self._peek() != ')':
+                    raise QueryError('Missing closing parenthesis in query')
+                self.position += 1
+            self.depth -= 1
+            return sql
+        if not isinstance(token, tuple):
+            raise QueryError(f'Unexpected {self._describe(token)} in query')
+
+        field, _, value = token[1].partition(':')
+        if field not in FIELDS:
+            field, value = 'skill', token[1]
+        self.params.extend((field, value.lower()))
+        return 'id IN (SELECT candidate_id FROM postings WHERE field = ? AND value = ?)'
+
+
+class CandidateStore:
+    """SQLite-backed store of analyzed candidates with an inverted index.
+
+    Each candidate keeps a compact summary of its analysis, keyed by the
+    SHA-256 of the uploaded file so re-analyzing a CV replaces its entry.
+    The postings table maps skill, industry, education level, experience
+    bucket and certification values to candidate ids; boolean queries are
+    answered from it alone, without touching any document. The numeric
+    feature vector of each analysis is kept as packed float64 values under
+    its schema id, for bulk export.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(candidates)')}
+            if 'features' not in columns:
+                conn.execute('ALTER TABLE candidates ADD COLUMN feature_schema TEXT')
+                conn.execute('ALTER TABLE candidates ADD COLUMN features BLOB')
+            conn.execute('CREATE INDEX IF NOT EXISTS candidates_feature_schema ON candidates (feature_schema, id)')
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the store safe across threads and forks
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, content_hash, filename, results, feature_names=None):
+        """Index a successful analysis result and return the candidate id
+
+        With ``feature_names``, the names of the values in
+        ``results['features']``, the feature vector is stored as well.
+        """
+        detailed = results['detailed_analysis']
+        summary = {
+            'filename': filename,
+            'overall_score': results['overall_score'],
+            'grade': results['grade']['grade'],
+            'industry': primary_industry(results),
+            'education_level': detailed['education_level'],
+            'experience_years': detailed['experience_analysis']['estimated_years'],
+            'skills': sorted({skill for skills in detailed['skills_breakdown'].values() for skill in skills}),
+            'certifications': sorted(detailed['certifications_found'])
+        }
+        feature_schema = features = None
+        if feature_names is not None and 'features' in results:
+            feature_schema = results['features']['schema']
+            features = array('d', results['features']['values']).tobytes()
+        with self._connect() as conn:
+            row = conn.execute('SELECT id FROM candidates WHERE content_hash = ?', (content_hash,)).fetchone()
+            if row is not None:
+                conn.execute('DELETE FROM postings WHERE candidate_id = ?', row)
+                conn.execute('DELETE FROM candidates WHERE id = ?', row)
+            if feature_schema is not None:
+                conn.execute('INSERT OR IGNORE INTO feature_schemas (id, names) VALUES (?, ?)',
+                             (feature_schema, json.dumps(feature_names)))
+            candidate_id = conn.execute(
+                'INSERT INTO candidates (content_hash, filename, overall_score, industry, education_level, '
+                'experience_years, summary, indexed_at, feature_schema, features) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (content_hash, filename, summary['overall_score'], summary['industry'],
+                 summary['education_level'], summary['experience_years'], json.dumps(summary), time.time(),
+                 feature_schema, features)
+            ).lastrowid
+            conn.executemany(
+                'INSERT INTO postings (field, value, candidate_id) VALUES (?, ?, ?)',
+                [(field, value, candidate_id) for field, value in candidate_postings(results)]
+            )
+        return candidate_id
+
+    def get(self, candidate_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT id, summary, indexed_at FROM candidates WHERE id = ?', (candidate_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], **json.loads(row[1]), 'indexed_at': datetime.fromtimestamp(row[2]).isoformat()}
+
+    def delete(self, candidate_id):
+        """Remove a candidate and its postings; returns False if it did not exist"""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM postings WHERE candidate_id = ?', (candidate_id,))
+            return conn.execute('DELETE FROM candidates WHERE id = ?', (candidate_id,)).rowcount > 0
+
+    def search(self, query=None, min_years=None, max_years=None, min_score=None, limit=50, offset=0):
+        """Candidates matching a boolean query and numeric filters, best score first
+
+        Returns (total matches, page of candidate summaries). Raises
+        QueryError for an unparseable query.
+        """
+        conditions, params = [], []
+        if query:
+            query_sql, query_params = QueryParser(query).parse()
+            conditions.append(query_sql)
+            params.extend(query_params)
+        for clause, value in (('experience_years >= ?', min_years), ('experience_years <= ?', max_years),
+                              ('overall_score >= ?', min_score)):
+            if value is not None:
+                conditions.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        with self._connect() as conn:
+            total = conn.execute(f'SELECT COUNT(*) FROM candidates {where}', params).fetchone()[0]
+            rows = conn.execute(
+                f'SELECT id, summary FROM candidates {where} ORDER BY overall_score DESC, id LIMIT ? OFFSET ?',
+                params + [limit, offset]
+            ).fetchall()
+        return total, [{'id': candidate_id, **json.loads(summary)} for candidate_id, summary in rows]
+
+    def feature_schemas(self):
+        """{schema id: {'names': [...], 'candidates': count}} of the stored feature vectors"""
+        with self._connect() as conn:
+            names = dict(conn.execute('SELECT id, names FROM feature_schemas'))
+            counts = conn.execute(
+                'SELECT feature_schema, COUNT(*) FROM candidates WHERE feature_schema IS NOT NULL '
+                'GROUP BY feature_schema'
+            ).fetchall()
+        return {schema: {'names': json.loads(names[schema]), 'candidates': count}
+                for schema, count in counts if schema in names}
+
+    def iter_features(self, schema, batch_size=5000):
+        """Yield lists of (candidate id, packed float64 features) of one schema, in id order
+
+        Pages are read by id in short transactions, so a long export neither
+        holds memory nor blocks indexing.
+        """
+        last_id = 0
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    'SELECT id, features FROM candidates WHERE feature_schema = ? AND id > ? ORDER BY id LIMIT ?',
+                    (schema, last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    def stats(self):
+        with self._connect() as conn:
+            candidates = conn.execute('SELECT COUNT(*) FROM candidates').fetchone()[0]
+            postings = conn.execute('SELECT COUNT(*) FROM postings').fetchone()[0]
+        return {'candidates': candidates, 'postings': postings}
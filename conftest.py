@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import uuid
+
+import pytest
+
+# app reads its configuration at import, so point it at scratch stores and a
+# copy of the taxonomy before any test module imports it
+DATA_FOLDER = tempfile.mkdtemp(prefix='cv-tests-')
+TAXONOMY_PATH = os.path.join(DATA_FOLDER, 'taxonomy.json')
+shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'taxonomy.json'), TAXONOMY_PATH)
+os.environ.update({
+    'DATA_FOLDER': DATA_FOLDER,
+    'TAXONOMY_PATH': TAXONOMY_PATH,
+    'CANDIDATE_STORE': '1',
+    'BATCH_WORKERS': '2',
+    'EXTRACTION_WORKERS': '1',
+    'JOB_WORKERS': '0',
+    'PREWARM_EXTRACTORS': '0',
+})
+os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(DATA_FOLDER, ignore_errors=True)
+
+SAMPLE_CV = """Jane Doe
+jane.doe@example.com | +1 555 123 4567 | linkedin.com/in/janedoe
+
+Summary
+Senior software engineer with 8 years of experience building web platforms.
+
+Experience
+Senior Software Engineer, Acme Corp (2018 - present)
+- Led a team of 5 developers and increased deployment frequency by 40%
+- Developed Python and React services on AWS with Docker and Kubernetes
+Software Developer, Initech (2014 - 2018)
+- Managed the migration of 20 services to PostgreSQL
+
+Education
+Bachelor of Science in Computer Science, State University, 2014
+
+Skills
+Python, JavaScript, React, SQL, AWS, Docker, Git, agile, communication, leadership
+
+Certifications
+AWS Certified Solutions Architect
+"""
+
+# Mentions no industry keyword, so detect_cv_type returns the plain string 'general'
+GENERAL_CV = """John Smith
+john.smith@example.com
+
+Summary
+Reliable and friendly person who enjoys working with people and keeping things tidy.
+
+Experience
+Volunteer, Community Garden (2019 - present)
+- Watered plants, welcomed visitors and kept the tool shed in order
+
+Qualifications
+First aid course, Red Cross, 2020
+"""
+
+
+@pytest.fixture(scope='session')
+def cv_text():
+    return SAMPLE_CV
+
+
+@pytest.fixture(scope='session')
+def general_cv_text():
+    return GENERAL_CV
+
+
+@pytest.fixture
+def unique_cv(cv_text):
+    """A CV whose bytes no other test uploads, so the result cache does not answer for it"""
+    return lambda text=cv_text: f'{text}\nReference {uuid.uuid4().hex}\n'
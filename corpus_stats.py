@@ -0,0 +1,83 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    content_hash TEXT PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS doc_freq (
+    term TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    documents INTEGER NOT NULL,
+    tokens INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, documents, tokens) VALUES (0, 0, 0);
+"""
+
+
+class CorpusStats:
+    """Document frequencies of CV tokens, maintained as CVs are analyzed.
+
+    Holds one row per distinct term with the number of CVs containing it,
+    plus the CV count and total token count used for BM25 length
+    normalization. Adding a CV costs one upsert per distinct term in it;
+    CVs are identified by the hash of their text so re-analyzing one does
+    not count it twice. The database file is shared by every worker process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the stats safe across threads and forks
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add_document(self, content_hash, terms, length):
+        """Count a CV's distinct ``terms`` once; returns False if it was already counted"""
+        with self._connect() as conn:
+            if conn.execute('INSERT OR IGNORE INTO documents (content_hash) VALUES (?)',
+                            (content_hash,)).rowcount == 0:
+                return False
+            conn.executemany(
+                'INSERT INTO doc_freq (term, df) VALUES (?, 1) ON CONFLICT (term) DO UPDATE SET df = df + 1',
+                ((term,) for term in terms)
+            )
+            conn.execute('UPDATE totals SET documents = documents + 1, tokens = tokens + ? WHERE id = 0',
+                         (length,))
+        return True
+
+    def snapshot(self, terms):
+        """Return (CV count, average CV length, {term: df}) for the given terms"""
+        terms = list(terms)
+        with self._connect() as conn:
+            documents, tokens = conn.execute('SELECT documents, tokens FROM totals WHERE id = 0').fetchone()
+            doc_freq = {}
+            # Stay under SQLite's bound parameter limit
+            for start in range(0, len(terms), 500):
+                chunk = terms[start:start + 500]
+                doc_freq.update(conn.execute(
+                    f"SELECT term, df FROM doc_freq WHERE term IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall())
+        return documents, tokens / documents if documents else 0.0, doc_freq
+
+    def stats(self):
+        with self._connect() as conn:
+            documents, tokens = conn.execute('SELECT documents, tokens FROM totals WHERE id = 0').fetchone()
+            terms = conn.execute('SELECT COUNT(*) FROM doc_freq').fetchone()[0]
+        return {'documents': documents, 'terms': terms, 'tokens': tokens}
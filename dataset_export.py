@@ -0,0 +1,75 @@
+import csv
+import os
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+
+
+def write_csv(path, names, batches):
+    """Write column batches as CSV rows under a header of ``names``; returns the row count
+
+    ``batches`` yields dicts of column name -> 1-D array, all of one length.
+    Rows are written as they arrive, so memory use does not depend on the
+    number of rows. The file appears at ``path`` only once it is complete.
+    """
+    rows = 0
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', newline='', encoding='utf-8', dir=directory, delete=False) as file:
+        try:
+            writer = csv.writer(file)
+            writer.writerow(names)
+            for batch in batches:
+                columns = [batch[name].tolist() for name in names]
+                writer.writerows(zip(*columns))
+                rows += len(columns[0]) if columns else 0
+        except BaseException:
+            file.close()
+            os.remove(file.name)
+            raise
+    os.replace(file.name, path)
+    return rows
+
+
+def write_npz(path, names, batches, compress=False):
+    """Write column batches as an .npz holding one array per column; returns the row count
+
+    The result loads with ``np.load`` like a file from ``np.savez``. Each
+    column is first appended to its own staging file next to ``path`` (not
+    in the temporary directory, which may be in memory), then copied into
+    the archive behind an .npy header once the row count is known, so
+    memory use does not depend on the number of rows. A column's dtype is
+    that of its first batch.
+    """
+    rows = 0
+    dtypes = {}
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryDirectory(dir=directory, prefix='.export-') as staging:
+        files = [open(os.path.join(staging, f'{position}.bin'), 'wb') for position in range(len(names))]
+        try:
+            for batch in batches:
+                for name, file in zip(names, files):
+                    values = np.asarray(batch[name])
+                    dtype = dtypes.setdefault(name, values.dtype)
+                    np.ascontiguousarray(values, dtype=dtype).tofile(file)
+                rows += len(batch[names[0]]) if names else 0
+        finally:
+            for file in files:
+                file.close()
+
+        archive_path = os.path.join(staging, 'archive.npz')
+        compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        with zipfile.ZipFile(archive_path, 'w', compression=compression, allowZip64=True) as archive:
+            for position, name in enumerate(names):
+                header = {
+                    'descr': np.lib.format.dtype_to_descr(dtypes.get(name, np.dtype(np.float64))),
+                    'fortran_order': False,
+                    'shape': (rows,)
+                }
+                with archive.open(f'{name}.npy', 'w', force_zip64=True) as entry:
+                    np.lib.format.write_array_header_1_0(entry, header)
+                    with open(os.path.join(staging, f'{position}.bin'), 'rb') as column:
+                        shutil.copyfileobj(column, entry, 1024 * 1024)
+        os.replace(archive_path, path)
+    return rows
@@ -0,0 +1,150 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+
+class ExtractionTimeout(Exception):
+    """Raised when a document takes longer than the pool's timeout to extract"""
+
+
+class ExtractionWorkerError(Exception):
+    """Raised when an extraction worker process dies mid-task"""
+
+
+# How often an idle worker checks that the process that started it is alive
+PARENT_CHECK_INTERVAL = 5
+
+
+def _worker_main(conn, target, parent_pid):
+    while True:
+        try:
+            # Sibling workers inherit each other's pipes, so the parent exiting
+            # does not always close this one; exit once we are reparented
+            if not conn.poll(PARENT_CHECK_INTERVAL):
+                if os.getppid() != parent_pid:
+                    break
+                continue
+            args = conn.recv()
+        except (EOFError, OSError):
+            break
+        if args is None:
+            break
+        try:
+            conn.send((True, target(*args)))
+        except Exception as e:
+            conn.send((False, f'{type(e).__name__}: {e}'))
+
+
+class _Worker:
+    def __init__(self, context, target):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, target, os.getpid()),
+                                       daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ExtractionPool:
+    """Pre-forked worker processes that run document text extraction.
+
+    ``run`` hands its arguments to an idle worker, which calls ``target`` with
+    them, and waits at most ``timeout`` seconds for the result, the wait for
+    an idle worker included. A worker that overruns is killed and replaced,
+    so a malformed or huge document costs its caller one ExtractionTimeout
+    instead of stalling the server or queueing behind others. Workers are
+    also replaced after ``max_tasks`` documents to return the memory the
+    parsers leave fragmented. The processes start on first use, after the
+    server has forked its own workers.
+    """
+
+    def __init__(self, target, workers, timeout, max_tasks):
+        self.target = target
+        self.workers = workers
+        self.timeout = timeout
+        self.max_tasks = max_tasks
+        self._context = multiprocessing.get_context()
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self.timeouts = 0
+        self.recycled = 0
+
+    def start(self):
+        with self._lock:
+            if not self._started:
+                for _ in range(self.workers):
+                    self._idle.put(_Worker(self._context, self.target))
+                self._started = True
+
+    def run(self, *args):
+        self.start()
+        deadline = time.monotonic() + self.timeout
+        try:
+            worker = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            self._timed_out()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._idle.put(worker)
+            self._timed_out()
+        try:
+            worker.conn.send(args)
+            if not worker.conn.poll(remaining):
+                self._timed_out()
+            ok, result = worker.conn.recv()
+        except (EOFError, OSError):
+            self._replace(worker)
+            raise ExtractionWorkerError('Extraction worker terminated unexpectedly')
+        except BaseException:
+            self._replace(worker)
+            raise
+
+        worker.tasks += 1
+        if worker.tasks >= self.max_tasks:
+            with self._lock:
+                self.recycled += 1
+            worker.stop()
+            worker = _Worker(self._context, self.target)
+        self._idle.put(worker)
+
+        if not ok:
+            raise ExtractionWorkerError(result)
+        return result
+
+    def _timed_out(self):
+        with self._lock:
+            self.timeouts += 1
+        raise ExtractionTimeout(f'Document extraction timed out after {self.timeout} seconds')
+
+    def _replace(self, worker):
+        worker.stop(kill=True)
+        self._idle.put(_Worker(self._context, self.target))
+
+    def close(self):
+        with self._lock:
+            while not self._idle.empty():
+                self._idle.get_nowait().stop()
+            self._started = False
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'timeout_seconds': self.timeout,
+            'max_tasks_per_worker': self.max_tasks,
+            'timeouts': self.timeouts,
+            'recycled_workers': self.recycled
+        }
@@ -0,0 +1,138 @@
+"""Gunicorn settings for production: gunicorn -c gunicorn.conf.py app:app
+
+The app is preloaded in the master, so the analyzer and its compiled keyword
+matchers are built once and shared copy-on-write with every worker. Workers
+and threads are sized from the CPUs available to the container, and a worker
+whose resident memory grows past WORKER_MAX_RSS_MB finishes its current
+request and is replaced. Every setting can be overridden from the
+environment; the effective values are logged once the server is ready.
+"""
+import os
+import tempfile
+
+
+def available_cpus():
+    """CPUs this process may use, honouring affinity and cgroup CPU quotas"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = None
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as file:
+            limit, period = file.read().split()
+        if limit != 'max':
+            quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as file:
+                limit = int(file.read())
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as file:
+                period = int(file.read())
+            if limit > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+
+    if quota is not None:
+        cpus = min(cpus, max(1, int(quota + 0.5)))
+    return cpus
+
+
+def resident_memory():
+    """Resident set size of the current process in bytes, or None if unknown"""
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+CPUS = available_cpus()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+preload_app = True
+# Workers fork from the preloaded master, so importing the PDF and DOCX parsers
+# there once is cheaper than every worker importing them on first use
+os.environ.setdefault('PREWARM_EXTRACTORS', '1')
+
+# Analysis holds the GIL, so one worker per CPU; threads overlap uploads and
+# the waits on extraction worker processes
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', max(2, CPUS)))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Recycle workers: by resident memory after any request (see post_request),
+# and after a jittered request count as a backstop
+WORKER_MAX_RSS_MB = int(os.environ.get('WORKER_MAX_RSS_MB', 512))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+
+# Heartbeat files on tmpfs, so a slow disk cannot get workers killed
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+loglevel = os.environ.get('LOG_LEVEL', 'info')
+accesslog = os.environ.get('ACCESS_LOG', '-') or None
+errorlog = '-'
+access_log_format = '%(h)s "%(r)s" %(s)s %(b)s %(M)sms'
+
+# With several workers, metrics are aggregated through files in this
+# directory; it is emptied here, before the preloaded app records anything
+if workers > 1 and not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = os.path.join(tempfile.gettempdir(), f'cv-prometheus-{os.getpid()}')
+if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    multiproc_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    os.makedirs(multiproc_dir, exist_ok=True)
+    for name in os.listdir(multiproc_dir):
+        if name.endswith('.db'):
+            os.remove(os.path.join(multiproc_dir, name))
+
+
+def when_ready(server):
+    cfg = server.cfg
+    server.log.info(
+        'Effective settings: bind=%s cpus=%d workers=%d worker_class=%s threads=%d timeout=%ds '
+        'preload_app=%s max_requests=%d(+%d) worker_max_rss=%dMB prometheus_multiproc_dir=%s',
+        ','.join(cfg.bind), CPUS, cfg.workers, cfg.worker_class_str, cfg.threads, cfg.timeout,
+        cfg.preload_app, cfg.max_requests, cfg.max_requests_jitter, WORKER_MAX_RSS_MB,
+        os.environ.get('PROMETHEUS_MULTIPROC_DIR') or '-'
+    )
+    if cfg.preload_app:
+        from app import app, startup_report
+        server.log.info(
+            'App settings: extraction_workers=%d extraction_timeout=%ss batch_workers=%d job_workers=%d '
+            'result_cache_max_bytes=%d',
+            app.config['EXTRACTION_WORKERS'], app.config['EXTRACTION_TIMEOUT'], app.config['BATCH_WORKERS'],
+            app.config['JOB_WORKERS'], app.config['RESULT_CACHE_MAX_BYTES']
+        )
+        report = startup_report()
+        server.log.info(
+            'App loaded in %.0fms (%s); extractor backends preloaded: %s',
+            report['total_seconds'] * 1000,
+            ', '.join(f'{phase} {seconds * 1000:.0f}ms' for phase, seconds in report['phases_seconds'].items()),
+            ', '.join(report['extractor_backends_loaded']) or 'none'
+        )
+
+
+def post_request(worker, req, environ, resp):
+    rss = resident_memory()
+    if worker.alive and rss is not None and rss > WORKER_MAX_RSS_MB * 1024 * 1024:
+        worker.log.info('Worker %s resident memory %dMB exceeds %dMB; recycling',
+                        worker.pid, rss // (1024 * 1024), WORKER_MAX_RSS_MB)
+        worker.alive = False
+
+
+def worker_exit(server, worker):
+    from app import close_worker_pools
+    close_worker_pools()
+
+
+def child_exit(server, worker):
+    # Imported here: prometheus_client must not load before PROMETHEUS_MULTIPROC_DIR is set above
+    from metrics import mark_process_dead
+    mark_process_dead(worker.pid)
@@ -0,0 +1,109 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_profiles (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    job_description TEXT NOT NULL,
+    job_tokens TEXT NOT NULL,
+    job_skills TEXT NOT NULL,
+    taxonomy_version TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class JobProfileStore:
+    """SQLite-backed store of job descriptions compiled for matching.
+
+    A profile keeps the job description together with the state
+    ``EnhancedCVAnalyzer.compile_job_profile`` derived from it: the token set
+    and the taxonomy skills it asks for, plus the taxonomy version they were
+    computed with so stale profiles can be recompiled. The database file is
+    shared by every worker process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the store safe across threads and forks
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, title, job_description, compiled):
+        """Store a compiled profile and return its id"""
+        profile_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO job_profiles '
+                '(id, title, job_description, job_tokens, job_skills, taxonomy_version, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (profile_id, title, job_description, json.dumps(sorted(compiled['job_tokens'])),
+                 json.dumps(compiled['job_skills']), compiled['taxonomy_version'], time.time())
+            )
+        return profile_id
+
+    def update(self, profile_id, compiled):
+        """Replace the compiled state of a profile, e.g. after a taxonomy change"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE job_profiles SET job_tokens = ?, job_skills = ?, taxonomy_version = ? WHERE id = ?',
+                (json.dumps(sorted(compiled['job_tokens'])), json.dumps(compiled['job_skills']),
+                 compiled['taxonomy_version'], profile_id)
+            )
+
+    def get(self, profile_id):
+        """Return the profile with its compiled state, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT id, title, job_description, job_tokens, job_skills, taxonomy_version, created_at '
+                'FROM job_profiles WHERE id = ?',
+                (profile_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        profile_id, title, job_description, job_tokens, job_skills, taxonomy_version, created_at = row
+        return {
+            'id': profile_id,
+            'title': title,
+            'job_description': job_description,
+            'job_tokens': frozenset(json.loads(job_tokens)),
+            'job_skills': json.loads(job_skills),
+            'taxonomy_version': taxonomy_version,
+            'created_at': datetime.fromtimestamp(created_at).isoformat()
+        }
+
+    def list(self):
+        """Summaries of every profile, newest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT id, title, created_at FROM job_profiles ORDER BY created_at DESC'
+            ).fetchall()
+        return [
+            {'id': profile_id, 'title': title, 'created_at': datetime.fromtimestamp(created_at).isoformat()}
+            for profile_id, title, created_at in rows
+        ]
+
+    def delete(self, profile_id):
+        """Delete a profile; returns False if it did not exist"""
+        with self._connect() as conn:
+            return conn.execute('DELETE FROM job_profiles WHERE id = ?', (profile_id,)).rowcount > 0
@@ -0,0 +1,284 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    file_data BLOB,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+def _timestamp(value):
+    return datetime.fromtimestamp(value).isoformat() if value else None
+
+
+class JobQueue:
+    """SQLite-backed queue of analysis jobs.
+
+    Uploaded bytes are kept in the database until the job finishes, so queued
+    work survives a restart. Jobs are claimed atomically, which lets every
+    server process run workers against the same file. Each process refreshes
+    a heartbeat on the jobs it is running; a running job whose heartbeat is
+    older than ``lease`` seconds belonged to a process that died and is put
+    back in the queue, up to ``max_attempts`` times.
+    """
+
+    def __init__(self, path, lease=60, max_attempts=3, retention=24 * 3600):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.retention = retention
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the queue safe across threads and forks
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, filename, file_data):
+        """Queue a file for analysis and return the new job id"""
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, status, filename, file_data, created_at) VALUES (?, ?, ?, ?, ?)',
+                (job_id, QUEUED, filename, file_data, time.time())
+            )
+        return job_id
+
+    def claim(self, worker):
+        """Mark the oldest queued job as running and return (id, filename, data), or None"""
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT id, filename, file_data FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1',
+                    (QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    now = time.time()
+                    conn.execute(
+                        'UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?, '
+                        'started_at = ?, heartbeat_at = ? WHERE id = ?',
+                        (RUNNING, worker, now, now, row[0])
+                    )
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        return row
+
+    def complete(self, job_id, result):
+        self._finish(job_id, COMPLETED, json.dumps(result), None)
+
+    def fail(self, job_id, error):
+        self._finish(job_id, FAILED, None, error)
+
+    def _finish(self, job_id, status, result, error):
+        # The upload is dropped once the job no longer needs it
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, file_data = NULL, finished_at = ? '
+                'WHERE id = ?',
+                (status, result, error, time.time(), job_id)
+            )
+
+    def get(self, job_id):
+        """Return the public view of a job, or None if it does not exist"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT id, status, filename, result, error, attempts, created_at, started_at, finished_at '
+                'FROM jobs WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        job_id, status, filename, result, error, attempts, created_at, started_at, finished_at = row
+        job = {
+            'job_id': job_id,
+            'status': status,
+            'filename': filename,
+            'attempts': attempts,
+            'created_at': _timestamp(created_at),
+            'started_at': _timestamp(started_at),
+            'finished_at': _timestamp(finished_at)
+        }
+        if result is not None:
+            job['result'] = json.loads(result)
+        if error is not None:
+            job['error'] = error
+        return job
+
+    def heartbeat(self, worker):
+        """Extend the lease on every job ``worker`` is running"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET heartbeat_at = ? WHERE status = ? AND worker = ?',
+                (time.time(), RUNNING, worker)
+            )
+
+    def recover(self):
+        """Requeue running jobs whose lease has expired; returns how many were requeued"""
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                orphans = conn.execute(
+                    'SELECT id, attempts FROM jobs WHERE status = ? AND heartbeat_at < ?',
+                    (RUNNING, time.time() - self.lease)
+                ).fetchall()
+                requeued = 0
+                for job_id, attempts in orphans:
+                    if attempts >= self.max_attempts:
+                        conn.execute(
+                            'UPDATE jobs SET status = ?, error = ?, file_data = NULL, finished_at = ? WHERE id = ?',
+                            (FAILED, f'Job abandoned after {attempts} interrupted attempt(s)', time.time(), job_id)
+                        )
+                    else:
+                        conn.execute(
+                            'UPDATE jobs SET status = ?, worker = NULL, started_at = NULL WHERE id = ?',
+                            (QUEUED, job_id)
+                        )
+                        requeued += 1
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        return requeued
+
+    def purge_finished(self):
+        """Delete finished jobs older than the retention period"""
+        with self._connect() as conn:
+            return conn.execute(
+                'DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?',
+                (COMPLETED, FAILED, time.time() - self.retention)
+            ).rowcount
+
+    def stats(self):
+        with self._connect() as conn:
+            counts = dict(conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+        return {status: counts.get(status, 0) for status in (QUEUED, RUNNING, COMPLETED, FAILED)}
+
+
+class JobWorkers:
+    """Background threads that run queued jobs through ``handler``.
+
+    ``handler(file_data, filename)`` returns the job result; a result with an
+    ``error`` key, or an exception, fails the job. A housekeeping thread keeps
+    the leases of running jobs alive, requeues jobs abandoned by dead
+    processes and purges old ones. Threads start on first use in each
+    process, so they are created after the server has forked.
+    """
+
+    # Idle workers check the queue at least this often (seconds)
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, job_queue, handler, threads):
+        self.queue = job_queue
+        self.handler = handler
+        self.threads = threads
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._worker = None
+        # Jobs that could not be marked failed, retried by housekeeping: {job id: error}
+        self._unfinished = {}
+
+    def start(self):
+        with self._lock:
+            if self._pid == os.getpid() or self.threads <= 0:
+                return
+            self._pid = os.getpid()
+            self._worker = uuid.uuid4().hex
+            self.queue.recover()
+            for number in range(self.threads):
+                threading.Thread(target=self._run, name=f'job-worker-{number}', daemon=True).start()
+            threading.Thread(target=self._housekeeping, name='job-housekeeping', daemon=True).start()
+
+    def notify(self):
+        """Wake an idle worker after a job has been submitted"""
+        self._wakeup.set()
+
+    def _housekeeping(self):
+        while True:
+            time.sleep(self.queue.lease / 3)
+            try:
+                with self._lock:
+                    unfinished = list(self._unfinished.items())
+                for job_id, error in unfinished:
+                    self.queue.fail(job_id, error)
+                    with self._lock:
+                        del self._unfinished[job_id]
+                self.queue.heartbeat(self._worker)
+                self.queue.recover()
+                self.queue.purge_finished()
+            except sqlite3.Error as e:
+                print(f"Job queue housekeeping failed: {str(e)}")
+
+    def _run(self):
+        while True:
+            try:
+                job = self.queue.claim(self._worker)
+            except sqlite3.Error as e:
+                print(f"Job queue unavailable: {str(e)}")
+                job = None
+            if job is None:
+                if self._wakeup.wait(self.POLL_INTERVAL):
+                    self._wakeup.clear()
+                continue
+
+            job_id, filename, file_data = job
+            try:
+                result = self.handler(file_data, filename)
+            except Exception as e:
+                self._fail(job_id, f'Analysis failed: {str(e)}')
+                continue
+
+            try:
+                if 'error' in result:
+                    self.queue.fail(job_id, result['error'])
+                else:
+                    self.queue.complete(job_id, result)
+            except Exception as e:
+                self._fail(job_id, f'Could not store the result: {str(e)}')
+
+    def _fail(self, job_id, error):
+        """Mark a job failed, leaving it to housekeeping if the queue is unavailable"""
+        try:
+            self.queue.fail(job_id, error)
+        except sqlite3.Error as e:
+            # Retried before each heartbeat, which would otherwise keep the job running forever
+            print(f"Could not mark job {job_id} failed: {str(e)}")
+            with self._lock:
+                self._unfinished[job_id] = error
@@ -0,0 +1,71 @@
+import os
+
+from prometheus_client import (CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram,
+                               generate_latest, multiprocess)
+
+# Latency buckets from 1ms to 60s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Upload size buckets from 1KB to 256MB
+SIZE_BUCKETS = tuple(1024 * 4 ** power for power in range(10))
+
+
+class AnalysisMetrics:
+    """Prometheus metrics for requests, extraction and analysis stages.
+
+    When PROMETHEUS_MULTIPROC_DIR is set, every process (gunicorn workers
+    and batch pool processes alike) records into memory-mapped files in that
+    directory, and ``render`` aggregates them, so counts cover the whole
+    server rather than the worker that happened to serve /metrics. The
+    directory must be emptied before the server starts, and gunicorn's
+    child_exit hook should call ``mark_process_dead``.
+    """
+
+    def __init__(self):
+        self.multiprocess = bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+        self.requests = Counter(
+            'cv_http_requests_total', 'HTTP requests by endpoint, method and status code',
+            ['endpoint', 'method', 'status']
+        )
+        self.request_latency = Histogram(
+            'cv_http_request_duration_seconds', 'HTTP request latency by endpoint',
+            ['endpoint'], buckets=LATENCY_BUCKETS
+        )
+        self.upload_size = Histogram(
+            'cv_upload_size_bytes', 'Request body size by endpoint',
+            ['endpoint'], buckets=SIZE_BUCKETS
+        )
+        self.extraction_latency = Histogram(
+            'cv_extraction_duration_seconds', 'Text extraction latency by file format',
+            ['format'], buckets=LATENCY_BUCKETS
+        )
+        self.stage_latency = Histogram(
+            'cv_analysis_stage_duration_seconds', 'Latency of each analyze_cv stage',
+            ['stage'], buckets=LATENCY_BUCKETS
+        )
+
+    def observe_request(self, endpoint, method, status, seconds, size):
+        self.requests.labels(endpoint, method, status).inc()
+        self.request_latency.labels(endpoint).observe(seconds)
+        if size:
+            self.upload_size.labels(endpoint).observe(size)
+
+    def observe_extraction(self, file_format, seconds):
+        self.extraction_latency.labels(file_format).observe(seconds)
+
+    def observe_stage(self, stage, seconds):
+        self.stage_latency.labels(stage).observe(seconds)
+
+    def render(self):
+        """Return (body, content type) for the /metrics endpoint"""
+        if self.multiprocess:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return generate_latest(registry), CONTENT_TYPE_LATEST
+        return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid):
+    """Drop a dead worker's live gauges; call from gunicorn's child_exit hook"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,81 @@
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class AnalysisProfiler:
+    """Per-stage wall time and memory allocation of a single analysis.
+
+    Memory is measured with tracemalloc: ``allocated_bytes`` is how far the
+    traced heap grew above its size at the start of the stage (its peak),
+    ``retained_bytes`` what was still allocated when the stage finished.
+    tracemalloc is process-wide, so allocations made concurrently by other
+    threads are counted too. With ``top_functions`` the whole analysis also
+    runs under cProfile and the most expensive functions are reported.
+    """
+
+    def __init__(self, top_functions=0):
+        self.top_functions = top_functions
+        self.stages = []
+        self._profile = cProfile.Profile() if top_functions else None
+        self._started_tracing = False
+        self._started = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._started = time.perf_counter()
+        if self._profile is not None:
+            self._profile.enable()
+
+    @contextmanager
+    def stage(self, name):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            after, peak = tracemalloc.get_traced_memory()
+            self.stages.append({
+                'stage': name,
+                'seconds': round(seconds, 6),
+                'allocated_bytes': max(peak - before, 0),
+                'retained_bytes': after - before
+            })
+
+    def finish(self):
+        """Stop profiling and return the _profile report"""
+        total = time.perf_counter() - self._started
+        if self._profile is not None:
+            self._profile.disable()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        report = {
+            'total_seconds': round(total, 6),
+            'stages': self.stages
+        }
+        if self._profile is not None:
+            report['functions'] = self.top_function_stats()
+        return report
+
+    def top_function_stats(self):
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        stats.sort_stats('cumulative')
+        functions = []
+        for function in stats.fcn_list[:self.top_functions]:
+            primitive_calls, calls, total_time, cumulative_time, _ = stats.stats[function]
+            filename, line, name = function
+            functions.append({
+                'function': f'{filename}:{line}({name})',
+                'calls': calls,
+                'total_seconds': round(total_time, 6),
+                'cumulative_seconds': round(cumulative_time, 6)
+            })
+        return functions
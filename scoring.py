@@ -0,0 +1,372 @@
+import numpy as np
+
+# Rubric constants, as used by EnhancedCVAnalyzer's scalar score_* methods
+DEFAULT_LENGTH = (400, 800)
+DEFAULT_ESSENTIAL_SECTIONS = ('education', 'experience', 'skills')
+IMPORTANT_SECTIONS = ('summary', 'projects', 'achievements')
+BONUS_SECTIONS = ('certifications', 'languages', 'interests')
+DEFAULT_ATS_WEIGHT = 0.3
+# Overall score weights (contact, skills, structure, sections)
+DEFAULT_WEIGHTS = (0.15, 0.30, 0.25, 0.30)
+INDUSTRY_WEIGHTS = {
+    'technology': (0.15, 0.35, 0.25, 0.25),
+    'creative': (0.15, 0.25, 0.25, 0.35),
+    'healthcare': (0.10, 0.30, 0.25, 0.35),
+}
+
+CONTACT_COLUMNS = ('has_email', 'professional_email', 'has_phone', 'has_linkedin', 'has_github',
+                   'has_location', 'has_website', 'has_twitter')
+STRUCTURE_COLUMNS = ('word_count', 'character_count', 'line_count', 'bullet_points', 'avg_words_per_line',
+                     'emphasis')
+ATS_COLUMNS = ('ats_headers', 'special_characters', 'has_at', 'ats_keywords')
+
+
+def ladder(conditions, points):
+    """Evaluate an if/elif ladder over arrays: (points, index of the branch taken)"""
+    # The first true condition is the one with the highest (count - position)
+    count = len(conditions)
+    first = np.zeros(np.shape(conditions[0]), dtype=np.intp)
+    for position, condition in enumerate(conditions):
+        np.maximum(first, condition * (count - position), out=first)
+    branch = count - first
+    return np.asarray(points).take(branch), branch
+
+
+def round_scores(values):
+    """round(value, 1) of every element, rounding exactly as Python does"""
+    scaled = values * 10
+    rounded = np.rint(scaled) / 10
+    # Away from a tie rint finds the same tenth; near one, defer to Python. Scores
+    # are weighted sums of integers, so there are few distinct values to round
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        distinct, positions = np.unique(values[near_tie], return_inverse=True)
+        rounded[near_tie] = np.array([round(value, 1) for value in distinct.tolist()])[positions]
+    return rounded
+
+
+class ScoringEngine:
+    """The score_* rubric of EnhancedCVAnalyzer, vectorized over many CVs.
+
+    ``encode`` turns the stage outputs of one CV into a row of numeric
+    features; ``score`` rates a matrix of such rows at once and returns
+    the same scores as score_contact_section, score_skills_section,
+    score_structure_and_length, score_sections, analyze_ats_compatibility
+    and calculate_overall_score. The column layout depends on the taxonomy
+    the engine was built from, so rows must be scored by the engine that
+    encoded them. Feedback strings are only built when asked for.
+    """
+
+    # Rows per block in score()
+    BLOCK_ROWS = 8192
+
+    def __init__(self, taxonomy):
+        self.taxonomy_version = taxonomy.version
+        requirements = taxonomy.industry_requirements
+        self.categories = list(taxonomy.skill_keywords)
+        # Industries with requirements, then those that only change the overall weights;
+        # per-industry tables get one extra last row, which code -1 (no industry) selects
+        self.industries = list(requirements) + [name for name in INDUSTRY_WEIGHTS if name not in requirements]
+        self.industry_codes = {name: code for code, name in enumerate(self.industries)}
+        self.sections = list(dict.fromkeys(
+            DEFAULT_ESSENTIAL_SECTIONS + IMPORTANT_SECTIONS + BONUS_SECTIONS
+            + tuple(section for requirement in requirements.values()
+                    for section in requirement['essential_sections'])
+        ))
+
+        # Skill counts and section lengths are contiguous blocks, scored as matrices
+        columns = ['industry', *CONTACT_COLUMNS, 'total_skills', 'skill_categories', 'soft_skills',
+                   'project_management']
+        self.skill_columns = slice(len(columns), len(columns) + len(self.categories))
+        columns += [f'skills.{category}' for category in self.categories] + list(STRUCTURE_COLUMNS)
+        self.section_columns = slice(len(columns), len(columns) + len(self.sections))
+        columns += [f'section.{section}' for section in self.sections] + list(ATS_COLUMNS)
+        self.columns = columns
+        self.index = {name: position for position, name in enumerate(self.columns)}
+        self.important_positions = [self.sections.index(section) for section in IMPORTANT_SECTIONS]
+        self.bonus_positions = [self.sections.index(section) for section in BONUS_SECTIONS]
+
+        rows = len(self.industries) + 1
+        self.has_requirements = np.zeros(rows, dtype=bool)
+        self.min_words = np.full(rows, DEFAULT_LENGTH[0], dtype=np.int64)
+        self.max_words = np.full(rows, DEFAULT_LENGTH[1], dtype=np.int64)
+        self.essential_sections = [list(DEFAULT_ESSENTIAL_SECTIONS)] * rows
+        self.ats_weight = np.full(rows, DEFAULT_ATS_WEIGHT)
+        self.weights = np.tile(np.array(DEFAULT_WEIGHTS)[:, None], (1, rows))
+        # Skill category x industry and section x industry matrices; a category
+        # or section listed twice for an industry counts twice, as in the rubric
+        self.important_skills = np.zeros((len(self.categories), rows))
+        for code, industry in enumerate(self.industries):
+            if industry in requirements:
+                requirement = requirements[industry]
+                self.has_requirements[code] = True
+                for category in requirement['important_skills']:
+                    self.important_skills[self.categories.index(category), code] += 1
+                self.min_words[code], self.max_words[code] = requirement['preferred_length']
+                self.essential_sections[code] = list(requirement['essential_sections'])
+                self.ats_weight[code] = requirement['ats_weight']
+            if industry in INDUSTRY_WEIGHTS:
+                self.weights[:, code] = INDUSTRY_WEIGHTS[industry]
+        self.essential_counts = np.array([[sections.count(section) for sections in self.essential_sections]
+                                          for section in self.sections], dtype=np.float64)
+
+    def encode(self, cv_type, contact_info, skills, sections, structure_info, ats_signals):
+        """Feature row of one CV from its analyze_cv stage outputs and ats_signals"""
+        row = np.zeros(len(self.columns))
+        index = self.index
+
+        industry = cv_type['primary_industry'] if isinstance(cv_type, dict) else None
+        row[index['industry']] = self.industry_codes.get(industry, -1)
+
+        emails = contact_info['emails']
+        row[index['has_email']] = bool(emails)
+        row[index['professional_email']] = any('@gmail.com' not in email and '@yahoo.com' not in email
+                                               for email in emails)
+        row[index['has_phone']] = bool(contact_info['phones'])
+        row[index['has_linkedin']] = bool(contact_info['linkedin'])
+        row[index['has_github']] = bool(contact_info['github'])
+        row[index['has_location']] = bool(contact_info['locations'])
+        row[index['has_website']] = bool(contact_info['websites'])
+        row[index['has_twitter']] = bool(contact_info.get('twitter'))
+
+        row[index['total_skills']] = sum(len(skill_list) for skill_list in skills.values())
+        row[index['skill_categories']] = sum(1 for skill_list in skills.values() if skill_list)
+        row[index['soft_skills']] = bool(skills.get('leadership') or skills.get('interpersonal'))
+        row[index['project_management']] = bool(skills.get('project_management'))
+        for category in self.categories:
+            row[index[f'skills.{category}']] = len(skills.get(category, []))
+
+        for column in STRUCTURE_COLUMNS[:-1]:
+            row[index[column]] = structure_info[column]
+        formatting = structure_info['formatting_elements']
+        row[index['emphasis']] = formatting['bold_text'] > 0 or formatting['caps_words'] > 0
+
+        # Stripped length of each section's content, -1 when it is missing or empty
+        for section in self.sections:
+            present = section in sections and sections[section]
+            row[index[f'section.{section}']] = len(' '.join(sections[section]).strip()) if present else -1
+
+        row[index['ats_headers']] = ats_signals['headers_found']
+        row[index['special_characters']] = ats_signals['special_characters']
+        row[index['has_at']] = ats_signals['has_at']
+        row[index['ats_keywords']] = ats_signals['keyword_count']
+        return row
+
+    def score(self, features, feedback=False):
+        """Score a matrix of encoded rows.
+
+        Returns a dict of arrays with one entry per row: ``contact``,
+        ``skills``, ``structure``, ``sections`` and ``ats_compatibility``
+        (int64) and ``overall`` (float64). With ``feedback``, a
+        ``feedback`` dict holds each component's list of messages per row.
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2 or features.shape[1] != len(self.columns):
+            raise ValueError(f'Expected rows of {len(self.columns)} features, got shape {features.shape}')
+
+        # Scored in blocks of rows, so the intermediate arrays stay in cache
+        blocks = [self._score_block(features[start:start + self.BLOCK_ROWS])
+                  for start in range(0, max(len(features), 1), self.BLOCK_ROWS)]
+        scores = {name: np.concatenate([block[0][name] for block in blocks]) for name in blocks[0][0]}
+        scores['overall'] = round_scores(scores['overall'])
+        if feedback:
+            branches = {name: np.concatenate([block[1][name] for block in blocks]) for name in blocks[0][1]}
+            scores['feedback'] = self.feedback(features, branches)
+        return scores
+
+    def _score_block(self, features):
+        column = lambda name: features[:, self.index[name]]
+        flag = lambda name: features[:, self.index[name]] != 0
+        count = lambda name: features[:, self.index[name]].astype(np.int64)
+        industry = count('industry')
+        branches = {}
+
+        # Contact
+        contact = (25 * flag('has_email') + 5 * (flag('has_email') & flag('professional_email'))
+                   + 20 * flag('has_phone') + 20 * flag('has_linkedin') + 15 * flag('has_github')
+                   + 10 * flag('has_location') + 5 * flag('has_website') + 5 * flag('has_twitter'))
+
+        # Skills; every industry's important skill count at once, then each row's own
+        total_skills = count('total_skills')
+        skills, branches['skills_total'] = ladder(
+            [total_skills >= 20, total_skills >= 15, total_skills >= 10, total_skills >= 5], [40, 35, 25, 15, 5])
+        industry_skills = np.take_along_axis(features[:, self.skill_columns] @ self.important_skills,
+                                             industry[:, None], axis=1)[:, 0]
+        points, branches['skills_industry'] = ladder(
+            [~self.has_requirements[industry], industry_skills >= 5, industry_skills >= 3], [0, 25, 15, 0])
+        skills = skills + points
+        categories = count('skill_categories')
+        points, branches['skills_diversity'] = ladder(
+            [categories >= 6, categories >= 4, categories >= 2], [20, 15, 10, 0])
+        skills = skills + points + 10 * flag('soft_skills') + 5 * flag('project_management')
+
+        # Structure
+        word_count = count('word_count')
+        min_words, max_words = self.min_words[industry], self.max_words[industry]
+        structure, branches['structure_length'] = ladder(
+            [(min_words <= word_count) & (word_count <= max_words),
+             (min_words - 100 <= word_count) & (word_count < min_words),
+             (max_words < word_count) & (word_count <= max_words + 200),
+             word_count < min_words - 100],
+            [50, 40, 40, 20, 15])
+        bullet_points = count('bullet_points')
+        points, branches['structure_bullets'] = ladder(
+            [bullet_points >= 8, bullet_points >= 5, bullet_points >= 2], [25, 20, 10, 5])
+        words_per_line = column('avg_words_per_line')
+        branches['good_lines'] = (6 <= words_per_line) & (words_per_line <= 15)
+        structure = structure + points + np.where(branches['good_lines'], 15, 8) + 10 * flag('emphasis')
+
+        # Sections
+        lengths = features[:, self.section_columns]
+        # What each section would earn as an essential one: 10 when present, 20 over 50
+        # characters, 25 over 100; summed in uint8, as mixed-type arithmetic is much slower
+        points = ((lengths >= 0).view(np.uint8) * np.uint8(10) + (lengths > 50).view(np.uint8) * np.uint8(10)
+                  + (lengths > 100).view(np.uint8) * np.uint8(5))
+        sections = np.take_along_axis(points.astype(np.float64) @ self.essential_counts,
+                                      industry[:, None], axis=1)[:, 0]
+        sections = sections.astype(np.int64) + 10 * (lengths[:, self.important_positions] >= 0).sum(axis=1)
+        bonus_count = (lengths[:, self.bonus_positions] >= 0).sum(axis=1)
+        sections = sections + ladder([bonus_count >= 2, bonus_count == 1], [10, 5, 0])[0]
+
+        # ATS compatibility
+        headers = count('ats_headers')
+        ats, branches['ats_headers'] = ladder([headers >= 4, headers >= 3], [25, 20, 0])
+        special_characters = count('special_characters')
+        points, branches['ats_formatting'] = ladder([special_characters < 30, special_characters < 60], [20, 15, 0])
+        ats = ats + points + 15 * flag('has_at') + 10
+        total_words = column('word_count')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            density = column('ats_keywords') / total_words * 100
+        points, branches['ats_keywords'] = ladder(
+            [total_words <= 0, density >= 2, density >= 1], [0, 15, 10, 0])
+        ats = ats + points
+        line_count = column('line_count')
+        if not line_count.all():
+            raise ZeroDivisionError('Rows with a line_count of 0 cannot be scored')
+        branches['short_lines'] = column('character_count') / line_count < 80
+        ats = ats + 15 * branches['short_lines']
+        ats = np.trunc(ats * (self.ats_weight[industry] + 0.7)).astype(np.int64)
+
+        scores = {
+            'contact': np.minimum(contact, 100),
+            'skills': np.minimum(skills, 100),
+            'structure': np.minimum(structure, 100),
+            'sections': np.minimum(sections, 100),
+            'ats_compatibility': np.minimum(ats, 100)
+        }
+        weights = self.weights[:, industry]
+        # Rounded by score(), once for all blocks
+        scores['overall'] = (scores['contact'] * weights[0] + scores['skills'] * weights[1]
+                             + scores['structure'] * weights[2] + scores['sections'] * weights[3])
+        return scores, branches
+
+    def feedback(self, features, branches):
+        """Messages of every component, worded as the scalar score_* methods word them"""
+        rows = features.tolist()
+        index = self.index
+        result = {'contact': [], 'skills': [], 'structure': [], 'sections': [], 'ats_compatibility': []}
+        for position, row in enumerate(rows):
+            value = lambda name: row[index[name]]
+            industry = int(value('industry'))
+
+            messages = []
+            if value('has_email'):
+                messages.append("✓ Email address provided")
+                if value('professional_email'):
+                    messages.append("✓ Professional email domain")
+            else:
+                messages.append("✗ Missing email address - Essential for contact")
+            messages.append("✓ Phone number provided" if value('has_phone')
+                            else "✗ Missing phone number - Important for contact")
+            messages.append("✓ LinkedIn profile included" if value('has_linkedin')
+                            else "⚠ Consider adding LinkedIn profile")
+            messages.append("✓ GitHub profile included" if value('has_github')
+                            else "⚠ Consider adding GitHub profile (for technical roles)")
+            if value('has_location'):
+                messages.append("✓ Location information provided")
+            if value('has_website'):
+                messages.append("✓ Personal website/portfolio included")
+            if value('has_twitter'):
+                messages.append("✓ Additional social media presence")
+            result['contact'].append(messages)
+
+            total_skills = int(value('total_skills'))
+            messages = [[
+                f"✓ Excellent variety of skills ({total_skills} skills found)",
+                f"✓ Very good variety of skills ({total_skills} skills found)",
+                f"✓ Good variety of skills ({total_skills} skills found)",
+                f"⚠ Moderate skills listed ({total_skills} skills found)",
+                f"✗ Limited skills listed ({total_skills} skills found)"
+            ][branches['skills_total'][position]]]
+            name = self.industries[industry] if industry >= 0 else None
+            branch = branches['skills_industry'][position]
+            if branch:
+                messages.append([f"✓ Strong {name} industry skills", f"✓ Good {name} industry skills",
+                                 f"⚠ Consider adding more {name}-specific skills"][branch - 1])
+            branch = branches['skills_diversity'][position]
+            if branch < 3:
+                messages.append(["✓ Excellent balance across skill categories",
+                                 "✓ Good balance across skill categories",
+                                 "⚠ Consider adding more diverse skills"][branch])
+            if value('soft_skills'):
+                messages.append("✓ Leadership and interpersonal skills included")
+            if value('project_management'):
+                messages.append("✓ Project management skills present")
+            result['skills'].append(messages)
+
+            word_count = int(value('word_count'))
+            bullet_points = int(value('bullet_points'))
+            messages = [[
+                f"✓ Excellent length for your industry ({word_count} words)",
+                f"✓ Good length ({word_count} words)",
+                f"✓ Acceptable length ({word_count} words)",
+                f"⚠ Too short for your industry ({word_count} words)",
+                f"⚠ Too long ({word_count} words)"
+            ][branches['structure_length'][position]], [
+                f"✓ Excellent use of bullet points ({bullet_points})",
+                f"✓ Good use of bullet points ({bullet_points})",
+                f"✓ Some bullet points used ({bullet_points})",
+                "⚠ Consider using more bullet points for readability"
+            ][branches['structure_bullets'][position]]]
+            messages.append("✓ Good line structure and readability" if branches['good_lines'][position]
+                            else "⚠ Consider optimizing line length for readability")
+            if value('emphasis'):
+                messages.append("✓ Good use of formatting for emphasis")
+            result['structure'].append(messages)
+
+            messages = []
+            for section in self.essential_sections[industry]:
+                length = value(f'section.{section}')
+                if length > 100:
+                    messages.append(f"✓ {section.capitalize()} section present with excellent content")
+                elif length > 50:
+                    messages.append(f"✓ {section.capitalize()} section present with good content")
+                elif length >= 0:
+                    messages.append(f"⚠ {section.capitalize()} section present but needs more detail")
+                else:
+                    messages.append(f"✗ Missing essential {section} section")
+            for section in IMPORTANT_SECTIONS:
+                if value(f'section.{section}') >= 0:
+                    messages.append(f"✓ {section.capitalize()} section present")
+            bonus_count = sum(1 for section in BONUS_SECTIONS if value(f'section.{section}') >= 0)
+            if bonus_count >= 2:
+                messages.append(f"✓ Additional sections enhance profile ({bonus_count} bonus sections)")
+            elif bonus_count == 1:
+                messages.append("✓ Additional section adds value")
+            result['sections'].append(messages)
+
+            messages = [["✓ Excellent use of standard section headers", "✓ Good use of standard section headers",
+                         "⚠ Use more standard section headers"][branches['ats_headers'][position]],
+                        ["✓ Clean formatting for ATS parsing", "✓ Mostly clean formatting",
+                         "⚠ Reduce special characters for better ATS compatibility"
+                         ][branches['ats_formatting'][position]]]
+            if value('has_at'):
+                messages.append("✓ Email format is ATS-friendly")
+            messages.append("✓ Standard file format (PDF/DOCX) used")
+            branch = branches['ats_keywords'][position]
+            if branch in (1, 2):
+                messages.append(["✓ Good keyword density for ATS systems", "✓ Adequate keyword presence"][branch - 1])
+            messages.append("✓ Good line length for ATS parsing" if branches['short_lines'][position]
+                            else "⚠ Consider shorter lines for better parsing")
+            result['ats_compatibility'].append(messages)
+        return result
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+
+# Tables of the taxonomy file, besides its "version"
+TABLES = ('skill_keywords', 'skill_variations', 'industry_keywords', 'section_keywords', 'industry_requirements')
+
+
+class TaxonomyError(ValueError):
+    """Raised for a taxonomy file that is missing, malformed or inconsistent"""
+
+
+class KeywordMatcher:
+    """Word-boundary aware matcher that finds many taxonomy terms in one scan.
+
+    The terms are folded into a character trie and emitted as a single regular
+    expression, so the regex engine only follows branches that can still match
+    (Aho-Corasick style) instead of scanning the text once per term. Matching is
+    anchored at word starts and each hit is reported at its own position, so
+    terms nested in longer ones (``compliance`` in ``regulatory compliance``)
+    are still found. Texts passed in are expected to be lowercased already.
+    """
+
+    def __init__(self, terms):
+        self.terms = sorted({term.lower() for term in terms if term})
+        trie = {}
+        for term in self.terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = True
+        self.pattern = re.compile(r'(?<!\w)(?=(' + self._trie_regex(trie) + r')(?!\w))')
+
+        # The regex reports the longest term at each position, so remember which
+        # shorter terms match there too (``react`` whenever ``react native`` does):
+        # the terms ending on the term's trie path just before a non-word character
+        self.implied_terms = {}
+        for term in self.terms:
+            node = trie
+            implied = []
+            for position, char in enumerate(term):
+                if '' in node and position and not re.match(r'\w', char):
+                    implied.append(term[:position])
+                node = node[char]
+            self.implied_terms[term] = implied
+
+    def _trie_regex(self, node):
+        branches = [re.escape(char) + self._trie_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # Prefer the longer term, fall back to the one ending here
+            pattern = '(?:' + pattern + ')?'
+        return pattern
+
+    def count(self, text):
+        """Return a Counter of term -> number of occurrences in ``text``"""
+        counts = Counter(self.pattern.findall(text))
+        for term, occurrences in list(counts.items()):
+            for implied in self.implied_terms[term]:
+                counts[implied] += occurrences
+        return counts
+
+
+def validate_taxonomy(data):
+    """Check the structure of parsed taxonomy data, raising TaxonomyError"""
+    if not isinstance(data, dict):
+        raise TaxonomyError('Taxonomy must be a JSON object')
+    if not isinstance(data.get('version'), str) or not data['version']:
+        raise TaxonomyError('Taxonomy needs a non-empty string "version"')
+
+    for table in TABLES[:4]:
+        terms = data.get(table)
+        if not isinstance(terms, dict):
+            raise TaxonomyError(f'"{table}" must be an object of lists of strings')
+        for key, values in terms.items():
+            if not isinstance(values, list) or not all(isinstance(value, str) and value for value in values):
+                raise TaxonomyError(f'"{table}.{key}" must be a list of non-empty strings')
+
+    requirements = data.get('industry_requirements')
+    if not isinstance(requirements, dict):
+        raise TaxonomyError('"industry_requirements" must be an object')
+    for industry, requirement in requirements.items():
+        where = f'"industry_requirements.{industry}"'
+        if not isinstance(requirement, dict):
+            raise TaxonomyError(f'{where} must be an object')
+        unknown = [category for category in requirement.get('important_skills', [])
+                   if category not in data['skill_keywords']]
+        if unknown:
+            raise TaxonomyError(f'{where} names unknown skill categories: {", ".join(unknown)}')
+        if not isinstance(requirement.get('essential_sections'), list):
+            raise TaxonomyError(f'{where} needs an "essential_sections" list')
+        length = requirement.get('preferred_length')
+        if (not isinstance(length, list) or len(length) != 2
+                or not all(isinstance(words, int) for words in length) or length[0] > length[1]):
+            raise TaxonomyError(f'{where} needs "preferred_length" as [min_words, max_words]')
+        if not isinstance(requirement.get('ats_weight'), (int, float)):
+            raise TaxonomyError(f'{where} needs a numeric "ats_weight"')
+
+
+def taxonomy_digest(data):
+    """Content hash of the taxonomy tables, independent of key order"""
+    return hashlib.sha256(json.dumps(
+        [data['skill_keywords'], data['industry_keywords'], data['section_keywords'],
+         data['industry_requirements'], data['skill_variations']],
+        sort_keys=True
+    ).encode('utf-8')).hexdigest()
+
+
+class Taxonomy:
+    """An immutable, compiled skill taxonomy.
+
+    Holds the keyword tables and the KeywordMatcher built over every skill,
+    abbreviation and industry term. ``version`` combines the file's declared
+    version with a hash of its tables, so any edit changes it, and is what
+    cache keys and job profiles record.
+    """
+
+    def __init__(self, data):
+        validate_taxonomy(data)
+        self.declared_version = data['version']
+        self.version = f"{data['version']}-{taxonomy_digest(data)[:12]}"
+        self.skill_keywords = data['skill_keywords']
+        self.skill_variations = data['skill_variations']
+        self.industry_keywords = data['industry_keywords']
+        self.section_keywords = data['section_keywords']
+        self.industry_requirements = data['industry_requirements']
+
+        # Every taxonomy term compiled once, shared by all keyword-based stages
+        taxonomy_terms = [term for terms in self.skill_keywords.values() for term in terms]
+        taxonomy_terms += [term for terms in self.skill_variations.values() for term in terms]
+        taxonomy_terms += [term for terms in self.industry_keywords.values() for term in terms]
+        self.term_matcher = KeywordMatcher(taxonomy_terms)
+
+    def to_dict(self):
+        return {'version': self.declared_version, **{table: getattr(self, table) for table in TABLES}}
+
+
+class TaxonomySource:
+    """Loads the taxonomy file and swaps in a recompiled Taxonomy when it changes.
+
+    ``current`` checks the file's modification time at most every
+    ``check_interval`` seconds; when it has changed, the thread that noticed
+    compiles the new taxonomy while other threads keep using the old one, and
+    the new Taxonomy replaces it in a single assignment. An invalid file is
+    reported and ignored, so the last good taxonomy stays in service.
+    """
+
+    def __init__(self, path, check_interval=5):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        self.reloads = 0
+        self.last_error = None
+        self._stamp = self._file_stamp()
+        self.taxonomy = Taxonomy(self._read())
+        self.loaded_at = time.time()
+
+    def _file_stamp(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            raise TaxonomyError(f'Could not read taxonomy {self.path}: {e}')
+
+    def current(self):
+        """The Taxonomy in service, reloaded first if the file has changed"""
+        if self.check_interval is not None and time.monotonic() - self._checked_at >= self.check_interval:
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._checked_at = time.monotonic()
+                    stamp = self._file_stamp()
+                    if stamp != self._stamp:
+                        # Recorded first, so a broken file is reported once, not on every check
+                        self._stamp = stamp
+                        self._load()
+                except (OSError, TaxonomyError) as e:
+                    self.last_error = str(e)
+                    print(f"Taxonomy reload failed, keeping version {self.taxonomy.version}: {str(e)}")
+                finally:
+                    self._lock.release()
+        return self.taxonomy
+
+    def _load(self):
+        taxonomy = Taxonomy(self._read())
+        self.last_error = None
+        if taxonomy.version != self.taxonomy.version:
+            self.taxonomy = taxonomy
+            self.loaded_at = time.time()
+            self.reloads += 1
+
+    def reload(self):
+        """Re-read the file now; raises TaxonomyError and keeps the old taxonomy if it is invalid"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                self._stamp = self._file_stamp()
+                self._load()
+            except (OSError, TaxonomyError) as e:
+                self.last_error = str(e)
+                raise TaxonomyError(self.last_error) from e
+        return self.taxonomy
+
+    def replace(self, data):
+        """Validate and compile ``data``, write it to the taxonomy file and put it in service"""
+        with self._lock:
+            taxonomy = Taxonomy(data)
+            directory = os.path.dirname(os.path.abspath(self.path))
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, delete=False) as file:
+                json.dump(taxonomy.to_dict(), file, indent=2)
+            os.chmod(file.name, 0o644)
+            os.replace(file.name, self.path)
+            self._stamp = self._file_stamp()
+            self._checked_at = time.monotonic()
+            self.last_error = None
+            if taxonomy.version != self.taxonomy.version:
+                self.taxonomy = taxonomy
+                self.loaded_at = time.time()
+                self.reloads += 1
+        return self.taxonomy
+
+    def stats(self):
+        taxonomy = self.taxonomy
+        return {
+            'version': taxonomy.version,
+            'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.loaded_at)),
+            'reloads': self.reloads,
+            'last_error': self.last_error,
+            'skill_categories': len(taxonomy.skill_keywords),
+            'industries': len(taxonomy.industry_keywords),
+            'terms': len(taxonomy.term_matcher.terms)
+        }
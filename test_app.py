@@ -0,0 +1,130 @@
+import io
+import os
+import time
+
+import pytest
+
+import app
+
+
+def upload(client, url, text, filename='cv.txt'):
+    return client.post(url, data={'file': (io.BytesIO(text.encode('utf-8')), filename)})
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+def test_include_runs_only_needed_stages(cv_text):
+    full = app.analyzer.analyze_cv(cv_text.encode('utf-8'), 'cv.txt')
+    results = app.analyzer.analyze_cv(cv_text.encode('utf-8'), 'cv.txt', include=['contact_info_extracted'])
+
+    assert set(results) == {'contact_info_extracted', 'analysis_stages'}
+    assert results['contact_info_extracted'] == full['contact_info_extracted']
+    assert results['analysis_stages']['run'] == ['contact_info']
+    assert 'readability' in results['analysis_stages']['skipped']
+
+
+def test_include_pulls_in_dependencies():
+    fields, stages = app.analyzer.resolve_analysis(include=['overall_score'])
+    assert fields == {'overall_score'}
+    assert stages == {'overall_score', 'contact_info', 'contact_score', 'skills', 'skills_score', 'sections',
+                      'structure_info', 'structure_score', 'sections_score', 'cv_type'}
+
+
+def test_exclude_prunes_stages(cv_text):
+    full = app.analyzer.analyze_cv(cv_text.encode('utf-8'), 'cv.txt')
+    results = app.analyzer.analyze_cv(cv_text.encode('utf-8'), 'cv.txt',
+                                      exclude=['suggestions', 'feedback', 'detailed_analysis', 'features'])
+
+    assert 'detailed_analysis' not in results and 'suggestions' not in results
+    assert results['scores'] == full['scores']
+    assert results['overall_score'] == full['overall_score']
+    assert {'readability', 'content_quality', 'keyword_analysis', 'features'} <= set(
+        results['analysis_stages']['skipped'])
+
+
+def test_subfield_selection():
+    fields, stages = app.analyzer.resolve_analysis(include=['scores'], exclude=['scores.ats_compatibility'])
+    assert 'scores.skills' in fields and 'scores.ats_compatibility' not in fields
+    assert 'ats_score' not in stages
+
+
+def test_unknown_field_rejected(client, cv_text):
+    with pytest.raises(ValueError, match="Unknown result field 'nope'"):
+        app.analyzer.resolve_analysis(include=['nope'])
+    response = upload(client, '/analyze?include=overall_score,nope', cv_text)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': "Unknown result field 'nope'"}
+
+
+def test_selective_results_cached_separately(client, unique_cv):
+    text = unique_cv()
+    partial = upload(client, '/analyze?include=overall_score', text).get_json()
+    full = upload(client, '/analyze', text).get_json()
+
+    assert set(partial) == {'overall_score', 'analysis_stages'}
+    assert 'detailed_analysis' in full
+    assert full['overall_score'] == partial['overall_score']
+
+
+def test_cache_key_depends_on_format(client, unique_cv):
+    text = unique_cv()
+    assert 'error' not in upload(client, '/analyze', text, 'cv.txt').get_json()
+    # The same bytes as a PDF are parsed as one, not answered from the TXT result
+    assert 'error' in upload(client, '/analyze', text, 'cv.pdf').get_json()
+
+
+analyze_batch_file = app.analyze_batch_file
+
+
+def analyze_slowly(file_data, filename):
+    """Batch worker stand-in: sleeps or dies when the filename says so"""
+    if filename.startswith('slow'):
+        time.sleep(3)
+    elif filename.startswith('crash'):
+        os._exit(1)
+    return analyze_batch_file(file_data, filename)
+
+
+@pytest.fixture
+def batch(monkeypatch):
+    """Post to /analyze_batch with analyze_slowly in fresh batch workers"""
+    app.discard_batch_pool()
+    monkeypatch.setattr(app, 'analyze_batch_file', analyze_slowly)
+    monkeypatch.setitem(app.app.config, 'BATCH_FILE_TIMEOUT', 1)
+    client = app.app.test_client()
+
+    def post(files):
+        data = {'files': [(io.BytesIO(text.encode('utf-8')), name) for name, text in files]}
+        return client.post('/analyze_batch', data=data).get_json()
+
+    yield post
+    app.discard_batch_pool()
+
+
+def test_batch_analyzes_files(batch, unique_cv):
+    response = batch([('a.txt', unique_cv()), ('a.txt', unique_cv()), ('b.doc', unique_cv())])
+
+    assert response['successful'] == 2
+    assert set(response['results']) == {'a.txt', 'a.txt (2)', 'b.doc'}
+    assert response['results']['b.doc']['error'].startswith('Invalid file type')
+
+
+def test_batch_times_out_slow_file(batch, unique_cv):
+    started = time.monotonic()
+    response = batch([('slow.txt', unique_cv()), ('fast.txt', unique_cv())])
+
+    assert time.monotonic() - started < 2.5
+    assert response['results']['slow.txt']['error'].startswith('Analysis timed out')
+    assert 'error' not in response['results']['fast.txt']
+
+
+def test_batch_recovers_from_dead_worker(batch, unique_cv):
+    response = batch([('crash.txt', unique_cv())])
+    assert response['results']['crash.txt']['error'] == 'Analysis failed: worker process terminated unexpectedly'
+
+    # The broken pool was discarded; the next batch starts a fresh one
+    response = batch([('after.txt', unique_cv())])
+    assert response['successful'] == 1
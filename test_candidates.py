@@ -0,0 +1,101 @@
+import io
+
+import pytest
+
+import app
+from candidates import CandidateStore, QueryError, QueryParser, candidate_postings, primary_industry
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandidateStore(str(tmp_path / 'candidates.db'))
+
+
+@pytest.fixture(scope='module')
+def results(cv_text):
+    return app.analyzer.analyze_cv(cv_text.encode('utf-8'), 'jane.txt')
+
+
+@pytest.fixture(scope='module')
+def general_results(general_cv_text):
+    return app.analyzer.analyze_cv(general_cv_text.encode('utf-8'), 'john.txt')
+
+
+def test_add_indexes_postings(store, results):
+    candidate_id = store.add('hash-1', 'jane.txt', results)
+
+    total, page = store.search('python AND industry:technology')
+    assert total == 1
+    assert page[0]['id'] == candidate_id
+    assert page[0]['industry'] == 'technology'
+    assert store.search('cobol')[0] == 0
+    assert ('skill', 'python') in candidate_postings(results)
+
+
+def test_general_cv_is_indexed_as_general(store, general_results):
+    assert general_results['cv_type'] == 'general'
+    assert primary_industry(general_results) == 'general'
+
+    candidate_id = store.add('hash-2', 'john.txt', general_results)
+
+    assert store.get(candidate_id)['industry'] == 'general'
+    assert store.search('industry:general')[0] == 1
+
+
+def test_reindexing_replaces_candidate(store, results):
+    store.add('hash-1', 'jane.txt', results)
+    candidate_id = store.add('hash-1', 'jane-v2.txt', results)
+
+    total, page = store.search('python')
+    assert total == 1
+    assert page[0]['id'] == candidate_id
+    assert page[0]['filename'] == 'jane-v2.txt'
+    assert store.stats()['candidates'] == 1
+
+
+def test_feature_vector_stored_with_schema(store, results):
+    schema = app.analyzer.feature_schema
+    assert results['features']['schema'] == schema['id']
+
+    store.add('hash-1', 'jane.txt', results, schema['names'])
+
+    assert store.feature_schemas() == {schema['id']: {'names': schema['names'], 'candidates': 1}}
+    [[(_, features)]] = store.iter_features(schema['id'])
+    assert len(features) == 8 * len(schema['names'])
+
+
+@pytest.mark.parametrize('query', [
+    'python ' * (QueryParser.MAX_TOKENS + 1),
+    '(' * (QueryParser.MAX_DEPTH + 1) + 'python' + ')' * (QueryParser.MAX_DEPTH + 1),
+    'NOT ' * (QueryParser.MAX_DEPTH + 1) + 'python',
+    '"python',
+    'python AND',
+    '(python',
+])
+def test_rejected_queries(store, query):
+    with pytest.raises(QueryError):
+        store.search(query)
+
+
+def test_analyze_indexes_general_cv(general_cv_text, unique_cv):
+    upload = unique_cv(general_cv_text)
+    response = app.app.test_client().post('/analyze', data={'file': (io.BytesIO(upload.encode('utf-8')), 'john.txt')})
+
+    assert response.status_code == 200
+    assert response.get_json()['cv_type'] == 'general'
+    total, page = app.candidate_store.search('industry:general')
+    assert any(candidate['filename'] == 'john.txt' for candidate in page)
+
+
+def test_indexing_failure_does_not_fail_analysis(monkeypatch, capsys, unique_cv):
+    class BrokenStore:
+        def add(self, *args):
+            raise RuntimeError('disk full')
+
+    monkeypatch.setattr(app, 'candidate_store', BrokenStore())
+    upload = unique_cv()
+    response = app.app.test_client().post('/analyze', data={'file': (io.BytesIO(upload.encode('utf-8')), 'cv.txt')})
+
+    assert response.status_code == 200
+    assert 'error' not in response.get_json()
+    assert 'Could not index candidate cv.txt: RuntimeError: disk full' in capsys.readouterr().out
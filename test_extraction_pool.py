@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+
+import pytest
+
+from app import EnhancedCVAnalyzer
+from extraction_pool import ExtractionPool, ExtractionTimeout, ExtractionWorkerError
+
+
+def extract(file_format, file_data):
+    """Stand-in extractor: the upload's bytes say how to behave"""
+    if file_data.startswith(b'hang'):
+        time.sleep(float(file_data.split()[1]))
+    elif file_data == b'crash':
+        os._exit(1)
+    elif file_data == b'fail':
+        raise ValueError('unreadable file')
+    return f'{file_format} text of pid {os.getpid()}', {'format': file_format}
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(workers=1, timeout=1, max_tasks=100):
+        pool = ExtractionPool(extract, workers=workers, timeout=timeout, max_tasks=max_tasks)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def test_run_returns_extractor_result(make_pool):
+    text, info = make_pool().run('pdf', b'ok')
+    assert text.startswith('pdf text of pid')
+    assert info == {'format': 'pdf'}
+
+
+def test_timeout_replaces_worker(make_pool):
+    pool = make_pool(timeout=0.5)
+    first, _ = pool.run('pdf', b'ok')
+
+    started = time.monotonic()
+    with pytest.raises(ExtractionTimeout):
+        pool.run('pdf', b'hang 30')
+    assert time.monotonic() - started < 2
+
+    # The hung worker was killed; a fresh one serves the next document
+    second, _ = pool.run('pdf', b'ok')
+    assert second != first
+    assert pool.stats()['timeouts'] == 1
+
+
+def test_wait_for_idle_worker_counts_against_timeout(make_pool):
+    pool = make_pool(workers=1, timeout=1)
+    errors = {}
+
+    def run(name, data):
+        try:
+            pool.run('pdf', data)
+        except Exception as e:
+            errors[name] = e
+
+    hung = threading.Thread(target=run, args=('hung', b'hang 30'))
+    hung.start()
+    time.sleep(0.1)
+    # Waits for the only worker, then gets too little of its own second to finish
+    started = time.monotonic()
+    run('queued', b'hang 0.5')
+    elapsed = time.monotonic() - started
+    hung.join()
+
+    assert isinstance(errors['hung'], ExtractionTimeout)
+    assert isinstance(errors['queued'], ExtractionTimeout)
+    assert elapsed < 1.4
+
+
+def test_crashed_worker_is_replaced(make_pool):
+    pool = make_pool()
+    with pytest.raises(ExtractionWorkerError, match='terminated unexpectedly'):
+        pool.run('docx', b'crash')
+    assert pool.run('docx', b'ok')[1] == {'format': 'docx'}
+
+
+def test_extractor_error_keeps_worker(make_pool):
+    pool = make_pool()
+    first, _ = pool.run('pdf', b'ok')
+    with pytest.raises(ExtractionWorkerError, match='ValueError: unreadable file'):
+        pool.run('pdf', b'fail')
+    assert pool.run('pdf', b'ok')[0] == first
+
+
+def test_workers_recycled_after_max_tasks(make_pool):
+    pool = make_pool(max_tasks=2)
+    texts = [pool.run('pdf', b'ok')[0] for _ in range(3)]
+    assert texts[0] == texts[1] != texts[2]
+    assert pool.stats()['recycled_workers'] == 1
+
+
+def test_analysis_reports_extraction_timeout(make_pool):
+    analyzer = EnhancedCVAnalyzer(extraction_pool=make_pool(timeout=0.5))
+    results = analyzer.analyze_cv(b'hang 30', 'cv.pdf')
+    assert results['error'].startswith('Document extraction timed out after 0.5 seconds')
@@ -0,0 +1,120 @@
+import sqlite3
+import time
+
+import pytest
+
+from jobs import COMPLETED, FAILED, QUEUED, RUNNING, JobQueue, JobWorkers
+
+
+def analyze(file_data, filename):
+    """Stand-in handler: the filename says how to behave"""
+    if filename == 'boom.txt':
+        raise ValueError('boom')
+    if filename == 'unserializable.txt':
+        return {'value': object()}
+    if filename == 'empty.txt':
+        return {'error': 'File appears to be empty'}
+    return {'overall_score': len(file_data)}
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    return JobQueue(str(tmp_path / 'jobs.db'), lease=0.3)
+
+
+def wait_for(job_queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = job_queue.get(job_id)
+        if job['status'] in (COMPLETED, FAILED):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f'Job {job_id} still {job["status"]}')
+
+
+def start_workers(job_queue, threads=1):
+    workers = JobWorkers(job_queue, analyze, threads)
+    workers.POLL_INTERVAL = 0.05
+    workers.start()
+    return workers
+
+
+def test_job_completes(job_queue):
+    start_workers(job_queue)
+    job = wait_for(job_queue, job_queue.submit('cv.txt', b'abc'))
+    assert job['status'] == COMPLETED
+    assert job['result'] == {'overall_score': 3}
+    assert job['attempts'] == 1
+
+
+def test_failures_do_not_stop_workers(job_queue):
+    start_workers(job_queue)
+    boom = job_queue.submit('boom.txt', b'x')
+    unserializable = job_queue.submit('unserializable.txt', b'x')
+    empty = job_queue.submit('empty.txt', b'x')
+    good = job_queue.submit('cv.txt', b'abcd')
+
+    assert wait_for(job_queue, boom)['error'] == 'Analysis failed: boom'
+    assert wait_for(job_queue, unserializable)['error'].startswith('Could not store the result:')
+    assert wait_for(job_queue, empty)['error'] == 'File appears to be empty'
+    assert wait_for(job_queue, good)['result'] == {'overall_score': 4}
+
+
+def test_unrecorded_failure_is_retried(job_queue, monkeypatch):
+    fail = job_queue.fail
+    calls = []
+
+    def flaky_fail(job_id, error):
+        calls.append(job_id)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError('database is locked')
+        fail(job_id, error)
+
+    monkeypatch.setattr(job_queue, 'fail', flaky_fail)
+    workers = start_workers(job_queue)
+    job_id = job_queue.submit('boom.txt', b'x')
+
+    # Housekeeping records the failure on its next round
+    assert wait_for(job_queue, job_id)['error'] == 'Analysis failed: boom'
+    assert calls == [job_id, job_id]
+    assert workers._unfinished == {}
+    # The worker thread survived the queue error
+    assert wait_for(job_queue, job_queue.submit('cv.txt', b'ab'))['status'] == COMPLETED
+
+
+def test_worker_survives_unavailable_queue(job_queue, monkeypatch):
+    claim = job_queue.claim
+    failures = []
+
+    def flaky_claim(worker):
+        if len(failures) < 3:
+            failures.append(worker)
+            raise sqlite3.OperationalError('database is locked')
+        return claim(worker)
+
+    monkeypatch.setattr(job_queue, 'claim', flaky_claim)
+    start_workers(job_queue)
+    assert wait_for(job_queue, job_queue.submit('cv.txt', b'abc'))['status'] == COMPLETED
+    assert len(failures) == 3
+
+
+def test_expired_lease_is_requeued(job_queue):
+    job_id = job_queue.submit('cv.txt', b'abc')
+    assert job_queue.claim('dead-worker')[0] == job_id
+    assert job_queue.get(job_id)['status'] == RUNNING
+
+    time.sleep(0.4)
+    assert job_queue.recover() == 1
+    assert job_queue.get(job_id)['status'] == QUEUED
+
+
+def test_job_abandoned_after_max_attempts(job_queue):
+    job_id = job_queue.submit('cv.txt', b'abc')
+    for _ in range(job_queue.max_attempts):
+        job_queue.claim('dead-worker')
+        time.sleep(0.4)
+        job_queue.recover()
+
+    job = job_queue.get(job_id)
+    assert job['status'] == FAILED
+    assert job['error'] == f'Job abandoned after {job_queue.max_attempts} interrupted attempt(s)'
@@ -0,0 +1,147 @@
+import copy
+import io
+import json
+import os
+
+import pytest
+
+import app
+from taxonomy import KeywordMatcher, Taxonomy, TaxonomyError, TaxonomySource
+
+
+@pytest.fixture(scope='module')
+def data():
+    with open(app.DEFAULT_TAXONOMY_PATH, encoding='utf-8') as file:
+        return json.load(file)
+
+
+@pytest.fixture
+def source(tmp_path, data):
+    path = tmp_path / 'taxonomy.json'
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return TaxonomySource(str(path), check_interval=0)
+
+
+def with_skill(data, skill, version='2'):
+    edited = copy.deepcopy(data)
+    edited['skill_keywords']['programming'].append(skill)
+    edited['version'] = version
+    return edited
+
+
+def write(path, data):
+    # A later mtime and size than the file it replaces, however fast the test runs
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=1)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_matcher_counts_nested_and_implied_terms():
+    matcher = KeywordMatcher(['React', 'react native', 'java', 'c++', 'compliance', 'regulatory compliance'])
+    counts = matcher.count('react native and react, javascript, c++, regulatory compliance; compliance')
+    assert counts == {'react native': 1, 'react': 2, 'c++': 1, 'regulatory compliance': 1, 'compliance': 2}
+    assert matcher.implied_terms['react native'] == ['react']
+
+
+def test_version_tracks_content(data):
+    reordered = dict(reversed(list(data.items())))
+    assert Taxonomy(reordered).version == Taxonomy(data).version
+    assert Taxonomy(with_skill(data, 'zig', data['version'])).version != Taxonomy(data).version
+
+
+def test_invalid_taxonomy_rejected(data):
+    broken = copy.deepcopy(data)
+    broken['industry_requirements']['technology']['important_skills'] = ['no_such_category']
+    with pytest.raises(TaxonomyError, match='unknown skill categories: no_such_category'):
+        Taxonomy(broken)
+
+
+def test_file_change_is_picked_up(source, data):
+    before = source.current()
+    write(source.path, with_skill(data, 'zig'))
+
+    after = source.current()
+    assert after.version != before.version
+    assert after.version.startswith('2-')
+    assert 'zig' in after.term_matcher.terms
+    assert source.reloads == 1
+
+
+def test_broken_file_keeps_last_good_taxonomy(source, capsys):
+    before = source.current()
+    with open(source.path, 'a', encoding='utf-8') as file:
+        file.write('{broken')
+    stat = os.stat(source.path)
+    os.utime(source.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert source.current() is before
+    assert source.last_error.startswith('Could not read taxonomy')
+    assert 'Taxonomy reload failed' in capsys.readouterr().out
+    with pytest.raises(TaxonomyError):
+        source.reload()
+    assert source.current() is before
+
+
+def test_replace_writes_file_and_swaps(source, data):
+    taxonomy = source.replace(with_skill(data, 'zig', '3'))
+
+    assert source.current() is taxonomy
+    with open(source.path, encoding='utf-8') as file:
+        assert 'zig' in json.load(file)['skill_keywords']['programming']
+    # The write is not mistaken for a new edit
+    assert source.reload() is taxonomy
+    assert source.reloads == 1
+
+
+def test_analysis_keeps_its_pinned_taxonomy(source, data):
+    analyzer = app.EnhancedCVAnalyzer(taxonomy_source=source)
+    with analyzer.pinned_taxonomy() as pinned:
+        source.replace(with_skill(data, 'zig'))
+        assert analyzer.taxonomy is pinned
+        assert 'zig' not in analyzer.skill_keywords['programming']
+    assert 'zig' in analyzer.skill_keywords['programming']
+
+
+def test_engine_and_feature_schema_follow_taxonomy(source, data):
+    analyzer = app.EnhancedCVAnalyzer(taxonomy_source=source)
+    engine, schema = analyzer.scoring_engine, analyzer.feature_schema
+    assert analyzer.scoring_engine is engine
+    assert analyzer.feature_schema is schema
+
+    edited = copy.deepcopy(data)
+    edited['skill_keywords']['zig_tools'] = ['zig']
+    source.replace(edited)
+
+    assert analyzer.scoring_engine is not engine
+    assert analyzer.feature_schema['id'] != schema['id']
+    assert 'skills.zig_tools' in analyzer.feature_schema['names']
+
+
+@pytest.fixture
+def restore_app_taxonomy():
+    original = app.taxonomy_source.current().to_dict()
+    yield
+    app.taxonomy_source.replace(original)
+
+
+def test_cache_keys_carry_taxonomy_version(data, restore_app_taxonomy):
+    key = app.result_cache_key('analyze', 'hash', 'txt')
+    assert app.analyzer.taxonomy_version in key
+    assert key != app.result_cache_key('analyze', 'hash', 'pdf')
+
+    app.taxonomy_source.replace(with_skill(data, 'zig'))
+    assert app.result_cache_key('analyze', 'hash', 'txt') != key
+
+
+def test_cached_result_not_served_across_taxonomy_change(cv_text, data, restore_app_taxonomy):
+    client = app.app.test_client()
+    upload = f'{cv_text}\nAlso fluent in Zig.\n'.encode('utf-8')
+
+    def analyze():
+        response = client.post('/analyze', data={'file': (io.BytesIO(upload), 'cv.txt')})
+        return response.get_json()['detailed_analysis']['skills_breakdown'].get('programming', [])
+
+    assert 'zig' not in analyze()
+    app.taxonomy_source.replace(with_skill(data, 'zig'))
+    assert 'zig' in analyze()
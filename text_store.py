@@ -0,0 +1,123 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS extracted_text (
+    content_hash TEXT NOT NULL,
+    extractor_version TEXT NOT NULL,
+    text TEXT NOT NULL,
+    info TEXT,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (content_hash, extractor_version)
+);
+CREATE INDEX IF NOT EXISTS extracted_text_last_used ON extracted_text (last_used);
+"""
+
+
+class ExtractedTextStore:
+    """SQLite-backed store of text extracted from uploaded documents.
+
+    Entries are keyed by the SHA-256 of the uploaded bytes plus the version of
+    the extractor that produced the text, so a new extractor never serves text
+    from an old one. The database file is shared by every worker process and
+    survives restarts. Once the stored text exceeds ``max_bytes`` the least
+    recently used entries are deleted.
+    """
+
+    # Reads refresh an entry's LRU position at most this often (seconds)
+    TOUCH_INTERVAL = 60
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(extracted_text)')}
+            if 'info' not in columns:
+                conn.execute('ALTER TABLE extracted_text ADD COLUMN info TEXT')
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the store safe across threads and forks
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, content_hash, extractor_version):
+        """Return the stored (text, info) pair, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT text, info, last_used FROM extracted_text WHERE content_hash = ? AND extractor_version = ?',
+                (content_hash, extractor_version)
+            ).fetchone()
+            if row is None:
+                return None
+
+            text, info, last_used = row
+            now = time.time()
+            if now - last_used > self.TOUCH_INTERVAL:
+                conn.execute(
+                    'UPDATE extracted_text SET last_used = ? WHERE content_hash = ? AND extractor_version = ?',
+                    (now, content_hash, extractor_version)
+                )
+            return text, json.loads(info) if info else {}
+
+    def put(self, content_hash, extractor_version, text, info=None):
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO extracted_text '
+                '(content_hash, extractor_version, text, info, size, created_at, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (content_hash, extractor_version, text, json.dumps(info or {}), size, now, now)
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM extracted_text').fetchone()[0]
+        while total > self.max_bytes:
+            oldest = conn.execute(
+                'SELECT content_hash, extractor_version, size FROM extracted_text ORDER BY last_used LIMIT 1'
+            ).fetchone()
+            if oldest is None:
+                break
+            conn.execute(
+                'DELETE FROM extracted_text WHERE content_hash = ? AND extractor_version = ?',
+                oldest[:2]
+            )
+            total -= oldest[2]
+
+    def purge(self):
+        """Delete every stored entry and return how many were removed"""
+        with self._connect() as conn:
+            removed = conn.execute('DELETE FROM extracted_text').rowcount
+        with self._connect() as conn:
+            conn.execute('VACUUM')
+        return removed
+
+    def stats(self):
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extracted_text'
+            ).fetchone()
+        return {
+            'entries': entries,
+            'size_bytes': size,
+            'max_bytes': self.max_bytes
+        }
@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict, namedtuple
+
+# Per-word inputs of the readability and content quality stages. The keyword
+# fields hold the listed keywords that occur anywhere inside the word
+WordFeatures = namedtuple('WordFeatures', ['syllables', 'action_verbs', 'impact_keywords', 'professional_words'])
+
+
+class WordFeatureCache:
+    """Process-wide LRU cache of WordFeatures by lowercased word.
+
+    CVs share most of their vocabulary, so after warm-up the per-word work
+    of the readability and content quality stages becomes a dictionary
+    lookup. ``compute`` builds the features of a word on a miss; it must
+    depend on nothing but the word. At most ``max_entries`` words are kept,
+    least recently used first out. A ``max_entries`` of 0 disables caching.
+    """
+
+    def __init__(self, compute, max_entries):
+        self.compute = compute
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, words):
+        """Return {word: WordFeatures} for an iterable of distinct lowercased words"""
+        features = {}
+        missing = []
+        with self._lock:
+            entries = self._entries
+            for word in words:
+                entry = entries.get(word)
+                if entry is None:
+                    missing.append(word)
+                else:
+                    entries.move_to_end(word)
+                    features[word] = entry
+            self.hits += len(features)
+            self.misses += len(missing)
+
+        if missing:
+            computed = {word: self.compute(word) for word in missing}
+            features.update(computed)
+            if self.max_entries > 0:
+                with self._lock:
+                    self._entries.update(computed)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+        return features
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }